@@ -0,0 +1 @@
+"""Benchmarks that drive the real cogs against local fake services."""
@@ -0,0 +1,124 @@
+"""Measure one dashboard tick end-to-end against a local fake Jellyfin.
+
+Each tick runs `get_server_info`, `create_dashboard_embed` and the dashboard edit
+against a stubbed channel, and records wall time, requests per endpoint and memory.
+The Discord update queue is bypassed: its pacing is deliberate waiting, not cost.
+
+    python -m benchmarks.bench_jellyfin --libraries 20 --sessions 50 --latency-ms 20
+    python -m benchmarks.bench_jellyfin --cold --baseline benchmarks/results/<earlier run>.json
+"""
+import argparse
+import asyncio
+from typing import Any, Dict, List
+
+from benchmarks.common import (
+    MemorySampler,
+    Stopwatch,
+    compare,
+    isolate_state,
+    make_bot,
+    summarize,
+    write_results,
+)
+from benchmarks.fakes import FakeJellyfin, StubChannel
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ticks", type=int, default=20, help="dashboard ticks to run")
+    parser.add_argument("--libraries", type=int, default=5)
+    parser.add_argument("--items", type=int, default=500, help="movies or series per library")
+    parser.add_argument("--episodes", type=int, default=5000, help="episodes per series library")
+    parser.add_argument("--sessions", type=int, default=5)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="latency added to every fake response")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="extra random latency up to this value")
+    parser.add_argument("--show-episodes", action="store_true", help="also count episodes in every library")
+    parser.add_argument("--cold", action="store_true", help="drop the library cache before every tick")
+    parser.add_argument("--no-tracemalloc", action="store_true", help="skip tracemalloc, which slows ticks down")
+    parser.add_argument("--output", help="result file (default: benchmarks/results/jellyfin_tick-<commit>-<time>.json)")
+    parser.add_argument("--baseline", help="earlier result file to compare medians against")
+    return parser.parse_args()
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    from cogs.jellyfin_core import JellyfinCore, JellyfinServer
+
+    fake = FakeJellyfin(
+        libraries=args.libraries,
+        items_per_library=args.items,
+        episodes_per_library=args.episodes,
+        sessions=args.sessions,
+        latency=args.latency_ms / 1000,
+        jitter=args.jitter_ms / 1000,
+    )
+    url = await fake.start()
+    # Keep the bot's own logging at warnings so it does not dominate the measurements
+    isolate_state(log_level="WARNING")
+    cog = JellyfinCore(make_bot())
+    channel = StubChannel()
+    server = JellyfinServer("bench", url, [channel.id], api_key="benchmark")
+    server.dashboard_message_ids[channel.id] = 1
+    cog.servers = [server]
+    cog.config["jellyfin_sections"] = {
+        "show_all": 1,
+        "sections": {
+            fake.library_id(i): {"display_name": f"Library {i}", "emoji": "📁", "show_episodes": int(args.show_episodes)}
+            for i in range(args.libraries)
+        },
+    }
+
+    ticks: List[Dict[str, Any]] = []
+    try:
+        with MemorySampler(enabled=not args.no_tracemalloc) as memory:
+            for index in range(args.ticks):
+                if args.cold:
+                    cog._invalidate_library_caches()
+                cold = server.last_library_update is None
+                before = dict(fake.requests)
+                memory.begin()
+                with Stopwatch() as total:
+                    with Stopwatch() as poll:
+                        info = await cog.get_server_info(server)
+                    with Stopwatch() as render:
+                        embed = await cog.create_dashboard_embed(info, server)
+                    await cog._send_dashboard_message(channel, embed, server)
+                sample = memory.end()
+                requests = {path: count - before.get(path, 0) for path, count in fake.requests.items() if count - before.get(path, 0)}
+                ticks.append({
+                    "tick": index,
+                    "cache": "cold" if cold else "warm",
+                    "wall_seconds": total.elapsed,
+                    "poll_seconds": poll.elapsed,
+                    "embed_seconds": render.elapsed,
+                    "requests": sum(requests.values()),
+                    "requests_by_endpoint": requests,
+                    **sample,
+                })
+    finally:
+        await cog.cog_unload()
+        await fake.stop()
+
+    summary: Dict[str, Any] = {}
+    for cache in ("cold", "warm"):
+        subset = [tick for tick in ticks if tick["cache"] == cache]
+        for key in ("wall_seconds", "poll_seconds", "embed_seconds", "requests", "allocated_blocks_delta", "retained_bytes", "peak_bytes"):
+            values = [tick[key] for tick in subset if key in tick]
+            if values:
+                summary[f"{cache}.{key}"] = summarize(values)
+    return {"ticks": ticks, "summary": summary}
+
+
+def main() -> None:
+    args = parse_args()
+    result = asyncio.run(run(args))
+    path = write_results("jellyfin_tick", vars(args), result["ticks"], result["summary"], args.output)
+
+    for key, stats in result["summary"].items():
+        print(f"{key:32} median {stats['median']:.6g}  p95 {stats['p95']:.6g}  max {stats['max']:.6g}")
+    if args.baseline:
+        print("\n".join(compare(args.baseline, result["summary"])))
+    print(f"Results written to {path}")
+
+
+if __name__ == "__main__":
+    main()
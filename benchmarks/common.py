@@ -0,0 +1,154 @@
+"""Shared helpers for the benchmark and load scripts: cog setup, memory sampling and result files."""
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+
+# The Jellyfin cog needs a server even when config.json lists none; nothing here connects to
+# Discord, and the configured servers are replaced with fakes after the cogs are created
+os.environ.setdefault("JELLYFIN_URL", "http://127.0.0.1:9")
+os.environ.setdefault("CHANNEL_ID", "1")
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import discord  # noqa: E402
+from discord.ext import commands  # noqa: E402
+
+
+def make_bot() -> commands.Bot:
+    """A bot that is never logged in, for hosting cogs under test."""
+    return commands.Bot(command_prefix="!", intents=discord.Intents.none())
+
+
+def isolate_state(log_level: Optional[str] = None) -> str:
+    """Give the Jellyfin cog a scratch copy of data/ and send the bot's logs there too.
+
+    Call it before creating the cog: its constructor already migrates message IDs and
+    prunes the poster cache, so nothing in data/ or logs/ may be reachable by then.
+    `log_level` replaces the copied config's bot-wide level and per-cog overrides.
+    """
+    from cogs.jellyfin_core import JellyfinCore
+    from utils.logging_config import load_logging_config, setup_logging
+
+    state_dir = tempfile.mkdtemp(prefix="jellywatch-bench-")
+    for name in ("config.json", "user_mapping.json"):
+        source = os.path.join(JellyfinCore.DATA_DIR, name)
+        if os.path.exists(source):
+            shutil.copy(source, state_dir)
+    JellyfinCore.DATA_DIR = state_dir
+    logging_config = load_logging_config(os.path.join(state_dir, "config.json"))
+    if log_level is not None:
+        logging_config = {**logging_config, "level": log_level, "cogs": {}}
+    setup_logging(logging_config, log_dir=os.path.join(state_dir, "logs"))
+    return state_dir
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def summarize(values: Sequence[float]) -> Dict[str, float]:
+    if not values:
+        return {}
+    ordered = sorted(values)
+    return {
+        "min": ordered[0],
+        "median": statistics.median(ordered),
+        "p95": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+        "p99": ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))],
+        "max": ordered[-1],
+        "mean": statistics.fmean(ordered),
+    }
+
+
+def write_results(name: str, params: Dict[str, Any], ticks: List[Dict[str, Any]], summary: Dict[str, Any], output: Optional[str] = None) -> str:
+    """Write a result file and return its path; the default name includes the commit for later comparison."""
+    commit = git_commit()
+    if output is None:
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        output = os.path.join(RESULTS_DIR, f"{name}-{commit or 'nogit'}-{stamp}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    payload = {
+        "benchmark": name,
+        "commit": commit,
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "params": params,
+        "summary": summary,
+        "ticks": ticks,
+    }
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2)
+    return output
+
+
+def compare(baseline_path: str, summary: Dict[str, Any]) -> List[str]:
+    """Describe how each median in `summary` moved relative to a previous result file."""
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    lines = [f"Compared with {baseline.get('commit') or baseline_path}:"]
+    for key, stats in summary.items():
+        before = baseline.get("summary", {}).get(key, {})
+        if not isinstance(stats, dict) or "median" not in stats or "median" not in before:
+            continue
+        old, new = before["median"], stats["median"]
+        change = f"{(new - old) / old * 100:+.1f}%" if old else "n/a"
+        lines.append(f"  {key}: {old:.6g} -> {new:.6g} ({change})")
+    return lines
+
+
+class MemorySampler:
+    """Per-tick memory figures from tracemalloc plus the interpreter's allocated block count."""
+
+    def __init__(self, enabled: bool = True) -> None:
+        self.enabled = enabled
+
+    def __enter__(self) -> "MemorySampler":
+        if self.enabled and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        if self.enabled:
+            tracemalloc.stop()
+
+    def begin(self) -> None:
+        self._blocks = sys.getallocatedblocks()
+        if self.enabled:
+            tracemalloc.reset_peak()
+            self._current = tracemalloc.get_traced_memory()[0]
+
+    def end(self) -> Dict[str, int]:
+        sample = {"allocated_blocks_delta": sys.getallocatedblocks() - self._blocks}
+        if self.enabled:
+            current, peak = tracemalloc.get_traced_memory()
+            sample["retained_bytes"] = current - self._current
+            sample["peak_bytes"] = peak - self._current
+            sample["traced_bytes"] = current
+        return sample
+
+
+class Stopwatch:
+    def __enter__(self) -> "Stopwatch":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.elapsed = time.perf_counter() - self.start
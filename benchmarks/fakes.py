@@ -0,0 +1,340 @@
+"""Local aiohttp fakes of the services the bot polls, with configurable size and latency."""
+import asyncio
+import collections
+import enum
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from aiohttp import web
+from dateutil.parser import isoparse
+
+TICKS_PER_SECOND = 10_000_000
+
+
+class FakeService:
+    """Base class: runs an aiohttp app on an ephemeral local port and counts requests per path."""
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0) -> None:
+        self.latency = latency
+        self.jitter = jitter
+        self.requests: "collections.Counter[str]" = collections.Counter()
+        self.url = ""
+        self._runner: Optional[web.AppRunner] = None
+
+    def routes(self, app: web.Application) -> None:
+        raise NotImplementedError
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler: Any) -> web.StreamResponse:
+        self.requests[request.path] += 1
+        delay = self.latency + (random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay:
+            await asyncio.sleep(delay)
+        return await handler(request)
+
+    async def start(self) -> str:
+        app = web.Application(middlewares=[self._middleware])
+        self.routes(app)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        host, port = self._runner.addresses[0][:2]
+        self.url = f"http://{host}:{port}"
+        return self.url
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def request_count(self) -> int:
+        return sum(self.requests.values())
+
+
+class FakeJellyfin(FakeService):
+    """Fake of the Jellyfin endpoints the dashboard uses.
+
+    Even-numbered libraries hold movies, odd-numbered ones hold series with
+    `episodes_per_library` episodes, so every count query has something to return.
+    """
+
+    def __init__(
+        self,
+        libraries: int = 5,
+        items_per_library: int = 500,
+        episodes_per_library: int = 5000,
+        sessions: int = 5,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        server_name: str = "Fake Jellyfin",
+    ) -> None:
+        super().__init__(latency, jitter)
+        self.libraries = libraries
+        self.items_per_library = items_per_library
+        self.episodes_per_library = episodes_per_library
+        self.sessions = sessions
+        self.server_name = server_name
+        self.started_at = datetime.utcnow()
+        self.tasks_status = 200  # 403 stands for an API key that may not read scheduled tasks
+        # The library scan task, which tests start and finish to stage scans
+        self.scan_state = "Idle"
+        self.scan_progress: Optional[float] = None
+        self.scan_end: Optional[str] = None
+        # Scheduled tasks besides the library scan; tests replace them to stage start times
+        self.tasks: List[Dict[str, Any]] = [{
+            "Name": "Clean Transcode Directory",
+            "Triggers": [{"Type": "StartupTrigger"}],
+            "LastExecutionResult": {"StartTimeUtc": self.started_at.strftime("%Y-%m-%dT%H:%M:%S.0000000Z")},
+        }]
+
+    def routes(self, app: web.Application) -> None:
+        app.router.add_get("/System/Info", self.system_info)
+        app.router.add_get("/Sessions", self.get_sessions)
+        app.router.add_get("/Library/VirtualFolders", self.virtual_folders)
+        app.router.add_get("/Items", self.items)
+        app.router.add_get("/ScheduledTasks", self.scheduled_tasks)
+        app.router.add_get("/ScheduledTasks/{id}", self.scheduled_task)
+
+    def library_id(self, index: int) -> str:
+        return f"{index:032x}"
+
+    async def system_info(self, request: web.Request) -> web.Response:
+        return web.json_response({
+            "ServerName": self.server_name,
+            "Version": "10.9.11",
+            "OperatingSystem": "Linux",
+            "Id": "f" * 32,
+        })
+
+    async def get_sessions(self, request: web.Request) -> web.Response:
+        return web.json_response([self._session(i) for i in range(self.sessions)])
+
+    def _session(self, index: int) -> Dict[str, Any]:
+        runtime = 45 * 60 * TICKS_PER_SECOND
+        return {
+            "Id": f"{index:032x}",
+            "UserName": f"user{index % 50}",
+            "Client": "Jellyfin Web",
+            "DeviceName": f"Device {index}",
+            "NowPlayingItem": {
+                "Name": f"Episode {index % 24 + 1}",
+                "Type": "Episode",
+                "SeriesName": f"Series {index % 200}",
+                "ParentIndexNumber": index % 8 + 1,
+                "IndexNumber": index % 24 + 1,
+                "RunTimeTicks": runtime,
+            },
+            "PlayState": {"PositionTicks": (index * 37 % 100) * runtime // 100, "IsPaused": index % 7 == 0},
+            "TranscodingInfo": {"IsVideoDirect": index % 3 != 0} if index % 2 else None,
+        }
+
+    async def virtual_folders(self, request: web.Request) -> web.Response:
+        folders: List[Dict[str, Any]] = [
+            {
+                "ItemId": self.library_id(i),
+                "Name": f"{'Movies' if i % 2 == 0 else 'Shows'} {i}",
+                "CollectionType": "movies" if i % 2 == 0 else "tvshows",
+            }
+            for i in range(self.libraries)
+        ]
+        return web.json_response(folders)
+
+    async def scheduled_tasks(self, request: web.Request) -> web.Response:
+        if self.tasks_status != 200:
+            return web.Response(status=self.tasks_status)
+        return web.json_response([*self.tasks, self._scan_task()])
+
+    async def scheduled_task(self, request: web.Request) -> web.Response:
+        if request.match_info["id"] != self._scan_task()["Id"]:
+            return web.Response(status=404)
+        return web.json_response(self._scan_task())
+
+    def _scan_task(self) -> Dict[str, Any]:
+        return {
+            "Name": "Scan Media Library",
+            "Key": "RefreshLibrary",
+            "Id": "e" * 32,
+            "State": self.scan_state,
+            "CurrentProgressPercentage": self.scan_progress,
+            "Triggers": [{"Type": "IntervalTrigger"}],
+            "LastExecutionResult": {"EndTimeUtc": self.scan_end} if self.scan_end else None,
+        }
+
+    async def items(self, request: web.Request) -> web.Response:
+        parent = request.query.get("ParentId", "")
+        types = request.query.get("IncludeItemTypes", "")
+        try:
+            index = int(parent, 16)
+        except ValueError:
+            index = -1
+        count = 0
+        if 0 <= index < self.libraries:
+            is_movies = index % 2 == 0
+            if types == "Movie" and is_movies or types == "Series" and not is_movies:
+                count = self.items_per_library
+            elif types == "Episode" and not is_movies:
+                count = self.episodes_per_library
+        return web.json_response({"Items": [], "TotalRecordCount": count, "StartIndex": 0})
+
+
+class FakeFeed(FakeService):
+    """Fake of one paged Jellyfin listing read from a watermark, e.g. new items or the activity log.
+
+    `entries` are served newest first by `sort_field`. Those whose `date_field` is older than
+    the `min_date_param` query parameter are left out, and `start_param` / `limit_param`
+    page the rest. A `status` other than 200 fails every request with it.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        sort_field: str,
+        date_field: str,
+        min_date_param: str,
+        start_param: str = "StartIndex",
+        limit_param: str = "Limit",
+    ) -> None:
+        super().__init__()
+        self.path = path
+        self.sort_field = sort_field
+        self.date_field = date_field
+        self.min_date_param = min_date_param
+        self.start_param = start_param
+        self.limit_param = limit_param
+        self.entries: List[Dict[str, Any]] = []
+        self.status = 200
+
+    def routes(self, app: web.Application) -> None:
+        app.router.add_get(self.path, self.listing)
+
+    async def listing(self, request: web.Request) -> web.Response:
+        if self.status != 200:
+            return web.Response(status=self.status)
+        entries = sorted(self.entries, key=lambda entry: entry[self.sort_field], reverse=True)
+        if self.min_date_param in request.query:
+            since = isoparse(request.query[self.min_date_param])
+            entries = [entry for entry in entries if isoparse(entry[self.date_field]) >= since]
+        start = int(request.query.get(self.start_param, 0))
+        return web.json_response({"Items": entries[start:start + int(request.query[self.limit_param])]})
+
+
+class FakeSABnzbd(FakeService):
+    """Fake of the SABnzbd `mode=queue` API with a queue of `queue_size` downloads."""
+
+    def __init__(self, queue_size: int = 10, latency: float = 0.0, jitter: float = 0.0) -> None:
+        super().__init__(latency, jitter)
+        self.queue_size = queue_size
+
+    def routes(self, app: web.Application) -> None:
+        app.router.add_get("/api", self.api)
+
+    async def api(self, request: web.Request) -> web.Response:
+        if request.query.get("mode") != "queue":
+            return web.json_response({"status": False, "error": "not implemented"}, status=400)
+        slots = [
+            {
+                "filename": f"Some.Show.S{i % 10 + 1:02d}E{i % 24 + 1:02d}.German.DL.1080p.WEB.h264-GROUP",
+                "percentage": str(i * 7 % 100),
+                "timeleft": f"0:{i % 60:02d}:00",
+                "size": str((i % 40 + 1) * 1024 ** 3 // 4),
+            }
+            for i in range(self.queue_size)
+        ]
+        return web.json_response({
+            "queue": {"slots": slots, "kbpersec": "51200", "diskspace1": "812.5", "diskspacetotal1": "3725.0"}
+        })
+
+
+class BeatStatus(enum.Enum):
+    """Mirrors the member names of uptime_kuma_api's MonitorStatus, which is all the cog reads."""
+
+    DOWN = 0
+    UP = 1
+    PENDING = 2
+    MAINTENANCE = 3
+
+
+class FakeUptimeKumaApi:
+    """In-process stand-in for `uptime_kuma_api.UptimeKumaApi`.
+
+    The real client talks socket.io; this one returns generated heartbeats with the same
+    shape, after `latency` seconds of blocking per call like the real synchronous client.
+    """
+
+    beats_per_hour = 60
+    down_every = 500
+    latency = 0.0
+    calls: "collections.Counter[str]" = collections.Counter()
+    _lock = threading.Lock()
+
+    def __init__(self, url: str, *args: Any, **kwargs: Any) -> None:
+        self.url = url
+
+    def __enter__(self) -> "FakeUptimeKumaApi":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.disconnect()
+
+    def _call(self, name: str) -> None:
+        with self._lock:
+            self.calls[name] += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def login(self, username: Optional[str] = None, password: Optional[str] = None) -> Dict[str, Any]:
+        self._call("login")
+        return {"token": "fake"}
+
+    def get_monitor_beats(self, monitor_id: int, hours: int) -> List[Dict[str, Any]]:
+        self._call("get_monitor_beats")
+        now = datetime.now()
+        count = hours * self.beats_per_hour
+        step = timedelta(hours=1) / self.beats_per_hour
+        return [
+            {
+                "id": i,
+                "monitor_id": monitor_id,
+                "status": BeatStatus.DOWN if i % self.down_every == self.down_every - 1 else BeatStatus.UP,
+                "time": (now - step * (count - i)).strftime("%Y-%m-%d %H:%M:%S"),
+            }
+            for i in range(count)
+        ]
+
+    def disconnect(self) -> None:
+        pass
+
+
+class StubMessage:
+    """Stands in for a discord.PartialMessage; records edits instead of calling Discord."""
+
+    def __init__(self, channel: "StubChannel", message_id: int) -> None:
+        self.channel = channel
+        self.id = message_id
+
+    async def edit(self, **kwargs: Any) -> "StubMessage":
+        self.channel.edits += 1
+        self.channel.last_embed = kwargs.get("embed")
+        return self
+
+
+class StubChannel:
+    """Minimal text channel for `_send_dashboard_message` that counts sends and edits."""
+
+    def __init__(self, channel_id: int = 1) -> None:
+        self.id = channel_id
+        self.sends = 0
+        self.edits = 0
+        self.last_embed: Any = None
+
+    def get_partial_message(self, message_id: int) -> StubMessage:
+        return StubMessage(self, message_id)
+
+    async def send(self, **kwargs: Any) -> StubMessage:
+        self.sends += 1
+        self.last_embed = kwargs.get("embed")
+        return StubMessage(self, 1_000_000 + self.sends)
@@ -0,0 +1,295 @@
+"""Scenario-driven load harness: run the real cogs' polling loops at accelerated time.
+
+The Jellyfin cog's own `update_status` and `update_dashboard` loops run against local
+fakes with their intervals, cache lifetime and Discord pacing divided by `--time-scale`.
+The SABnzbd and Uptime Kuma cogs are registered on the bot, so each dashboard tick
+fetches them through the real aggregation stage; the Uptime client is swapped for an
+in-process fake. Event loop lag comes from the
+watchdog, memory from tracemalloc, and edits from a stub channel.
+
+    python -m benchmarks.load --scenario large --ticks 2000
+    python -m benchmarks.load --scenario large --check     # exit 1 if a threshold is exceeded
+    python -m benchmarks.load --scenario-file my_scenario.json --check
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+import tracemalloc
+from typing import Any, Dict, List, Optional
+
+from benchmarks.common import isolate_state, make_bot, summarize, write_results
+from benchmarks.fakes import FakeJellyfin, FakeSABnzbd, FakeUptimeKumaApi, StubChannel
+
+SCENARIOS: Dict[str, Dict[str, Any]] = {
+    "baseline": {
+        "jellyfin": {"libraries": 5, "items_per_library": 500, "episodes_per_library": 5000, "sessions": 5, "latency": 0.005},
+        "sabnzbd": {"queue_size": 10, "latency": 0.005},
+        "uptime": {"beats_per_hour": 2, "latency": 0.01},
+        # Dashboard source deadlines in real seconds; every fake answers well within them, so
+        # the tick latency threshold measures the dashboard and not a deadline running out
+        "deadlines": {"jellyfin": 0.4, "sabnzbd": 0.4, "uptime": 0.4},
+        "thresholds": {
+            "dashboard_tick_p99_seconds": 0.5,
+            "loop_lag_p99_seconds": 0.1,
+            "memory_growth_bytes": 5_000_000,
+            "edits_per_simulated_minute": 1.5,
+            "uptime_late_fetches_per_tick": 0,
+        },
+    },
+    "late_source": {
+        # Uptime Kuma takes about 1.2s per fetch against a 0.2s deadline: ticks must keep to the
+        # deadline with a stale Uptime snapshot, while the other sources are never late
+        "jellyfin": {"libraries": 5, "items_per_library": 500, "episodes_per_library": 5000, "sessions": 5, "latency": 0.005},
+        "sabnzbd": {"queue_size": 10, "latency": 0.005},
+        "uptime": {"beats_per_hour": 2, "latency": 0.3},
+        "deadlines": {"jellyfin": 0.4, "sabnzbd": 0.4, "uptime": 0.2},
+        "thresholds": {
+            "dashboard_tick_p99_seconds": 0.35,
+            "loop_lag_p99_seconds": 0.1,
+            "uptime_late_fetches_per_tick": [0.5, 1.0],
+            "jellyfin_late_fetches_per_tick": 0,
+            "sabnzbd_late_fetches_per_tick": 0,
+        },
+    },
+    "large": {
+        # 500 streams, 60 libraries, 200k episodes across the 30 series libraries, 300 queued downloads
+        "jellyfin": {"libraries": 60, "items_per_library": 2000, "episodes_per_library": 6667, "sessions": 500, "latency": 0.02},
+        "sabnzbd": {"queue_size": 300, "latency": 0.02},
+        "uptime": {"beats_per_hour": 60, "latency": 0.05},
+        "deadlines": {"jellyfin": 1.5, "sabnzbd": 1.5, "uptime": 1.5},
+        "thresholds": {
+            "dashboard_tick_p99_seconds": 2.0,
+            "loop_lag_p99_seconds": 0.25,
+            "memory_growth_bytes": 20_000_000,
+            "edits_per_simulated_minute": 1.5,
+        },
+    },
+    "slow_upstream": {
+        "jellyfin": {"libraries": 20, "items_per_library": 1000, "episodes_per_library": 5000, "sessions": 50, "latency": 0.25, "jitter": 0.25},
+        "sabnzbd": {"queue_size": 50, "latency": 0.5},
+        "uptime": {"beats_per_hour": 60, "latency": 0.5},
+        "thresholds": {
+            "dashboard_tick_p99_seconds": 10.0,
+            "loop_lag_p99_seconds": 0.1,
+            "memory_growth_bytes": 10_000_000,
+            "edits_per_simulated_minute": 1.5,
+        },
+    },
+}
+
+STATUS_INTERVAL = 30
+DASHBOARD_INTERVAL = 60
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), default="baseline")
+    parser.add_argument("--scenario-file", help="JSON file with the same keys as a built-in scenario")
+    parser.add_argument("--ticks", type=int, default=1000, help="dashboard ticks to simulate")
+    parser.add_argument("--time-scale", type=float, default=600.0, help="simulated seconds per real second")
+    parser.add_argument("--channels", type=int, default=1, help="dashboard channels per server")
+    parser.add_argument("--memory-every", type=int, default=50, help="sample traced memory every N dashboard ticks")
+    parser.add_argument("--check", action="store_true", help="exit with status 1 if any threshold is exceeded")
+    parser.add_argument("--output", help="result file (default: benchmarks/results/load-<scenario>-<commit>-<time>.json)")
+    return parser.parse_args()
+
+
+def load_scenario(args: argparse.Namespace) -> Dict[str, Any]:
+    if args.scenario_file:
+        with open(args.scenario_file, "r", encoding="utf-8") as f:
+            return json.load(f)
+    return SCENARIOS[args.scenario]
+
+
+def timed_loop(loop: Any, samples: List[float], on_tick: Optional[Any] = None) -> None:
+    """Wrap a running tasks.Loop's coroutine so every iteration's duration is recorded."""
+    original = loop.coro
+
+    async def wrapper(*args: Any, **kwargs: Any) -> None:
+        started = time.perf_counter()
+        try:
+            await original(*args, **kwargs)
+        finally:
+            samples.append(time.perf_counter() - started)
+            if on_tick is not None:
+                on_tick()
+
+    loop.coro = wrapper
+
+
+def accelerate_queue(scale: float) -> None:
+    """Shrink the Discord pacing windows so edits are paced in simulated rather than real time."""
+    from utils import discord_queue
+
+    for kind, (limit, period) in list(discord_queue.ROUTE_LIMITS.items()):
+        discord_queue.ROUTE_LIMITS[kind] = (limit, period / scale)
+
+
+async def run(args: argparse.Namespace, scenario: Dict[str, Any]) -> Dict[str, Any]:
+    from cogs.jellyfin_core import JellyfinCore, JellyfinServer
+    from cogs.sabnzbd import SABnzbd
+    from utils import discord_queue, snapshots
+    from utils.watchdog import LoopWatchdog
+
+    scale = args.time_scale
+    accelerate_queue(scale)
+
+    jellyfin = FakeJellyfin(**scenario.get("jellyfin", {}))
+    sabnzbd = FakeSABnzbd(**scenario.get("sabnzbd", {}))
+    await jellyfin.start()
+    await sabnzbd.start()
+
+    bot = make_bot()
+    channels = {channel_id: StubChannel(channel_id) for channel_id in range(1, args.channels + 1)}
+    presence_updates = 0
+
+    async def wait_until_ready() -> None:
+        return None
+
+    async def change_presence(**kwargs: Any) -> None:
+        nonlocal presence_updates
+        presence_updates += 1
+
+    bot.wait_until_ready = wait_until_ready  # type: ignore[assignment]
+    bot.get_channel = channels.get  # type: ignore[assignment]
+    bot.change_presence = change_presence  # type: ignore[assignment]
+
+    sab = SABnzbd(bot)
+    sab.SABNZBD_URL = sabnzbd.url + "/"
+    sab.SABNZBD_API_KEY = "load"
+    await bot.add_cog(sab)
+
+    try:
+        import cogs.uptime as uptime_module
+    except ImportError as e:
+        print(f"Skipping Uptime Kuma polling: {e}", file=sys.stderr)
+    else:
+        for key, value in scenario.get("uptime", {}).items():
+            setattr(FakeUptimeKumaApi, key, value)
+        uptime_module.UptimeKumaApi = FakeUptimeKumaApi
+        uptime = uptime_module.Uptime(bot)
+        uptime.api_url, uptime.username, uptime.password, uptime.monitor_id = "fake://kuma", "load", "load", 1
+        await bot.add_cog(uptime)
+
+    isolate_state(log_level="WARNING")
+    cog = JellyfinCore(bot)
+    cog.servers = [JellyfinServer("load", jellyfin.url, list(channels), api_key="load")]
+    cog.library_update_interval /= scale
+    if "deadlines" in scenario:
+        cog.config["dashboard"] = {**cog.config.get("dashboard", {}), "source_deadlines": scenario["deadlines"]}
+    cog.update_status.change_interval(seconds=STATUS_INTERVAL / scale)
+    cog.update_dashboard.change_interval(seconds=DASHBOARD_INTERVAL / scale)
+
+    dashboard_ticks: List[float] = []
+    status_ticks: List[float] = []
+    memory_samples: List[int] = []
+    done = asyncio.Event()
+
+    def on_dashboard_tick() -> None:
+        if len(dashboard_ticks) % args.memory_every == 0:
+            memory_samples.append(tracemalloc.get_traced_memory()[0])
+        if len(dashboard_ticks) >= args.ticks:
+            done.set()
+
+    timed_loop(cog.update_status, status_ticks)
+    timed_loop(cog.update_dashboard, dashboard_ticks, on_dashboard_tick)
+
+    watchdog = LoopWatchdog(interval=0.02, threshold=0.25, history=100_000)
+    tracemalloc.start()
+    watchdog.start()
+    # The stub bot never becomes ready, so start the loops the way on_ready would
+    cog.supervisor.start()
+    started = time.perf_counter()
+    try:
+        await done.wait()
+    finally:
+        elapsed = time.perf_counter() - started
+        cog.update_status.cancel()
+        cog.update_dashboard.cancel()
+        await watchdog.stop()
+        memory_samples.append(tracemalloc.get_traced_memory()[0])
+        tracemalloc.stop()
+        await cog.cog_unload()
+        await jellyfin.stop()
+        await sabnzbd.stop()
+
+    simulated_minutes = elapsed * scale / 60
+    edits = sum(channel.edits + channel.sends for channel in channels.values())
+    lag = watchdog.stats()
+    # Skip the first sample, which includes imports and the cold library cache
+    growth = memory_samples[-1] - memory_samples[1] if len(memory_samples) > 2 else 0
+    summary: Dict[str, Any] = {
+        "dashboard_tick_seconds": summarize(dashboard_ticks),
+        "status_tick_seconds": summarize(status_ticks),
+        "stale_sources": {
+            f"{source}:{result}": snapshots.SOURCE_FETCHES.get(source=source, result=result)
+            for source in ("jellyfin:load", "sabnzbd", "uptime")
+            for result in ("late", "failed")
+        },
+        "loop_lag_seconds": {"median": lag["p50"], "p99": lag["p99"], "max": lag["max"]},
+        "loop_stalls": lag["stalls"],
+        "memory_growth_bytes": growth,
+        "discord_edits": edits,
+        "discord_edits_superseded": discord_queue.QUEUE_DROPPED.get(reason="superseded"),
+        "presence_updates": presence_updates,
+        "edits_per_simulated_minute": edits / args.channels / simulated_minutes if simulated_minutes else 0.0,
+        "requests": {"jellyfin": dict(jellyfin.requests), "sabnzbd": dict(sabnzbd.requests), "uptime": dict(FakeUptimeKumaApi.calls)},
+        "simulated_minutes": simulated_minutes,
+        "wall_seconds": elapsed,
+    }
+    summary["thresholds"] = check_thresholds(summary, scenario.get("thresholds", {}), len(dashboard_ticks))
+    ticks = [{"tick": i, "seconds": seconds} for i, seconds in enumerate(dashboard_ticks)]
+    return {"ticks": ticks, "summary": summary, "memory_samples": memory_samples}
+
+
+def check_thresholds(summary: Dict[str, Any], thresholds: Dict[str, Any], ticks: int) -> Dict[str, Dict[str, Any]]:
+    """Compare the measured values with the scenario's limits: a maximum, or a [minimum, maximum] range."""
+    measured = {
+        "dashboard_tick_p99_seconds": summary["dashboard_tick_seconds"].get("p99"),
+        "loop_lag_p99_seconds": summary["loop_lag_seconds"]["p99"],
+        "memory_growth_bytes": summary["memory_growth_bytes"],
+        "edits_per_simulated_minute": summary["edits_per_simulated_minute"],
+    }
+    for name, count in summary["stale_sources"].items():
+        source, result = name.split(":")[0], name.rsplit(":", 1)[1]
+        measured[f"{source}_{result}_fetches_per_tick"] = count / ticks if ticks else 0.0
+    results = {}
+    for name, limit in thresholds.items():
+        low, high = limit if isinstance(limit, list) else (None, limit)
+        value = measured.get(name)
+        passed = value is not None and value <= high and (low is None or value >= low)
+        results[name] = {"limit": limit, "value": value, "passed": passed}
+    return results
+
+
+def main() -> None:
+    args = parse_args()
+    scenario = load_scenario(args)
+    result = asyncio.run(run(args, scenario))
+    summary = result["summary"]
+    name = f"load-{args.scenario if not args.scenario_file else 'custom'}"
+    path = write_results(name, {**vars(args), "scenario_config": scenario}, result["ticks"], summary, args.output)
+
+    print(f"Simulated {summary['simulated_minutes']:.0f} minutes in {summary['wall_seconds']:.1f}s")
+    for key in ("dashboard_tick_seconds", "status_tick_seconds", "loop_lag_seconds"):
+        stats = summary[key]
+        if stats:
+            print(f"{key:26} median {stats['median']:.4f}  p99 {stats['p99']:.4f}  max {stats['max']:.4f}")
+    print(f"memory growth {summary['memory_growth_bytes'] / 1024:.0f} KiB, "
+          f"{summary['discord_edits']} edits ({summary['discord_edits_superseded']:.0f} superseded), "
+          f"{summary['presence_updates']} presence updates")
+    stale = {name: count for name, count in summary["stale_sources"].items() if count}
+    if stale:
+        print("stale source fetches: " + ", ".join(f"{name} {count:.0f}" for name, count in stale.items()))
+    failed = [name for name, result in summary["thresholds"].items() if not result["passed"]]
+    for name, result in summary["thresholds"].items():
+        print(f"{'PASS' if result['passed'] else 'FAIL'} {name}: {result['value']} (limit {result['limit']})")
+    print(f"Results written to {path}")
+    if args.check and failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,13 +5,30 @@ import time
 import json
 import os
 import logging
-from datetime import datetime, timedelta
-from typing import Optional, Dict, Any, List
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Dict, Any, List, Tuple, Callable, Awaitable
 from dotenv import load_dotenv
+from dateutil.parser import isoparse
 from discord import app_commands
-from main import is_authorized
+from utils.auth import is_authorized
+from utils.command_sync import COMMAND_HASH_FILE
+from utils.command_sync import command_tree_hash, save_synced_hash
+from utils.discord_queue import DiscordUpdateQueue
+from utils import metrics, tracing
+from utils.circuit_breaker import CLOSED, OPEN, CircuitBreaker
+from utils.snapshots import Snapshot, SourceAggregator, SourceUnavailable
+from utils.config_watcher import WATCHER, parse_config
+from utils.supervisor import TaskSupervisor
+from utils.title_index import TitleIndex
+from utils.poster_cache import PosterCache
+from utils.charts import ChartCache, TimeSeries, chart_row
+from utils.latency import LatencyTracker, hedged
+from utils.activity_log import ActivityFilter, activity_emoji
 import asyncio
 import aiohttp
+import copy
+import functools
+import io
 
 # Library name to emoji mapping with priority order
 LIBRARY_EMOJIS = {
@@ -157,44 +174,222 @@ RUNNING_IN_DOCKER = os.getenv("RUNNING_IN_DOCKER", "false").lower() == "true"
 if not RUNNING_IN_DOCKER:
     load_dotenv()
 
+# Client identification sent with every Jellyfin request
+JELLYFIN_CLIENT_HEADERS = {
+    "X-Emby-Client": "JellyWatch",
+    "X-Emby-Client-Version": "1.0.0",
+    "X-Emby-Device-Name": "JellyWatch",
+    "X-Emby-Device-Id": "jellywatch-bot",
+    "Accept": "application/json",
+    "X-Emby-Authorization": "MediaBrowser Client=\"JellyWatch\", Device=\"JellyWatch\", DeviceId=\"jellywatch-bot\", Version=\"1.0.0\""
+}
+
+# Configure timeout for all requests (10s connect, 30s total); library stats allow longer.
+# Dashboard reads derive tighter timeouts from observed latency and only fall back to these.
+DEFAULT_TIMEOUT = aiohttp.ClientTimeout(total=30, connect=10)
+LIBRARY_TIMEOUT = aiohttp.ClientTimeout(total=60, connect=10)
+
+# Seconds a dashboard tick waits for each source before showing its last snapshot instead
+DEFAULT_SOURCE_DEADLINES = {"jellyfin": 20.0, "sabnzbd": 5.0, "uptime": 10.0}
+MAX_QUEUE_ROWS = 3  # SABnzbd downloads listed on the dashboard; the rest are summarized
+
+# Recently added feed: items per /Items page, and pages read per library when a burst overflows one
+RECENTLY_ADDED_PAGE = 20
+RECENTLY_ADDED_MAX_PAGES = 5
+RECENTLY_ADDED_MAX_LINES = 25
+
+# Activity log feed: entries per page, pages read per poll, and entries listed before the rest are summarized
+ACTIVITY_PAGE = 100
+ACTIVITY_MAX_PAGES = 20
+ACTIVITY_MAX_LINES = 20
+
+SEARCH_INDEX_PAGE = 1000  # titles per /Items page during a full index build
+SEARCH_RESULTS = 10  # matches listed by /search
+
+POSTER_WAIT = 10.0  # seconds a recently added post waits for its poster before going out without one
+
+# Dashboard history chart colors
+STREAMS_COLOR = (0, 164, 220)
+SABNZBD_COLOR = (250, 166, 26)
+
+START_TIME_RECHECK = 1800  # seconds between start time re-derivations while the server stays up
+STARTUP_BURST = timedelta(minutes=10)  # startup tasks run within this window after the server starts
+
+
+class JellyfinServer:
+    """Connection settings and cached state for one monitored Jellyfin server."""
+
+    def __init__(
+        self,
+        name: str,
+        url: Optional[str],
+        channel_ids: List[int],
+        api_key: Optional[str] = None,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+    ) -> None:
+        self.name = name
+        self.url = url.rstrip("/") if url else url
+        self.channel_ids = channel_ids
+        self.api_key = api_key
+        self.username = username
+        self.password = password
+        self.access_token: Optional[str] = None
+
+        # Per-server state, so one server failing never affects another
+        self.start_time: Optional[datetime] = None  # when the Jellyfin server itself started (UTC)
+        self.start_time_checked: Optional[datetime] = None
+        self.restart_suspected = False  # set by an outage, cleared once the start time is re-derived
+        self.last_version: Optional[str] = None
+        self.dashboard_message_ids: Dict[int, int] = {}  # channel ID -> dashboard message ID
+        self.offline_since: Optional[datetime] = None
+        # Duration, footer and field values shown by the last offline embed
+        self.offline_render_key: Optional[Tuple[str, str, Tuple[str, ...]]] = None
+        self.server_name: Optional[str] = None  # last name reported by /System/Info
+        self.library_cache: Dict[str, Dict[str, Any]] = {}
+        self.last_library_update: Optional[datetime] = None
+        self.added_watermarks: Dict[str, datetime] = {}  # library ID -> newest DateCreated already announced
+        self.scan_task_id: Optional[str] = None  # ID of Jellyfin's "Scan Media Library" task, once found
+        self.scan_polling = True  # cleared when the API key may not read scheduled tasks
+        self.scan_progress: Optional[float] = None  # percent done while a library scan runs, None when idle
+        self.scan_last_end: Optional[str] = None  # EndTimeUtc of the last finished scan
+        self.activity_watermark: Optional[Tuple[datetime, int]] = None  # (Date, Id) of the newest activity entry seen
+        self.activity_polling = True  # cleared when the API key may not read the activity log
+
+        # Shared by every Jellyfin call for this server; an open circuit means the server is offline
+        self.breaker = CircuitBreaker(f"jellyfin:{name}")
+        self.breaker.add_listener(self._on_circuit_change)
+
+    def _on_circuit_change(self, old: str, new: str) -> None:
+        if new == OPEN and self.offline_since is None:
+            self.offline_since = datetime.now()
+            # It may come back restarted, so re-derive the start time on the next successful poll
+            self.restart_suspected = True
+        elif new == CLOSED:
+            self.offline_since = None
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        """Request headers including the API key or the token from username/password login."""
+        token = self.api_key or self.access_token
+        return {**JELLYFIN_CLIENT_HEADERS, "X-Emby-Token": token} if token else dict(JELLYFIN_CLIENT_HEADERS)
+
+
 class JellyfinCore(commands.Cog):
+    # Gateway intents this cog relies on: guilds keeps the channel cache used for the dashboard
+    required_intents = discord.Intents(guilds=True)
+
+    # config.json, user_mapping.json and everything the cog persists; the benchmarks use a scratch copy
+    DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data")
+
     def __init__(self, bot: commands.Bot) -> None:
         self.bot = bot
         self.logger = logging.getLogger("jellywatch_bot.jellyfin")
 
-        # Load environment variables
-        self.JELLYFIN_URL = os.getenv("JELLYFIN_URL")
-        self.JELLYFIN_API_KEY = os.getenv("JELLYFIN_API_KEY")
-        self.JELLYFIN_USERNAME = os.getenv("JELLYFIN_USERNAME")
-        self.JELLYFIN_PASSWORD = os.getenv("JELLYFIN_PASSWORD")
-        channel_id = os.getenv("CHANNEL_ID")
-        if channel_id is None:
-            self.logger.error("CHANNEL_ID not set in .env file")
-            raise ValueError("CHANNEL_ID must be set in .env")
-        self.CHANNEL_ID = int(channel_id)
-
         # File paths
-        self.current_dir = os.path.dirname(os.path.abspath(__file__))
-        self.MESSAGE_ID_FILE = os.path.join(self.current_dir, "..", "data", "dashboard_message_id.json")
-        self.USER_MAPPING_FILE = os.path.join(self.current_dir, "..", "data", "user_mapping.json")
-        self.CONFIG_FILE = os.path.join(self.current_dir, "..", "data", "config.json")
+        self.MESSAGE_ID_FILE = os.path.join(self.DATA_DIR, "dashboard_messages.json")
+        self.LEGACY_MESSAGE_ID_FILE = os.path.join(self.DATA_DIR, "dashboard_message_id.json")
+        self.START_TIME_FILE = os.path.join(self.DATA_DIR, "server_start_times.json")
+        self.RECENTLY_ADDED_FILE = os.path.join(self.DATA_DIR, "recently_added.json")
+        self.ACTIVITY_LOG_FILE = os.path.join(self.DATA_DIR, "activity_log.json")
+        self.SEARCH_INDEX_FILE = os.path.join(self.DATA_DIR, "search_index.sqlite3")
+        self.POSTER_DIR = os.path.join(self.DATA_DIR, "posters")
+        self.USER_MAPPING_FILE = os.path.join(self.DATA_DIR, "user_mapping.json")
+        self.CONFIG_FILE = os.path.join(self.DATA_DIR, "config.json")
 
         # Initialize state
         self.config = self._load_config()
-        self.jellyfin_start_time: Optional[float] = None
-        self.dashboard_message_id = self._load_message_id()
+        self.servers = self._load_servers()
+        self._load_message_ids()
+        self._load_start_times()
+        self._load_watermarks()
+        self._load_activity_watermarks()
         self.last_scan = datetime.now()
-        self.offline_since: Optional[datetime] = None
         self.stream_debug = False
 
+        # One connection pool shared by every server, created on first use
+        self.http_session: Optional[aiohttp.ClientSession] = None
+
+        # Latency of each server's dashboard endpoints, which sets their timeouts and hedge delays
+        http = self.config["http"]
+        self.latency = LatencyTracker(float(http.get("timeout_multiplier", 3.0)), float(http.get("min_timeout", 2.0)))
+
+        # Title index behind /search, opened on first use
+        self.title_index: Optional[TitleIndex] = None
+
+        # Every dashboard edit and presence change goes through this queue
+        self.update_queue = DiscordUpdateQueue()
+
+        # Fetches Jellyfin, SABnzbd and Uptime Kuma side by side for each dashboard tick
+        self.sources = SourceAggregator()
+
+        # Poster thumbnails, uploaded once to the posters channel and reused by every later embed
+        posters = self.config["posters"]
+        self.posters = PosterCache(
+            self.POSTER_DIR, self._upload_image,
+            max_entries=int(posters.get("max_entries", 500)), size=int(posters.get("size", 300)),
+        )
+
+        # 24 hours of streams per server and SABnzbd speed, drawn as a chart under the dashboard
+        self.history: Dict[str, TimeSeries] = {}
+        self.charts = ChartCache(self._upload_chart)
+
+        # Last presence text sent to the gateway and position in the section rotation
+        self.last_presence: Optional[str] = None
+        self.presence_rotation = -1
+
         # Cache settings
-        self.library_cache: Dict[str, Dict[str, Any]] = {}
-        self.last_library_update: Optional[datetime] = None
         self.library_update_interval = self.config.get("cache", {}).get("library_update_interval", 900)
 
         self.user_mapping = self._load_user_mapping()
-        self.update_status.start()
-        self.update_dashboard.start()
+
+        # The supervisor owns the loops and everything they use: crashed loops are restarted,
+        # and on unload the loops are cancelled first, then the resources closed newest first
+        self.supervisor = TaskSupervisor("jellyfin")
+        self.supervisor.add_resource("http_session", self._close_session)
+        self.supervisor.add_resource("title_index", self._close_title_index)
+        self.supervisor.add_resource("update_queue", self.update_queue.close)
+        self.supervisor.add_resource("sources", self.sources.close)
+        self.supervisor.add_resource("posters", self.posters.close)
+        self.supervisor.add_resource("charts", self.charts.close)
+
+        # Edits to config.json and user_mapping.json are applied in place, without a cog reload
+        self.supervisor.add_resource("config", WATCHER.subscribe(self.CONFIG_FILE, self._apply_config))
+        self.supervisor.add_resource("user_mapping", WATCHER.subscribe(self.USER_MAPPING_FILE, self._apply_user_mapping))
+
+        self.supervisor.add_loop(self.update_status)
+        self.supervisor.add_loop(self.update_dashboard)
+        self.supervisor.add_loop(self.recently_added_feed)
+        self.supervisor.add_loop(self.activity_log_feed)
+        self.supervisor.add_loop(self.refresh_search_index)
+        self.recently_added_feed.change_interval(minutes=self._recently_added_interval())
+        self.activity_log_feed.change_interval(minutes=self._activity_log_interval())
+
+    async def cog_load(self) -> None:
+        """Start the loops if the bot is ready; a cog loaded before that starts them in on_ready.
+
+        The loops wait for the gateway cache, which a bot that has not logged in yet cannot do.
+        """
+        if self.bot.is_ready():
+            self.supervisor.start()
+
+    async def cog_unload(self) -> None:
+        """Cancel and await the background loops, then release their resources."""
+        await self.supervisor.close()
+
+    async def _close_session(self) -> None:
+        if self.http_session is not None and not self.http_session.closed:
+            await self.http_session.close()
+
+    def _get_title_index(self) -> TitleIndex:
+        if self.title_index is None:
+            self.title_index = TitleIndex(self.SEARCH_INDEX_FILE)
+        return self.title_index
+
+    def _close_title_index(self) -> None:
+        if self.title_index is not None:
+            self.title_index.close()
+            self.title_index = None
 
     def _format_size(self, size_bytes: int) -> str:
         """Convert bytes to a human-readable format."""
@@ -204,10 +399,9 @@ class JellyfinCore(commands.Cog):
             size_bytes /= 1024.0
         return f"{size_bytes:.1f} PB"
 
-    def _load_config(self) -> Dict[str, Any]:
-        """Load configuration from config.json with defaults if unavailable."""
-        default_config = {
-            "dashboard": {"name": "Jellyfin Dashboard", "icon_url": "", "footer_icon_url": ""},
+    def _default_config(self) -> Dict[str, Any]:
+        return {
+            "dashboard": {"name": "Jellyfin Dashboard", "icon_url": "", "footer_icon_url": "", "offline_granularity_minutes": 15, "source_deadlines": dict(DEFAULT_SOURCE_DEADLINES), "history_chart": 1},
             "jellyfin_sections": {"show_all": 1, "sections": {}},
             "presence": {
                 "sections": [],
@@ -215,42 +409,252 @@ class JellyfinCore(commands.Cog):
                 "stream_text": "{count} active Stream{s} 🟢",
             },
             "cache": {"library_update_interval": 900},
+            "recently_added": {"channel_id": 0, "interval_minutes": 5},
+            "activity_log": {"channel_id": 0, "interval_minutes": 1, "types": [], "exclude_types": [], "min_severity": "Information"},
+            "search": {"rebuild_hours": 24},
+            "posters": {"channel_id": 0, "max_entries": 500, "size": 300},
+            "http": {"timeout_multiplier": 3.0, "min_timeout": 2.0, "hedge_reads": 1},
         }
+
+    def _load_config(self) -> Dict[str, Any]:
+        """Load configuration from config.json with defaults if unavailable."""
         try:
             with open(self.CONFIG_FILE, "r", encoding="utf-8") as f:
-                config = json.load(f)
-                # Convert any boolean values to integers
-                if "jellyfin_sections" in config:
-                    if "show_all" in config["jellyfin_sections"]:
-                        config["jellyfin_sections"]["show_all"] = int(config["jellyfin_sections"]["show_all"])
-                    if "sections" in config["jellyfin_sections"]:
-                        for section in config["jellyfin_sections"]["sections"].values():
-                            if "show_episodes" in section:
-                                section["show_episodes"] = int(section["show_episodes"])
-                return {**default_config, **config}  # Merge with defaults
-        except (FileNotFoundError, json.JSONDecodeError) as e:
+                config = parse_config(json.load(f))
+                return {**self._default_config(), **config}  # Merge with defaults
+        except (FileNotFoundError, ValueError) as e:
             self.logger.error(f"Failed to load config: {e}. Using defaults.")
-            return default_config
+            return self._default_config()
+
+    def _apply_config(self, config: Dict[str, Any]) -> None:
+        """Apply an edited config.json, resetting only the state that the changed blocks feed."""
+        # The watcher shares its parsed value between subscribers, and commands mutate self.config
+        old, new = self.config, {**self._default_config(), **copy.deepcopy(config)}
+        self.config = new
+        if new.get("servers") != old.get("servers"):
+            self.logger.warning("The server list in config.json changed; reload the jellyfin_core cog to apply it")
+        if new["jellyfin_sections"] != old["jellyfin_sections"]:
+            self._apply_section_changes(old["jellyfin_sections"], new["jellyfin_sections"])
+        if new["presence"] != old["presence"]:
+            self.last_presence = None
+            self.presence_rotation = -1
+        if new["cache"] != old["cache"]:
+            self.library_update_interval = new["cache"].get("library_update_interval", 900)
+        if new["recently_added"] != old["recently_added"]:
+            self.recently_added_feed.change_interval(minutes=self._recently_added_interval())
+        if new["activity_log"] != old["activity_log"]:
+            self.activity_log_feed.change_interval(minutes=self._activity_log_interval())
+        if new["posters"] != old["posters"]:
+            # Existing thumbnails keep their size until they are evicted
+            self.posters.max_entries = int(new["posters"].get("max_entries", 500))
+            self.posters.size = int(new["posters"].get("size", 300))
+        if new["http"] != old["http"]:
+            self.latency.multiplier = float(new["http"].get("timeout_multiplier", 3.0))
+            self.latency.floor = float(new["http"].get("min_timeout", 2.0))
+        if new["dashboard"] != old["dashboard"]:
+            # Force the next tick to re-render offline dashboards as well
+            for server in self.servers:
+                server.offline_render_key = None
+
+    def _apply_section_changes(self, old: Dict[str, Any], new: Dict[str, Any]) -> None:
+        """Recount libraries only when the change affects what is counted; relabel the cache otherwise."""
+        old_sections, new_sections = old.get("sections", {}), new.get("sections", {})
+        recount = (
+            old.get("show_all") != new.get("show_all")
+            or set(old_sections) != set(new_sections)
+            or any(
+                int(section.get("show_episodes", 0)) != int(old_sections[library_id].get("show_episodes", 0))
+                for library_id, section in new_sections.items()
+            )
+        )
+        if recount:
+            self.logger.info("Library selection changed, recounting libraries on the next poll")
+            self._invalidate_library_caches()
+            return
+        for server in self.servers:
+            for library_id, stats in server.library_cache.items():
+                section = new_sections.get(library_id)
+                if section:
+                    stats["display_name"] = section.get("display_name", stats["display_name"])
+                    stats["emoji"] = section.get("emoji", stats["emoji"])
+
+    def _load_servers(self) -> List[JellyfinServer]:
+        """Build the monitored servers from the `servers` list in config.json, or from .env if it is empty."""
+        servers: List[JellyfinServer] = []
+        for index, entry in enumerate(self.config.get("servers", [])):
+            name = str(entry.get("name") or f"server{index + 1}")
+            channel_ids = [int(c) for c in entry.get("channel_ids", [])] or ([int(entry["channel_id"])] if entry.get("channel_id") else [])
+            if not entry.get("url") or not channel_ids:
+                self.logger.error(f"Server '{name}' in config.json needs a 'url' and 'channel_ids', skipping it")
+                continue
+            if any(server.name == name for server in servers):
+                self.logger.error(f"Duplicate server name '{name}' in config.json, skipping it")
+                continue
+            servers.append(JellyfinServer(
+                name=name,
+                url=entry["url"],
+                channel_ids=channel_ids,
+                # Secrets can stay in the environment: "api_key_env": "JELLYFIN_API_KEY_KIDS"
+                api_key=entry.get("api_key") or os.getenv(entry.get("api_key_env", "")) or None,
+                username=entry.get("username"),
+                password=entry.get("password") or os.getenv(entry.get("password_env", "")) or None,
+            ))
+        if servers:
+            self.logger.info(f"Monitoring {len(servers)} Jellyfin servers: {', '.join(s.name for s in servers)}")
+            return servers
+
+        channel_id = os.getenv("CHANNEL_ID")
+        if not channel_id:
+            self.logger.error("CHANNEL_ID not set in .env file")
+            raise ValueError("CHANNEL_ID must be set in .env")
+        return [JellyfinServer(
+            name="default",
+            url=os.getenv("JELLYFIN_URL"),
+            # A comma-separated CHANNEL_ID publishes the same dashboard to several channels
+            channel_ids=[int(c) for c in channel_id.split(",") if c.strip()],
+            api_key=os.getenv("JELLYFIN_API_KEY"),
+            username=os.getenv("JELLYFIN_USERNAME"),
+            password=os.getenv("JELLYFIN_PASSWORD"),
+        )]
 
-    def _load_message_id(self) -> Optional[int]:
-        """Load the dashboard message ID from file."""
+    def _load_message_ids(self) -> None:
+        """Load the dashboard message ID of every server/channel target from file."""
         if not os.path.exists(self.MESSAGE_ID_FILE):
-            return None
+            self._migrate_legacy_message_id()
+            return
         try:
             with open(self.MESSAGE_ID_FILE, "r", encoding="utf-8") as f:
                 data = json.load(f)
-                return int(data.get("message_id"))
-        except (json.JSONDecodeError, ValueError) as e:
-            self.logger.error(f"Failed to load message ID: {e}")
-            return None
+            for server in self.servers:
+                for channel_id, message_id in data.get(server.name, {}).items():
+                    if int(channel_id) in server.channel_ids:
+                        server.dashboard_message_ids[int(channel_id)] = int(message_id)
+        except (json.JSONDecodeError, ValueError, TypeError, AttributeError) as e:
+            self.logger.error(f"Failed to load message IDs: {e}")
+
+    def _migrate_legacy_message_id(self) -> None:
+        """Adopt messages from the old one-message-per-server file, placing each in the server's first channel."""
+        if not os.path.exists(self.LEGACY_MESSAGE_ID_FILE):
+            return
+        try:
+            with open(self.LEGACY_MESSAGE_ID_FILE, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            # Both {"message_ids": {server name: id}} and the original {"message_id": id} are accepted
+            message_ids = data.get("message_ids") or {self.servers[0].name: data.get("message_id")}
+            for server in self.servers:
+                if message_ids.get(server.name):
+                    server.dashboard_message_ids[server.channel_ids[0]] = int(message_ids[server.name])
+            self._save_message_ids()
+            self.logger.info(f"Migrated dashboard message ID to {self.MESSAGE_ID_FILE}")
+        except (json.JSONDecodeError, ValueError, TypeError) as e:
+            self.logger.error(f"Failed to migrate message ID: {e}")
+
+    def _load_start_times(self) -> None:
+        """Restore each server's last known start time, so uptime survives bot restarts."""
+        try:
+            with open(self.START_TIME_FILE, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except json.JSONDecodeError as e:
+            self.logger.error(f"Failed to load server start times: {e}")
+            return
+        for server in self.servers:
+            entry = data.get(server.name, {})
+            try:
+                if entry.get("start_time"):
+                    server.start_time = datetime.fromisoformat(entry["start_time"])
+                server.last_version = entry.get("version")
+            except (AttributeError, ValueError) as e:
+                self.logger.error(f"Ignoring invalid start time for {server.name}: {e}")
+
+    def _save_start_times(self) -> None:
+        """Persist the known start times as {server name: {start_time, version}}."""
+        data = {
+            server.name: {"start_time": server.start_time.isoformat(), "version": server.last_version}
+            for server in self.servers
+            if server.start_time
+        }
+        try:
+            with open(self.START_TIME_FILE, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+        except OSError as e:
+            self.logger.error(f"Failed to save server start times: {e}")
+
+    def _load_watermarks(self) -> None:
+        """Restore the recently added watermarks, so a restart neither repeats nor skips items."""
+        try:
+            with open(self.RECENTLY_ADDED_FILE, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except json.JSONDecodeError as e:
+            self.logger.error(f"Failed to load recently added watermarks: {e}")
+            return
+        for server in self.servers:
+            for library_id, watermark in data.get(server.name, {}).items():
+                try:
+                    server.added_watermarks[library_id] = datetime.fromisoformat(watermark)
+                except (TypeError, ValueError) as e:
+                    self.logger.error(f"Ignoring invalid watermark for {server.name}/{library_id}: {e}")
+
+    def _save_watermarks(self) -> None:
+        """Persist the watermarks as {server name: {library ID: DateCreated}}."""
+        data = {
+            server.name: {library_id: watermark.isoformat() for library_id, watermark in server.added_watermarks.items()}
+            for server in self.servers
+            if server.added_watermarks
+        }
+        try:
+            with open(self.RECENTLY_ADDED_FILE, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+        except OSError as e:
+            self.logger.error(f"Failed to save recently added watermarks: {e}")
 
-    def _save_message_id(self, message_id: int) -> None:
-        """Save the dashboard message ID to file."""
+    def _load_activity_watermarks(self) -> None:
+        """Restore the activity log watermarks, so a restart neither replays nor drops entries."""
+        try:
+            with open(self.ACTIVITY_LOG_FILE, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except json.JSONDecodeError as e:
+            self.logger.error(f"Failed to load activity log watermarks: {e}")
+            return
+        for server in self.servers:
+            watermark = data.get(server.name)
+            if watermark is None:
+                continue
+            try:
+                server.activity_watermark = (datetime.fromisoformat(watermark["date"]), int(watermark["id"]))
+            except (KeyError, TypeError, ValueError) as e:
+                self.logger.error(f"Ignoring invalid activity log watermark for {server.name}: {e}")
+
+    def _save_activity_watermarks(self) -> None:
+        """Persist the watermarks as {server name: {"date": Date, "id": Id}}."""
+        data = {
+            server.name: {"date": server.activity_watermark[0].isoformat(), "id": server.activity_watermark[1]}
+            for server in self.servers
+            if server.activity_watermark
+        }
+        try:
+            with open(self.ACTIVITY_LOG_FILE, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+        except OSError as e:
+            self.logger.error(f"Failed to save activity log watermarks: {e}")
+
+    def _save_message_ids(self) -> None:
+        """Save the dashboard message IDs as {server name: {channel ID: message ID}}."""
+        data = {
+            server.name: {str(channel_id): message_id for channel_id, message_id in server.dashboard_message_ids.items()}
+            for server in self.servers
+            if server.dashboard_message_ids
+        }
         try:
             with open(self.MESSAGE_ID_FILE, "w", encoding="utf-8") as f:
-                json.dump({"message_id": message_id}, f)
+                json.dump(data, f)
         except OSError as e:
-            self.logger.error(f"Failed to save message ID: {e}")
+            self.logger.error(f"Failed to save message IDs: {e}")
 
     def _load_user_mapping(self) -> Dict[str, str]:
         """Load user mapping from JSON file."""
@@ -261,378 +665,780 @@ class JellyfinCore(commands.Cog):
             self.logger.error(f"Failed to load user mapping: {e}")
             return {}
 
-    async def connect_to_jellyfin(self) -> bool:
-        """Attempt to establish a connection to the Jellyfin server with timeout and retry logic."""
-        max_retries = 3
+    def _apply_user_mapping(self, mapping: Dict[str, str]) -> None:
+        self.user_mapping = dict(mapping)
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Return the HTTP session shared by all servers, with metrics and tracing hooks attached."""
+        if self.http_session is None or self.http_session.closed:
+            self.http_session = aiohttp.ClientSession(
+                timeout=DEFAULT_TIMEOUT,
+                connector=aiohttp.TCPConnector(limit=50, limit_per_host=10),
+                trace_configs=[
+                    metrics.http_trace_config("jellyfin"),
+                    tracing.http_trace_config("jellyfin"),
+                    self.latency.http_trace_config(),
+                ],
+            )
+        return self.http_session
+
+    def _jellyfin_get(
+        self,
+        server: JellyfinServer,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        ceiling: aiohttp.ClientTimeout = DEFAULT_TIMEOUT,
+        endpoint: Optional[str] = None,
+    ) -> Any:
+        """GET with a timeout derived from this endpoint's recent latency on this server, capped at `ceiling`.
+
+        `endpoint` names the latency series when one path serves requests of different cost.
+        Use it as `async with self._jellyfin_get(...) as response`.
+        """
+        key = f"{server.name}:{endpoint or path}"
+        return self._get_session().get(
+            f"{server.url}{path}",
+            headers=server.headers,
+            params=params,
+            timeout=self.latency.timeout(key, ceiling),
+            trace_request_ctx=self.latency.context(key),
+        )
+
+    async def _jellyfin_read(self, server: JellyfinServer, path: str) -> Tuple[int, Any]:
+        """Idempotent JSON read returning (status, body or None), hedged with a second request past p95.
+
+        Hedging is turned off with `http.hedge_reads`.
+        """
+        async def attempt() -> Tuple[int, Any]:
+            async with self._jellyfin_get(server, path) as response:
+                return response.status, (await response.json() if response.status == 200 else None)
+
+        delay = self.latency.hedge_delay(f"{server.name}:{path}") if int(self.config["http"].get("hedge_reads", 1)) else None
+        return await hedged(attempt, delay, path)
+
+    @tracing.traced("jellyfin.connect")
+    async def connect_to_jellyfin(self, server: Optional[JellyfinServer] = None) -> bool:
+        """Check the connection to Jellyfin, failing fast while the server's circuit is open.
+
+        While the circuit is closed, connection errors are retried with exponential backoff;
+        a half-open probe gets a single attempt.
+        """
+        server = server or self.servers[0]
+        breaker = server.breaker
+        if not breaker.allow():
+            tracing.annotate("circuit", "open")
+            self.logger.debug("Circuit for %s is open, next probe in %.0fs", server.name, breaker.seconds_until_probe())
+            return False
+
+        reachable = False
+        try:
+            connected, reachable = await self._connect_with_retries(server, max_retries=3 if breaker.closed else 1)
+            return connected
+        finally:
+            # The server answering at all (even with 401) means it is up; only outages trip the breaker
+            if reachable:
+                breaker.record_success()
+            else:
+                breaker.record_failure()
+
+    async def _connect_with_retries(self, server: JellyfinServer, max_retries: int) -> Tuple[bool, bool]:
+        """Try to authenticate against the server; returns (connected, server reachable)."""
         base_delay = 1
-        
+        session = self._get_session()
+
         for attempt in range(max_retries):
+            tracing.annotate("attempts", attempt + 1)
             try:
-                self.logger.info(f"Jellyfin connection attempt {attempt + 1}/{max_retries}")
-                
-                # Configure timeout (10s connect, 30s total)
-                timeout = aiohttp.ClientTimeout(total=30, connect=10)
-                
-                # Common headers for all requests
-                headers = {
-                    "X-Emby-Client": "JellyWatch",
-                    "X-Emby-Client-Version": "1.0.0",
-                    "X-Emby-Device-Name": "JellyWatch",
-                    "X-Emby-Device-Id": "jellywatch-bot",
-                    "Accept": "application/json",
-                    "X-Emby-Authorization": "MediaBrowser Client=\"JellyWatch\", Device=\"JellyWatch\", DeviceId=\"jellywatch-bot\", Version=\"1.0.0\""
-                }
+                self.logger.debug("Jellyfin connection attempt %d/%d for %s", attempt + 1, max_retries, server.name)
 
                 # First try with API key if available
-                if self.JELLYFIN_API_KEY:
-                    headers["X-Emby-Token"] = self.JELLYFIN_API_KEY
-                    async with aiohttp.ClientSession(timeout=timeout) as session:
-                        async with session.get(f"{self.JELLYFIN_URL}/System/Info", headers=headers) as response:
-                            if response.status == 200:
-                                self.logger.info("Successfully connected to Jellyfin with API key")
-                                if self.jellyfin_start_time is None:
-                                    self.jellyfin_start_time = time.time()
-                                return True
-                            elif response.status == 401:
-                                self.logger.error("Invalid API key provided")
-                                return False
-                            else:
-                                self.logger.warning(f"Failed to connect with API key: HTTP {response.status}")
-                                if attempt == max_retries - 1:
-                                    return False
+                if server.api_key:
+                    async with self._jellyfin_get(server, "/System/Info") as response:
+                        if response.status == 200:
+                            self.logger.debug("Successfully connected to Jellyfin with API key")
+                            return True, True
+                        elif response.status == 401:
+                            self.logger.error(f"Invalid API key provided for {server.name}")
+                            return False, True
+                        else:
+                            self.logger.warning(f"Failed to connect to {server.name} with API key: HTTP {response.status}")
+                            if attempt == max_retries - 1:
+                                return False, False
 
                 # If API key fails or not available, try username/password
-                if self.JELLYFIN_USERNAME and self.JELLYFIN_PASSWORD:
+                if server.username and server.password:
                     auth_data = {
-                        "Username": self.JELLYFIN_USERNAME,
-                        "Pw": self.JELLYFIN_PASSWORD
+                        "Username": server.username,
+                        "Pw": server.password
                     }
-                    async with aiohttp.ClientSession(timeout=timeout) as session:
-                        async with session.post(
-                            f"{self.JELLYFIN_URL}/Users/AuthenticateByName",
-                            json=auth_data,
-                            headers=headers
-                        ) as response:
-                            if response.status == 200:
-                                self.logger.info("Successfully connected to Jellyfin with username/password")
-                                if self.jellyfin_start_time is None:
-                                    self.jellyfin_start_time = time.time()
-                                return True
-                            elif response.status == 401:
-                                self.logger.error("Invalid username or password")
-                                return False
-                            else:
-                                self.logger.warning(f"Failed to authenticate with username/password: HTTP {response.status}")
-                                if attempt == max_retries - 1:
-                                    return False
+                    async with session.post(
+                        f"{server.url}/Users/AuthenticateByName",
+                        json=auth_data,
+                        headers=JELLYFIN_CLIENT_HEADERS
+                    ) as response:
+                        if response.status == 200:
+                            auth_result = await response.json()
+                            server.access_token = auth_result.get("AccessToken")
+                            self.logger.debug("Successfully connected to Jellyfin with username/password")
+                            return True, True
+                        elif response.status == 401:
+                            self.logger.error(f"Invalid username or password for {server.name}")
+                            return False, True
+                        else:
+                            self.logger.warning(f"Failed to authenticate with {server.name} using username/password: HTTP {response.status}")
+                            if attempt == max_retries - 1:
+                                return False, False
 
                 if attempt == max_retries - 1:
-                    self.logger.error("No authentication method provided (API key or username/password required)")
-                    return False
-                    
+                    self.logger.error(f"No authentication method provided for {server.name} (API key or username/password required)")
+                    return False, False
+
             except asyncio.TimeoutError:
-                self.logger.warning(f"Connection timeout on attempt {attempt + 1}/{max_retries}")
+                self.logger.warning(f"Connection timeout to {server.name} on attempt {attempt + 1}/{max_retries}")
                 if attempt == max_retries - 1:
-                    self.logger.error("Failed to connect to Jellyfin: Connection timeout after all retries")
-                    self.jellyfin_start_time = None
-                    return False
+                    self.logger.error(f"Failed to connect to {server.name}: Connection timeout after all retries")
+                    return False, False
             except aiohttp.ClientConnectorError as e:
-                self.logger.warning(f"Connection error on attempt {attempt + 1}/{max_retries}: {e}")
+                self.logger.warning(f"Connection error to {server.name} on attempt {attempt + 1}/{max_retries}: {e}")
                 if attempt == max_retries - 1:
-                    self.logger.error(f"Failed to connect to Jellyfin: Connection error after all retries: {e}")
-                    self.jellyfin_start_time = None
-                    return False
+                    self.logger.error(f"Failed to connect to {server.name}: Connection error after all retries: {e}")
+                    return False, False
             except Exception as e:
-                self.logger.warning(f"Unexpected error on attempt {attempt + 1}/{max_retries}: {e}")
+                self.logger.warning(f"Unexpected error connecting to {server.name} on attempt {attempt + 1}/{max_retries}: {e}")
                 if attempt == max_retries - 1:
-                    self.logger.error(f"Failed to connect to Jellyfin: Unexpected error after all retries: {e}")
-                    self.jellyfin_start_time = None
-                    return False
-            
+                    self.logger.error(f"Failed to connect to {server.name}: Unexpected error after all retries: {e}")
+                    return False, False
+
             # Exponential backoff for retries
             if attempt < max_retries - 1:
                 delay = base_delay * (2 ** attempt)
-                self.logger.info(f"Retrying in {delay} seconds...")
+                metrics.JELLYFIN_CONNECT_RETRIES.inc()
+                self.logger.info(f"Retrying {server.name} in {delay} seconds...")
                 await asyncio.sleep(delay)
-        
-        return False
+
+        return False, False
 
     @tasks.loop(seconds=30)
     async def update_status(self) -> None:
-        """Update bot's status with current stream count."""
+        """Update bot's status with the stream count across all servers."""
+        metrics.observe_loop_lag("update_status", self.update_status)
         try:
-            sessions = await self.get_sessions()
-            current_streams = len(sessions) if sessions else 0
-            activity = discord.Activity(
-                type=discord.ActivityType.watching,
-                name=f"{current_streams} stream{'s' if current_streams != 1 else ''}"
+            all_sessions = await asyncio.gather(*(self.get_sessions(server) for server in self.servers))
+            current_streams = sum(len(sessions) for sessions in all_sessions if sessions)
+            online = any(server.breaker.closed for server in self.servers)
+            text = self.render_presence(current_streams, online)
+            if text == self.last_presence:
+                self.logger.debug("Presence unchanged (%s), skipping gateway update", text)
+                return
+            activity = discord.Activity(type=discord.ActivityType.watching, name=text)
+            await self.update_queue.submit(
+                key="presence",
+                route="presence",
+                send=lambda: self.bot.change_presence(activity=activity),
             )
-            await self.bot.change_presence(activity=activity)
+            self.last_presence = text
         except Exception as e:
             self.logger.error(f"Error updating status: {e}")
 
+    def render_presence(self, stream_count: int, online: bool) -> str:
+        """Render the presence text from the `presence` config.
+
+        Active streams are shown while there are any; when idle, the configured sections
+        are rotated through using the cached library counts.
+        """
+        presence = self.config.get("presence", {})
+        if not online:
+            return presence.get("offline_text", "🔴 Server Offline!")
+        stream_text = presence.get("stream_text", "{count} active Stream{s} 🟢").format(
+            count=stream_count, s="s" if stream_count != 1 else ""
+        )
+        section_texts = self._presence_section_texts()
+        if stream_count or not section_texts:
+            return stream_text
+        self.presence_rotation = (self.presence_rotation + 1) % len(section_texts)
+        return section_texts[self.presence_rotation]
+
+    def _presence_section_texts(self) -> List[str]:
+        """Format each configured presence section with its item count summed over every server's cached stats."""
+        texts = []
+        for section in self.config.get("presence", {}).get("sections", []):
+            title = str(section.get("section_title", "")).lower()
+            counts = [
+                stats.get("count", 0)
+                for server in self.servers
+                for stats in server.library_cache.values()
+                if str(stats.get("display_name", "")).lower() == title
+            ]
+            if not counts:
+                continue
+            display_name = section.get("display_name", section.get("section_title", ""))
+            texts.append(f"{section.get('emoji', '')} {sum(counts)} {display_name}".strip())
+        return texts
+
+    @commands.Cog.listener()
+    async def on_ready(self) -> None:
+        """A fresh gateway session starts without our activity, so force the next presence update.
+
+        Also starts the loops of a cog loaded before the bot was ready; after a reconnect,
+        loops that are already running are left alone.
+        """
+        self.last_presence = None
+        self.supervisor.start()
+
     @tasks.loop(seconds=60)
     async def update_dashboard(self) -> None:
-        """Update the dashboard message periodically."""
-        try:
-            self.logger.info(f"Dashboard update starting - Channel ID: {self.CHANNEL_ID}")
-            self.logger.info(f"Dashboard message ID: {self.dashboard_message_id}")
-            
-            info = await self.get_server_info()
-            if not info:
-                self.logger.warning("No server info received - Jellyfin may be unreachable")
-                return
+        """Update every server's dashboard message periodically."""
+        metrics.observe_loop_lag("update_dashboard", self.update_dashboard)
+        with tracing.span("dashboard.tick", servers=len(self.servers)):
+            await self._refresh_all_dashboards()
 
-            channel = self.bot.get_channel(self.CHANNEL_ID)
-            if not channel:
-                self.logger.error("Dashboard channel not found")
-                return
+    @tasks.loop(minutes=5)
+    async def recently_added_feed(self) -> None:
+        """Poll items added since each library's watermark, index them and announce them if a channel is set."""
+        channel_id = int(self.config.get("recently_added", {}).get("channel_id") or 0)
+        channel = self.bot.get_channel(channel_id) if channel_id else None
+        if channel_id and channel is None:
+            self.logger.error(f"Recently added channel {channel_id} not found")
+        with tracing.span("recently_added.tick", servers=len(self.servers)):
+            await asyncio.gather(*(self._announce_new_items(server, channel) for server in self.servers))
 
-            self.logger.info(f"Creating dashboard embed with info keys: {list(info.keys())}")
-            embed = await self.create_dashboard_embed(info)
-            await self._update_dashboard_message(channel, embed)
-            self.logger.info("Dashboard update completed successfully")
-        except Exception as e:
-            self.logger.error(f"Error updating dashboard: {e}", exc_info=True)
+    @tasks.loop(minutes=1)
+    async def activity_log_feed(self) -> None:
+        """Post the activity log entries logged since each server's watermark that pass the configured filters."""
+        channel_id = int(self.config.get("activity_log", {}).get("channel_id") or 0)
+        if not channel_id:
+            return
+        channel = self.bot.get_channel(channel_id)
+        if channel is None:
+            self.logger.error(f"Activity log channel {channel_id} not found")
+            return
+        with tracing.span("activity_log.tick", servers=len(self.servers)):
+            await asyncio.gather(*(self._post_activity(server, channel) for server in self.servers))
+
+    @tasks.loop(hours=1)
+    async def refresh_search_index(self) -> None:
+        """Rebuild a server's title index when it is missing or older than `search.rebuild_hours`.
+
+        New titles reach the index through the recently added polls in between; the periodic
+        rebuild drops titles that were removed from Jellyfin.
+        """
+        max_age = float(self.config.get("search", {}).get("rebuild_hours", 24)) * 3600
+        index = self._get_title_index()
+        for server in self.servers:
+            built_at = await asyncio.to_thread(index.built_at, server.name)
+            if built_at is not None and time.time() - built_at < max_age:
+                continue
+            if not server.breaker.closed or not server.library_cache:
+                continue  # the dashboard has not connected yet; try again next hour
+            with tracing.span("search.rebuild", server=server.name):
+                await self._build_title_index(server)
+
+    @update_status.before_loop
+    @update_dashboard.before_loop
+    @recently_added_feed.before_loop
+    @activity_log_feed.before_loop
+    @refresh_search_index.before_loop
+    async def before_loops(self) -> None:
+        """Wait for the gateway cache so channel lookups work on the first iteration."""
+        await self.bot.wait_until_ready()
+
+    def _source_deadline(self, source: str) -> float:
+        deadlines = self.config.get("dashboard", {}).get("source_deadlines", {})
+        return float(deadlines.get(source, DEFAULT_SOURCE_DEADLINES[source]))
+
+    async def _refresh_all_dashboards(self) -> List[str]:
+        """Fetch every source concurrently, then render and send each server's dashboard.
+
+        Each source has its own deadline, so the fetch stage takes as long as the slowest
+        deadline at most, however many sources there are or how slow they are.
+        """
+        sources = {
+            f"jellyfin:{server.name}": (functools.partial(self._fetch_server_info, server), self._source_deadline("jellyfin"))
+            for server in self.servers
+        }
+        sabnzbd = self.bot.get_cog("SABnzbd")
+        if sabnzbd is not None and sabnzbd.enabled:
+            sources["sabnzbd"] = (functools.partial(self._fetch_sabnzbd, sabnzbd), self._source_deadline("sabnzbd"))
+        uptime = self.bot.get_cog("Uptime")
+        if uptime is not None and uptime.enabled:
+            sources["uptime"] = (functools.partial(self._fetch_uptime, uptime), self._source_deadline("uptime"))
 
-    async def get_server_info(self) -> Dict[str, Any]:
+        with tracing.span("dashboard.sources", sources=len(sources)) as span:
+            snapshots = await self.sources.gather(sources)
+            span.set("stale", sorted(name for name, snapshot in snapshots.items() if snapshot.stale))
+
+        self._record_history(snapshots)
+        extras = {name: snapshot for name, snapshot in snapshots.items() if not name.startswith("jellyfin:")}
+        return await asyncio.gather(*(
+            self._refresh_server_dashboard(server, snapshots[f"jellyfin:{server.name}"], extras)
+            for server in self.servers
+        ))
+
+    def _record_history(self, snapshots: Dict[str, Snapshot]) -> None:
+        """Sample this tick's fresh snapshots; a source that was late or failed leaves a gap."""
+        for name, snapshot in snapshots.items():
+            if snapshot.stale:
+                continue
+            if name.startswith("jellyfin:"):
+                self.history.setdefault(name, TimeSeries()).record(snapshot.data.get("current_streams", 0))
+            elif name == "sabnzbd":
+                self.history.setdefault(name, TimeSeries()).record(snapshot.data.get("kbpersec", 0.0))
+
+    def _history_chart(self, server: JellyfinServer) -> Optional[str]:
+        """URL of the server's streams and SABnzbd speed chart, or None until one is uploaded."""
+        if not int(self.config.get("dashboard", {}).get("history_chart", 1)) or self._image_channel() is None:
+            return None
+        rows = []
+        streams = self.history.get(f"jellyfin:{server.name}")
+        if streams is not None:
+            rows.append(chart_row("Streams (24h)", streams.snapshot(), STREAMS_COLOR, lambda peak: f"{peak:g}"))
+        sabnzbd = self.history.get("sabnzbd")
+        if sabnzbd is not None:
+            rows.append(chart_row("SABnzbd speed (24h)", sabnzbd.snapshot(), SABNZBD_COLOR, lambda peak: f"{peak / 1024:.1f} MB/s"))
+        return self.charts.get(server.name, rows) if rows else None
+
+    async def _fetch_server_info(self, server: JellyfinServer) -> Dict[str, Any]:
+        info = await self.get_server_info(server)
+        if not info:
+            raise SourceUnavailable(f"{server.name} is unreachable")
+        return info
+
+    async def _fetch_sabnzbd(self, sabnzbd: commands.Cog) -> Dict[str, Any]:
+        info = await sabnzbd.get_sabnzbd_info()
+        if "error" in info:
+            raise SourceUnavailable(f"SABnzbd request failed: {info['error']}")
+        return info
+
+    async def _fetch_uptime(self, uptime: commands.Cog) -> Tuple[Any, ...]:
+        # The Uptime Kuma client is synchronous, so it runs in a worker thread that inherits the current span
+        data = await asyncio.to_thread(uptime.get_uptime_data)
+        if data[0] is None:
+            raise SourceUnavailable("Uptime Kuma returned no data")
+        return data
+
+    async def _refresh_server_dashboard(
+        self,
+        server: JellyfinServer,
+        snapshot: Snapshot,
+        extras: Dict[str, Snapshot],
+    ) -> str:
+        """Render one server's snapshot and fan the embed out to all of its dashboard channels.
+
+        Errors stay contained to this server, and a failing channel does not hold up the others.
+        """
+        with tracing.span("dashboard.server", server=server.name, channels=len(server.channel_ids)) as span:
+            try:
+                self.logger.debug(
+                    "Dashboard update starting for %s - Channel IDs: %s, message IDs: %s",
+                    server.name, server.channel_ids, server.dashboard_message_ids,
+                )
+
+                channels = []
+                for channel_id in server.channel_ids:
+                    channel = self.bot.get_channel(channel_id)
+                    if channel:
+                        channels.append(channel)
+                    else:
+                        self.logger.error(f"Dashboard channel {channel_id} for {server.name} not found")
+                if not channels:
+                    span.set("outcome", "channel_missing")
+                    return "channel_missing"
+
+                if snapshot.reason == "late" and not snapshot.available:
+                    # Nothing to show yet; the fetch keeps running and the next tick picks it up
+                    span.set("outcome", "pending")
+                    return "pending"
+                if snapshot.reason != "failed":
+                    server.offline_render_key = None
+                    if server.breaker.closed:
+                        # Set by get_offline_info when the server failed without opening its circuit
+                        server.offline_since = None
+                    info = snapshot.data
+                    self.logger.debug("Creating dashboard embed with info keys: %s", list(info))
+                    embed = await self.create_dashboard_embed(
+                        info, server, extras, stale_since=snapshot.updated_at if snapshot.stale else None
+                    )
+                    outcome = "updated"
+                else:
+                    offline_info = self.get_offline_info(server)
+                    embed = self.create_offline_embed(offline_info, server, extras)
+                    # The offline embed only changes when the displayed duration or another source's field does
+                    render_key = (offline_info["uptime"], embed.footer.text, tuple(field.value for field in embed.fields))
+                    if render_key == server.offline_render_key:
+                        span.set("outcome", "offline_unchanged")
+                        return "offline"
+                    if server.offline_render_key is None or render_key[0] != server.offline_render_key[0]:
+                        self.logger.warning(f"No server info received from {server.name}, showing the offline dashboard")
+                    server.offline_render_key = render_key
+                    outcome = "offline"
+
+                await asyncio.gather(*(self._update_dashboard_message(channel, embed, server) for channel in channels))
+                span.set("outcome", outcome)
+                self.logger.debug("Dashboard update for %s completed (%s)", server.name, outcome)
+                return outcome
+            except Exception as e:
+                span.set("outcome", "error")
+                self.logger.error(f"Error updating dashboard for {server.name}: {e}", exc_info=True)
+                return "error"
+
+    @tracing.traced("jellyfin.get_server_info")
+    async def get_server_info(self, server: Optional[JellyfinServer] = None) -> Dict[str, Any]:
         """Get server information from Jellyfin."""
+        server = server or self.servers[0]
         try:
-            self.logger.info("Attempting to connect to Jellyfin...")
-            if not await self.connect_to_jellyfin():
-                self.logger.error("Failed to connect to Jellyfin server")
+            self.logger.debug("Attempting to connect to Jellyfin server %s...", server.name)
+            if not await self.connect_to_jellyfin(server):
+                # The breaker already logged the outage; repeating it every tick adds nothing
+                log = self.logger.error if server.breaker.closed else self.logger.debug
+                log(f"Failed to connect to Jellyfin server {server.name}")
                 return {}
 
-            headers = {
-                "X-Emby-Token": self.JELLYFIN_API_KEY,
-                "X-Emby-Client": "JellyWatch",
-                "X-Emby-Client-Version": "1.0.0",
-                "X-Emby-Device-Name": "JellyWatch",
-                "X-Emby-Device-Id": "jellywatch-bot",
-                "Accept": "application/json",
-                "X-Emby-Authorization": "MediaBrowser Client=\"JellyWatch\", Device=\"JellyWatch\", DeviceId=\"jellywatch-bot\", Version=\"1.0.0\""
-            }
+            # Get system info
+            status, system_info = await self._jellyfin_read(server, "/System/Info")
+            if status != 200:
+                self.logger.error(f"Failed to get system info from {server.name}: HTTP {status}")
+                return {}
 
-            # Configure timeout for all requests
-            timeout = aiohttp.ClientTimeout(total=30, connect=10)
-            
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                # Get system info
-                async with session.get(f"{self.JELLYFIN_URL}/System/Info", headers=headers) as response:
-                    if response.status != 200:
-                        self.logger.error(f"Failed to get system info: HTTP {response.status}")
-                        return {}
-                    system_info = await response.json()
-                
-                # Get sessions
-                sessions = await self.get_sessions()
-                current_streams = len([s for s in sessions if s.get("NowPlayingItem")]) if sessions else 0
-
-                # Get library stats
-                library_stats = await self.get_library_stats()
-                total_items = sum(int(stats.get("count", 0)) for stats in library_stats.values())
-                total_episodes = sum(int(episodes) for stats in library_stats.values() 
-                                   if (episodes := stats.get("episodes")) is not None)
-
-                return {
-                    "server_name": system_info.get("ServerName", "Unknown Server"),
-                    "version": system_info.get("Version", "Unknown Version"),
-                    "operating_system": system_info.get("OperatingSystem", "Unknown OS"),
-                    "current_streams": current_streams,
-                    "total_items": total_items,
-                    "total_episodes": total_episodes,
-                    "library_stats": library_stats
-                }
+            # Get sessions
+            sessions = await self.get_sessions(server)
+            playing = [s["NowPlayingItem"] for s in sessions if s.get("NowPlayingItem")] if sessions else []
+            current_streams = len(playing)
+
+            # Get library stats, unless Jellyfin is scanning its libraries
+            await self._poll_library_scan(server)
+            library_stats = await self.get_library_stats(server)
+            total_items = sum(int(stats.get("count", 0)) for stats in library_stats.values())
+            total_episodes = sum(int(episodes) for stats in library_stats.values()
+                               if (episodes := stats.get("episodes")) is not None)
+
+            server.server_name = system_info.get("ServerName", server.server_name)
+            await self._track_start_time(server, system_info)
+            return {
+                "server_name": system_info.get("ServerName", "Unknown Server"),
+                "version": system_info.get("Version", "Unknown Version"),
+                "operating_system": system_info.get("OperatingSystem", "Unknown OS"),
+                "current_streams": current_streams,
+                # Jellyfin lists the most recently active session first
+                "now_playing": {"title": self._get_formatted_title(playing[0]), "poster": self._poster_ref(playing[0])} if playing else None,
+                "total_items": total_items,
+                "total_episodes": total_episodes,
+                "library_stats": library_stats,
+                "library_scan": server.scan_progress,
+            }
         except Exception as e:
-            self.logger.error(f"Error getting server info: {e}")
+            self.logger.error(f"Error getting server info from {server.name}: {e}")
             return {}
 
-    def calculate_uptime(self) -> str:
-        """Calculate Jellyfin server uptime as a formatted string."""
-        if not self.jellyfin_start_time:
+    async def _track_start_time(self, server: JellyfinServer, system_info: Dict[str, Any]) -> None:
+        """Keep `server.start_time` current without querying Jellyfin on every render.
+
+        The start time is re-derived when a restart is likely (first poll, a version change,
+        or the server coming back after an outage) and otherwise every START_TIME_RECHECK
+        seconds. Only a likely restart may move it later: a periodic recheck can correct it
+        backwards, but a later time without one of those signals is kept out.
+        """
+        now = datetime.now(timezone.utc)
+        version = system_info.get("Version")
+        first_check = server.start_time_checked is None
+        restarted = server.restart_suspected or (server.last_version is not None and version != server.last_version)
+        if not (
+            first_check
+            or restarted
+            or (now - server.start_time_checked).total_seconds() >= START_TIME_RECHECK
+        ):
+            return
+
+        server.start_time_checked = now
+        server.restart_suspected = False
+        start_time = await self._fetch_start_time(server)
+        if start_time is None and (server.start_time is None or restarted):
+            # No server-side evidence: the best we can say is that it is up now
+            start_time = now
+        if (
+            start_time is not None
+            and server.start_time is not None
+            and start_time > server.start_time
+            and not (restarted or first_check)
+        ):
+            self.logger.debug("Ignoring a later start time for %s without an outage or version change", server.name)
+            start_time = None
+        changed = start_time is not None and start_time != server.start_time
+        if changed:
+            if server.start_time is not None and start_time > server.start_time:
+                self.logger.info(f"Detected restart of {server.name} at {start_time:%Y-%m-%d %H:%M:%S} UTC")
+            server.start_time = start_time
+        if changed or version != server.last_version:
+            server.last_version = version
+            self._save_start_times()
+
+    async def _fetch_start_time(self, server: JellyfinServer) -> Optional[datetime]:
+        """Derive when the server started from the last run of its startup-only scheduled tasks.
+
+        Jellyfin runs every task with a StartupTrigger right after it starts, so their last
+        start times cluster just after the server's own start. Requires an admin API key.
+        """
+        try:
+            async with self._jellyfin_get(server, "/ScheduledTasks") as response:
+                if response.status != 200:
+                    self.logger.debug("Could not read scheduled tasks from %s: HTTP %s", server.name, response.status)
+                    return None
+                tasks_info = await response.json()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            self.logger.debug("Could not read scheduled tasks from %s: %s", server.name, e)
+            return None
+
+        starts = []
+        for task in tasks_info:
+            # A task that also has an interval or daily trigger last ran on that schedule, not at startup
+            triggers = task.get("Triggers") or []
+            if not triggers or any(trigger.get("Type") != "StartupTrigger" for trigger in triggers):
+                continue
+            started = (task.get("LastExecutionResult") or {}).get("StartTimeUtc")
+            if started:
+                try:
+                    starts.append(isoparse(started).astimezone(timezone.utc))
+                except ValueError:
+                    continue
+        return self._startup_cluster(starts)
+
+    @staticmethod
+    def _startup_cluster(starts: List[datetime]) -> Optional[datetime]:
+        """The earliest start with at least half of the startup tasks run within STARTUP_BURST of it.
+
+        A startup task run again by hand lands after that cluster, so it never moves the
+        start time. Returns None if the runs are too spread out to tell.
+        """
+        starts = sorted(starts)
+        needed = (len(starts) + 1) // 2
+        for index, start in enumerate(starts):
+            if sum(1 for later in starts[index:] if later - start <= STARTUP_BURST) >= needed:
+                return start
+        return None
+
+    async def _poll_library_scan(self, server: JellyfinServer) -> None:
+        """Track Jellyfin's "Scan Media Library" task and make the next library poll recount once it finishes.
+
+        Once the task is found, each poll reads only that task. A scan that started and finished
+        between two polls is still noticed, because its end time changes. Requires an admin API key.
+        """
+        if not server.scan_polling:
+            return
+        task = await self._fetch_scan_task(server)
+        if task is None:
+            return
+        running = task.get("State") in ("Running", "Cancelling")
+        last_end = (task.get("LastExecutionResult") or {}).get("EndTimeUtc")
+        was_running = server.scan_progress is not None
+        if running and not was_running:
+            self.logger.info(f"Library scan running on {server.name}, deferring library recounts until it finishes")
+        server.scan_progress = float(task.get("CurrentProgressPercentage") or 0) if running else None
+        if not running and (was_running or (server.scan_last_end is not None and last_end != server.scan_last_end)):
+            self.logger.info(f"Library scan finished on {server.name}, recounting libraries")
+            server.last_library_update = None
+        server.scan_last_end = last_end
+
+    async def _fetch_scan_task(self, server: JellyfinServer) -> Optional[Dict[str, Any]]:
+        try:
+            if server.scan_task_id:
+                async with self._jellyfin_get(
+                    server, f"/ScheduledTasks/{server.scan_task_id}", endpoint="/ScheduledTasks/{id}"
+                ) as response:
+                    if response.status == 200:
+                        return await response.json()
+                    if response.status != 404:
+                        self.logger.debug("Could not read the library scan task from %s: HTTP %s", server.name, response.status)
+                        return None
+                server.scan_task_id = None  # the task was recreated; look it up again
+
+            async with self._jellyfin_get(server, "/ScheduledTasks", params={"IsHidden": "false"}) as response:
+                if response.status in (401, 403):
+                    server.scan_polling = False
+                    self.logger.info(f"Library scan progress for {server.name} needs an admin API key; counts are not deferred during scans")
+                    return None
+                if response.status != 200:
+                    self.logger.debug("Could not read scheduled tasks from %s: HTTP %s", server.name, response.status)
+                    return None
+                tasks_info = await response.json()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            self.logger.debug("Could not read the library scan task from %s: %s", server.name, e)
+            return None
+
+        task = next((task for task in tasks_info if task.get("Key") == "RefreshLibrary"), None)
+        if task is None:
+            server.scan_polling = False
+            self.logger.info(f"{server.name} has no library scan task; counts are not deferred during scans")
+            return None
+        server.scan_task_id = task.get("Id")
+        return task
+
+    def calculate_uptime(self, server: Optional[JellyfinServer] = None) -> str:
+        """Format the server's uptime from its cached start time; no requests are made here."""
+        server = server or self.servers[0]
+        if not server.start_time or not server.breaker.closed:
             return "Offline"
-        total_minutes = int((time.time() - self.jellyfin_start_time) / 60)
+        total_minutes = int((datetime.now(timezone.utc) - server.start_time).total_seconds() / 60)
         hours = total_minutes // 60
         minutes = total_minutes % 60
         return "99+ Hours" if hours > 99 else f"{hours:02d}:{minutes:02d}"
 
-    async def get_library_stats(self) -> Dict[str, Dict[str, Any]]:
+    @metrics.timed("get_library_stats")
+    @tracing.traced("jellyfin.get_library_stats")
+    async def get_library_stats(self, server: Optional[JellyfinServer] = None) -> Dict[str, Dict[str, Any]]:
         """Fetch and cache Jellyfin library statistics."""
+        server = server or self.servers[0]
         current_time = datetime.now()
         if (
-            self.last_library_update
-            and (current_time - self.last_library_update).total_seconds() <= self.library_update_interval
+            server.last_library_update
+            and (current_time - server.last_library_update).total_seconds() <= self.library_update_interval
         ):
-            return self.library_cache
+            metrics.record_cache("library_stats", hit=True)
+            tracing.annotate("cache", "hit")
+            return server.library_cache
+        if server.scan_progress is not None and server.library_cache:
+            # Counting during a scan competes with the scanner for Jellyfin's database and returns
+            # half-updated numbers; the scan finishing triggers the recount instead
+            tracing.annotate("cache", "deferred")
+            return server.library_cache
+        metrics.record_cache("library_stats", hit=False)
+        tracing.annotate("cache", "miss")
 
-        if not await self.connect_to_jellyfin():
-            return self.library_cache
+        if not await self.connect_to_jellyfin(server):
+            return server.library_cache
 
         try:
-            headers = {
-                "X-Emby-Token": self.JELLYFIN_API_KEY,
-                "X-Emby-Client": "JellyWatch",
-                "X-Emby-Client-Version": "1.0.0",
-                "X-Emby-Device-Name": "JellyWatch",
-                "X-Emby-Device-Id": "jellywatch-bot",
-                "Accept": "application/json",
-                "X-Emby-Authorization": "MediaBrowser Client=\"JellyWatch\", Device=\"JellyWatch\", DeviceId=\"jellywatch-bot\", Version=\"1.0.0\""
-            }
-            
-            # Configure timeout for all requests (longer for library stats due to potentially large libraries)
-            timeout = aiohttp.ClientTimeout(total=60, connect=10)
-            
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                # Get all libraries
-                async with session.get(f"{self.JELLYFIN_URL}/Library/VirtualFolders", headers=headers) as response:
-                    if response.status != 200:
-                        self.logger.error(f"Failed to get library folders: HTTP {response.status}")
-                        return self.library_cache
-                    libraries = await response.json()
-
-                stats: Dict[str, Dict[str, Any]] = {}
-                jellyfin_config = self.config["jellyfin_sections"]
-                configured_sections = jellyfin_config["sections"]
-
-                for library in libraries:
-                    library_id = library.get("ItemId")
-                    library_name = library.get("Name", "").lower()
-                    
-                    if not int(jellyfin_config["show_all"]) and library_id not in configured_sections:
-                        continue
+            # Get all libraries
+            async with self._jellyfin_get(server, "/Library/VirtualFolders", ceiling=LIBRARY_TIMEOUT) as response:
+                if response.status != 200:
+                    self.logger.error(f"Failed to get library folders from {server.name}: HTTP {response.status}")
+                    return server.library_cache
+                libraries = await response.json()
 
-                    # Get library configuration
-                    config = configured_sections.get(library_id, {
-                        "display_name": library.get("Name", "Unknown Library"),
-                        "emoji": LIBRARY_EMOJIS["default"],
-                        "show_episodes": 0
-                    })
-
-                    # Use the configured emoji directly
-                    emoji = config.get("emoji", LIBRARY_EMOJIS["default"])
-
-                    # Get item counts using more efficient separate queries to avoid timeouts
-                    movie_count = 0
-                    series_count = 0
-                    episode_count = 0
-                    
-                    # Count movies
-                    movie_params = {
-                        "ParentId": library_id,
-                        "Recursive": "true",
-                        "IncludeItemTypes": "Movie",
-                        "Fields": "",
-                        "Limit": 1,
-                        "EnableTotalRecordCount": "true"
-                    }
-                    try:
-                        async with session.get(
-                            f"{self.JELLYFIN_URL}/Items",
-                            headers=headers,
-                            params=movie_params
-                        ) as movie_response:
-                            if movie_response.status == 200:
-                                movie_data = await movie_response.json()
-                                movie_count = movie_data.get("TotalRecordCount", 0)
-                    except Exception as e:
-                        self.logger.warning(f"Failed to get movie count for {library_name}: {e}")
-                    
-                    # Count series
-                    series_params = {
+            stats: Dict[str, Dict[str, Any]] = {}
+            jellyfin_config = self.config["jellyfin_sections"]
+            configured_sections = jellyfin_config["sections"]
+
+            for library in libraries:
+                library_id = library.get("ItemId")
+                library_name = library.get("Name", "").lower()
+
+                if not int(jellyfin_config["show_all"]) and library_id not in configured_sections:
+                    continue
+
+                # Get library configuration
+                config = configured_sections.get(library_id, {
+                    "display_name": library.get("Name", "Unknown Library"),
+                    "emoji": LIBRARY_EMOJIS["default"],
+                    "show_episodes": 0
+                })
+
+                # Use the configured emoji directly
+                emoji = config.get("emoji", LIBRARY_EMOJIS["default"])
+
+                # Get item counts using more efficient separate queries to avoid timeouts
+                movie_count = 0
+                series_count = 0
+                episode_count = 0
+
+                # Count movies
+                movie_params = {
+                    "ParentId": library_id,
+                    "Recursive": "true",
+                    "IncludeItemTypes": "Movie",
+                    "Fields": "",
+                    "Limit": 1,
+                    "EnableTotalRecordCount": "true"
+                }
+                try:
+                    async with self._jellyfin_get(
+                        server, "/Items", movie_params, ceiling=LIBRARY_TIMEOUT, endpoint="/Items (count)"
+                    ) as movie_response:
+                        if movie_response.status == 200:
+                            movie_data = await movie_response.json()
+                            movie_count = movie_data.get("TotalRecordCount", 0)
+                except Exception as e:
+                    self.logger.warning(f"Failed to get movie count for {library_name}: {e}")
+
+                # Count series
+                series_params = {
+                    "ParentId": library_id,
+                    "Recursive": "true",
+                    "IncludeItemTypes": "Series",
+                    "Fields": "",
+                    "Limit": 1,
+                    "EnableTotalRecordCount": "true"
+                }
+                try:
+                    async with self._jellyfin_get(
+                        server, "/Items", series_params, ceiling=LIBRARY_TIMEOUT, endpoint="/Items (count)"
+                    ) as series_response:
+                        if series_response.status == 200:
+                            series_data = await series_response.json()
+                            series_count = series_data.get("TotalRecordCount", 0)
+                except Exception as e:
+                    self.logger.warning(f"Failed to get series count for {library_name}: {e}")
+
+                # Count episodes only if needed
+                if config.get("show_episodes", 0):
+                    episode_params = {
                         "ParentId": library_id,
                         "Recursive": "true",
-                        "IncludeItemTypes": "Series",
+                        "IncludeItemTypes": "Episode",
                         "Fields": "",
                         "Limit": 1,
                         "EnableTotalRecordCount": "true"
                     }
                     try:
-                        async with session.get(
-                            f"{self.JELLYFIN_URL}/Items",
-                            headers=headers,
-                            params=series_params
-                        ) as series_response:
-                            if series_response.status == 200:
-                                series_data = await series_response.json()
-                                series_count = series_data.get("TotalRecordCount", 0)
+                        async with self._jellyfin_get(
+                            server, "/Items", episode_params, ceiling=LIBRARY_TIMEOUT, endpoint="/Items (count)"
+                        ) as episode_response:
+                            if episode_response.status == 200:
+                                episode_data = await episode_response.json()
+                                episode_count = episode_data.get("TotalRecordCount", 0)
                     except Exception as e:
-                        self.logger.warning(f"Failed to get series count for {library_name}: {e}")
-                    
-                    # Count episodes only if needed
-                    if config.get("show_episodes", 0):
-                        episode_params = {
-                            "ParentId": library_id,
-                            "Recursive": "true",
-                            "IncludeItemTypes": "Episode",
-                            "Fields": "",
-                            "Limit": 1,
-                            "EnableTotalRecordCount": "true"
-                        }
-                        try:
-                            async with session.get(
-                                f"{self.JELLYFIN_URL}/Items",
-                                headers=headers,
-                                params=episode_params
-                            ) as episode_response:
-                                if episode_response.status == 200:
-                                    episode_data = await episode_response.json()
-                                    episode_count = episode_data.get("TotalRecordCount", 0)
-                        except Exception as e:
-                            self.logger.warning(f"Failed to get episode count for {library_name}: {e}")
-
-                    # Create base stats dictionary
-                    library_stats = {
-                        "count": movie_count + series_count,
-                        "display_name": config.get("display_name", library.get("Name", "Unknown Library")),
-                        "emoji": emoji,
-                        "show_episodes": int(config.get("show_episodes", 0))  # Ensure integer
-                    }
+                        self.logger.warning(f"Failed to get episode count for {library_name}: {e}")
+
+                # Create base stats dictionary
+                library_stats = {
+                    "count": movie_count + series_count,
+                    "display_name": config.get("display_name", library.get("Name", "Unknown Library")),
+                    "emoji": emoji,
+                    "show_episodes": int(config.get("show_episodes", 0))  # Ensure integer
+                }
 
-                    # Only add episodes if show_episodes is 1
-                    if int(config.get("show_episodes", 0)) == 1:
-                        library_stats["episodes"] = episode_count
+                # Only add episodes if show_episodes is 1
+                if int(config.get("show_episodes", 0)) == 1:
+                    library_stats["episodes"] = episode_count
 
-                    stats[library_id] = library_stats
+                stats[library_id] = library_stats
 
-            self.library_cache = stats
-            self.last_library_update = current_time
-            self.logger.info(f"Library stats updated and cached (interval: {self.library_update_interval}s)")
+            server.library_cache = stats
+            server.last_library_update = current_time
+            self.logger.info(f"Library stats for {server.name} updated and cached (interval: {self.library_update_interval}s)")
             return stats
         except Exception as e:
-            self.logger.error(f"Error updating library stats: {e}", exc_info=True)
-            return self.library_cache
+            self.logger.error(f"Error updating library stats for {server.name}: {e}", exc_info=True)
+            return server.library_cache
 
-    async def get_sessions(self) -> List[Dict[str, Any]]:
+    @metrics.timed("get_sessions")
+    @tracing.traced("jellyfin.get_sessions")
+    async def get_sessions(self, server: Optional[JellyfinServer] = None) -> List[Dict[str, Any]]:
         """Get current Jellyfin sessions."""
-        if not await self.connect_to_jellyfin():
+        server = server or self.servers[0]
+        if not await self.connect_to_jellyfin(server):
             return []
 
         try:
-            headers = {
-                "X-Emby-Token": self.JELLYFIN_API_KEY,
-                "X-Emby-Client": "JellyWatch",
-                "X-Emby-Client-Version": "1.0.0",
-                "X-Emby-Device-Name": "JellyWatch",
-                "X-Emby-Device-Id": "jellywatch-bot",
-                "Accept": "application/json",
-                "X-Emby-Authorization": "MediaBrowser Client=\"JellyWatch\", Device=\"JellyWatch\", DeviceId=\"jellywatch-bot\", Version=\"1.0.0\""
-            }
-            
-            # Configure timeout for all requests
-            timeout = aiohttp.ClientTimeout(total=30, connect=10)
-            
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.get(f"{self.JELLYFIN_URL}/Sessions", headers=headers) as response:
-                    if response.status == 200:
-                        return await response.json()
-                    elif response.status == 401:
-                        self.logger.error("Invalid API key when fetching sessions")
-                        return []
-                    else:
-                        self.logger.error(f"Failed to get sessions: HTTP {response.status}")
-                        return []
+            status, sessions = await self._jellyfin_read(server, "/Sessions")
+            if status == 200:
+                return sessions
+            elif status == 401:
+                self.logger.error(f"Invalid API key when fetching sessions from {server.name}")
+                return []
+            else:
+                self.logger.error(f"Failed to get sessions from {server.name}: HTTP {status}")
+                return []
         except Exception as e:
-            self.logger.error(f"Error getting sessions: {e}")
+            self.logger.error(f"Error getting sessions from {server.name}: {e}")
             return []
 
     def get_active_streams(self) -> List[str]:
@@ -701,18 +1507,21 @@ class JellyfinCore(commands.Cog):
             self.logger.error(f"Error formatting title: {e}")
             return "Unknown"
 
-    def get_offline_info(self) -> Dict[str, Any]:
-        """Return offline status information."""
-        if self.offline_since is None:
-            self.offline_since = datetime.now()
+    def get_offline_info(self, server: Optional[JellyfinServer] = None) -> Dict[str, Any]:
+        """Return offline status information; `offline_since` is set when the server's circuit opens."""
+        server = server or self.servers[0]
+        if server.offline_since is None:
+            server.offline_since = datetime.now()
         
-        offline_duration = datetime.now() - self.offline_since
-        hours = int(offline_duration.total_seconds() / 3600)
-        minutes = int((offline_duration.total_seconds() % 3600) / 60)
+        # Round the duration down to the configured granularity so the offline embed changes rarely
+        granularity = max(int(self.config.get("dashboard", {}).get("offline_granularity_minutes", 15)), 1)
+        offline_minutes = int((datetime.now() - server.offline_since).total_seconds() // 60)
+        offline_minutes -= offline_minutes % granularity
+        hours, minutes = divmod(offline_minutes, 60)
         
         # Convert any boolean values in library_cache to integers
         library_stats = {}
-        for library_id, stats in self.library_cache.items():
+        for library_id, stats in server.library_cache.items():
             library_stats[library_id] = {
                 "count": int(stats.get("count", 0)),
                 "display_name": stats.get("display_name", "Unknown Library"),
@@ -728,22 +1537,41 @@ class JellyfinCore(commands.Cog):
             "library_stats": library_stats,
             "active_users": [],
             "current_streams": [],
+            "circuit": server.breaker.state,
+            "next_probe_seconds": server.breaker.seconds_until_probe(),
         }
 
-    async def create_dashboard_embed(self, info: Dict[str, Any]) -> discord.Embed:
-        """Create the dashboard embed with server information."""
+    @metrics.timed("create_dashboard_embed")
+    @tracing.traced("render.create_dashboard_embed")
+    async def create_dashboard_embed(
+        self,
+        info: Dict[str, Any],
+        server: Optional[JellyfinServer] = None,
+        extras: Optional[Dict[str, Snapshot]] = None,
+        stale_since: Optional[datetime] = None,
+    ) -> discord.Embed:
+        """Create the dashboard embed with server information.
+
+        `extras` holds the SABnzbd and Uptime Kuma snapshots; `stale_since` is set when
+        `info` is an older snapshot because the server missed this tick's deadline.
+        """
+        description = "Real-time server status and statistics"
+        if stale_since is not None:
+            description = f"⚠️ The server is slow to respond, showing data from {stale_since:%H:%M:%S}"
         embed = discord.Embed(
             title=f"📺 {info.get('server_name', 'Jellyfin Server')}",
-            description="Real-time server status and statistics",
+            description=description,
             color=discord.Color.blue()
         )
         
-        # Set thumbnail to Jellyfin logo (512x512 version)
-        embed.set_thumbnail(url="https://static-00.iconduck.com/assets.00/jellyfin-icon-512x512-jcuy5qbi.png")
+        # Show the poster of what is playing once it is cached, and the Jellyfin logo (512x512 version) until then
+        now_playing = info.get("now_playing")
+        poster = self._cached_poster(server, now_playing["poster"]) if now_playing and server else None
+        embed.set_thumbnail(url=poster or "https://static-00.iconduck.com/assets.00/jellyfin-icon-512x512-jcuy5qbi.png")
         
         # Add server status
         status = "🟢 Online" if info else "🔴 Offline"
-        uptime = self.calculate_uptime()
+        uptime = self.calculate_uptime(server)
         embed.add_field(
             name="Server Status",
             value=f"{status}\nUptime: {uptime}",
@@ -752,38 +1580,40 @@ class JellyfinCore(commands.Cog):
         
         # Add active streams
         current_streams = info.get('current_streams', 0)
+        streams_text = f"```css\n{current_streams} active stream{'s' if current_streams != 1 else ''}\n```"
+        if now_playing:
+            streams_text += f"\n▶️ {now_playing['title']}"
         embed.add_field(
             name="Active Streams",
-            value=f"```css\n{current_streams} active stream{'s' if current_streams != 1 else ''}\n```",
+            value=streams_text,
             inline=False
         )
         
         # Add library statistics
-        library_stats = info.get('library_stats', {})
-        if library_stats:
-            # Sort libraries by display_name
-            sorted_libraries = sorted(
-                library_stats.items(),
-                key=lambda x: x[1].get('display_name', '').lower()
+        stats_text = self._library_stats_text(info.get('library_stats', {}))
+        if stats_text:  # Only add the field if there are libraries to show
+            embed.add_field(
+                name="Library Statistics",
+                value=stats_text,
+                inline=False
             )
-            
-            stats_text = ""
-            for library_id, stats in sorted_libraries:
-                if stats.get('count', 0) > 0:  # Only show libraries with items
-                    stats_text += f"{stats.get('emoji', '📁')} **{stats.get('display_name', 'Unknown Library')}**\n"
-                    stats_text += f"```css\nTotal Items: {stats.get('count', 0)}\n```\n"
-                    # Only show episodes if show_episodes is 1 and episodes count exists
-                    if int(stats.get('show_episodes', 0)) == 1 and 'episodes' in stats:
-                        stats_text += f"```css\nEpisodes: {stats['episodes']}\n```\n"
-            if stats_text:  # Only add the field if there are libraries to show
-                embed.add_field(
-                    name="Library Statistics",
-                    value=stats_text,
-                    inline=False
-                )
+
+        scan_progress = info.get("library_scan")
+        if scan_progress is not None:
+            embed.add_field(
+                name="Library Scan",
+                value=f"🔄 {scan_progress:.0f}% done, library counts update when it finishes",
+                inline=False
+            )
+
+        self._add_source_fields(embed, extras or {})
+
+        chart = self._history_chart(server) if server else None
+        if chart:
+            embed.set_image(url=chart)
         
         # Set footer with JellyfinWatch branding and timestamp
-        current_time = datetime.now().strftime("%H:%M:%S")
+        current_time = (stale_since or datetime.now()).strftime("%H:%M:%S")
         embed.set_footer(
             text=f"Powered by JellyfinWatch | Last updated at {current_time}",
             icon_url="https://static-00.iconduck.com/assets.00/jellyfin-icon-96x96-h2vkd1yr.png"
@@ -791,92 +1621,532 @@ class JellyfinCore(commands.Cog):
         
         return embed
 
-    async def _update_dashboard_message(self, channel: discord.TextChannel, embed: discord.Embed) -> None:
-        """Update or create the dashboard message with improved rate limiting."""
-        max_retries = 3
-        base_delay = 1
-        
+    def _library_stats_text(self, library_stats: Dict[str, Dict[str, Any]]) -> str:
+        """Format library counts for the dashboard, sorted by display name, skipping empty libraries."""
+        stats_text = ""
+        for library_id, stats in sorted(library_stats.items(), key=lambda x: x[1].get('display_name', '').lower()):
+            if stats.get('count', 0) > 0:  # Only show libraries with items
+                stats_text += f"{stats.get('emoji', '📁')} **{stats.get('display_name', 'Unknown Library')}**\n"
+                stats_text += f"```css\nTotal Items: {stats.get('count', 0)}\n```\n"
+                # Only show episodes if show_episodes is 1 and episodes count exists
+                if int(stats.get('show_episodes', 0)) == 1 and 'episodes' in stats:
+                    stats_text += f"```css\nEpisodes: {stats['episodes']}\n```\n"
+        return stats_text
+
+    def _add_source_fields(self, embed: discord.Embed, extras: Dict[str, Snapshot]) -> None:
+        """Add the SABnzbd queue and Uptime Kuma statistics, marking snapshots older than this tick."""
+        renderers = {
+            "sabnzbd": ("SABnzbd Downloads", self._sabnzbd_text),
+            "uptime": ("Uptime Kuma", self._uptime_text),
+        }
+        for source, (name, render) in renderers.items():
+            snapshot = extras.get(source)
+            if snapshot is None:
+                continue
+            if not snapshot.available:
+                value = "⏳ Waiting for the first response" if snapshot.reason == "late" else "❌ Unavailable"
+            else:
+                value = render(snapshot.data)
+                if snapshot.stale:
+                    value += f"\n*⚠️ Stale, last updated at {snapshot.updated_at:%H:%M:%S}*"
+            embed.add_field(name=name, value=value, inline=False)
+
+    def _sabnzbd_text(self, info: Dict[str, Any]) -> str:
+        sabnzbd = self.bot.get_cog("SABnzbd")
+        downloads = info.get("downloads", [])
+        lines = [sabnzbd.format_download_info(download, i) for i, download in enumerate(downloads[:MAX_QUEUE_ROWS])]
+        if not downloads:
+            lines.append("```css\nNo active downloads\n```")
+        elif len(downloads) > MAX_QUEUE_ROWS:
+            lines.append(f"➕ {len(downloads) - MAX_QUEUE_ROWS} more in the queue")
+        lines.append(f"💾 Free space: {info.get('diskspace1', 'Unknown')} of {info.get('diskspacetotal1', 'Unknown')}")
+        return "\n".join(lines)
+
+    def _uptime_text(self, data: Tuple[Any, ...]) -> str:
+        uptime = self.bot.get_cog("Uptime")
+        uptime_24h, online_24h, uptime_7d, online_7d, uptime_30d, online_30d, last_offline = data
+        periods = (("24h", uptime_24h, online_24h), ("7d", uptime_7d, online_7d), ("30d", uptime_30d, online_30d))
+        text = "```css\n" + "\n".join(
+            f"{label}: {percent:.2f}% ({uptime.format_online_time(minutes)} online)" for label, percent, minutes in periods
+        ) + "\n```"
+        return text + f"Last offline: {last_offline or 'never in the last 30 days'}"
+
+    def create_offline_embed(
+        self,
+        offline_info: Dict[str, Any],
+        server: Optional[JellyfinServer] = None,
+        extras: Optional[Dict[str, Snapshot]] = None,
+    ) -> discord.Embed:
+        """Create the dashboard embed shown while the server is unreachable, with the last known library stats."""
+        server = server or self.servers[0]
+        embed = discord.Embed(
+            title=f"📺 {server.server_name or 'Jellyfin Server'}",
+            description="Server is currently unreachable",
+            color=discord.Color.red()
+        )
+        embed.set_thumbnail(url="https://static-00.iconduck.com/assets.00/jellyfin-icon-512x512-jcuy5qbi.png")
+        embed.add_field(
+            name="Server Status",
+            value=f"{offline_info['status']}\n{offline_info['uptime']}",
+            inline=False
+        )
+
+        stats_text = self._library_stats_text(offline_info.get("library_stats", {}))
+        if stats_text:
+            embed.add_field(
+                name="Library Statistics (last known)",
+                value=stats_text,
+                inline=False
+            )
+
+        self._add_source_fields(embed, extras or {})
+
+        embed.set_footer(
+            text=f"Powered by JellyfinWatch | Offline since {server.offline_since:%Y-%m-%d %H:%M}",
+            icon_url="https://static-00.iconduck.com/assets.00/jellyfin-icon-96x96-h2vkd1yr.png"
+        )
+        return embed
+
+    @metrics.timed("update_dashboard_message")
+    @tracing.traced("discord.update_dashboard_message")
+    async def _update_dashboard_message(
+        self,
+        channel: discord.TextChannel,
+        embed: discord.Embed,
+        server: Optional[JellyfinServer] = None,
+    ) -> None:
+        """Queue this server's dashboard embed for one channel and wait until it is sent or superseded."""
+        server = server or self.servers[0]
+        if not channel:
+            self.logger.error("Dashboard channel not found")
+            return
         try:
-            if not channel:
-                self.logger.error("Dashboard channel not found")
+            action = await self.update_queue.submit(
+                key=("dashboard", server.name, channel.id),
+                route=f"channel:{channel.id}",
+                send=lambda: self._send_dashboard_message(channel, embed, server),
+            )
+            tracing.annotate("action", action)
+        except discord.Forbidden:
+            self.logger.error(f"Bot doesn't have permission to post the dashboard in channel {channel.id}")
+        except Exception as e:
+            self.logger.error(f"Error updating dashboard message: {e}", exc_info=True)
+
+    async def _send_dashboard_message(
+        self,
+        channel: discord.TextChannel,
+        embed: discord.Embed,
+        server: JellyfinServer,
+    ) -> str:
+        """Edit the existing dashboard message, or post a new one if there is none; retries are left to the queue."""
+        message_id = server.dashboard_message_ids.get(channel.id)
+        if message_id:
+            try:
+                # A partial message avoids fetching the message before every edit
+                await channel.get_partial_message(message_id).edit(embed=embed)
+                self.logger.debug("Successfully edited existing dashboard message %s", message_id)
+                return "edit"
+            except discord.NotFound:
+                self.logger.warning(f"Dashboard message {message_id} not found, will create new message")
+                server.dashboard_message_ids.pop(channel.id, None)
+
+        self.logger.info(f"Creating new dashboard message for {server.name} in channel {channel.id}")
+        message = await channel.send(embed=embed)
+        server.dashboard_message_ids[channel.id] = message.id
+        self._save_message_ids()
+        self.logger.info(f"Successfully created new dashboard message with ID: {message.id}")
+        return "create"
+
+    def _image_channel(self) -> Optional[discord.abc.Messageable]:
+        """The channel posters and charts are uploaded to, or None if images are disabled."""
+        channel_id = int(self.config.get("posters", {}).get("channel_id") or 0)
+        return self.bot.get_channel(channel_id) if channel_id else None
+
+    async def _upload_image(self, filename: str, data: bytes) -> str:
+        """Post an image to the posters channel and return its CDN URL."""
+        return (await self._post_image(filename, data)).attachments[0].url
+
+    async def _upload_chart(self, filename: str, data: bytes) -> Tuple[str, Callable[[], Awaitable[None]]]:
+        """Post a chart to the posters channel; returns its CDN URL and a callable deleting it again."""
+        message = await self._post_image(filename, data)
+
+        async def delete() -> None:
+            await self.update_queue.submit(
+                key=("delete", message.id),
+                route=f"channel:{message.channel.id}",
+                send=message.delete,
+            )
+
+        return message.attachments[0].url, delete
+
+    async def _post_image(self, filename: str, data: bytes) -> discord.Message:
+        channel = self._image_channel()
+        if channel is None:
+            raise RuntimeError("the posters channel is not available")
+        return await self.update_queue.submit(
+            key=("image", filename),
+            route=f"channel:{channel.id}",
+            # A discord.File is consumed by sending it, so every attempt builds a new one
+            send=lambda: channel.send(file=discord.File(io.BytesIO(data), filename=filename)),
+        )
+
+    async def _fetch_poster(self, server: JellyfinServer, item_id: str, tag: str) -> bytes:
+        if not server.breaker.closed:
+            raise ConnectionError(f"the circuit for {server.name} is open")
+        async with self._jellyfin_get(
+            server, f"/Items/{item_id}/Images/Primary", {"tag": tag}, endpoint="/Items/Images/Primary"
+        ) as response:
+            response.raise_for_status()
+            return await response.read()
+
+    @staticmethod
+    def _poster_ref(item: Dict[str, Any]) -> Optional[Tuple[str, str]]:
+        """(item ID, image tag) of the poster to show for an item; episodes use their series poster."""
+        if item.get("Type") == "Episode" and item.get("SeriesId") and item.get("SeriesPrimaryImageTag"):
+            return item["SeriesId"], item["SeriesPrimaryImageTag"]
+        tag = (item.get("ImageTags") or {}).get("Primary")
+        return (item["Id"], tag) if item.get("Id") and tag else None
+
+    def _cached_poster(self, server: JellyfinServer, ref: Optional[Tuple[str, str]]) -> Optional[str]:
+        """The poster's URL if it is already uploaded; otherwise start loading it for a later render."""
+        if ref is None or self._image_channel() is None:
+            return None
+        return self.posters.warm(*ref, functools.partial(self._fetch_poster, server, *ref))
+
+    async def _poster(self, server: JellyfinServer, ref: Optional[Tuple[str, str]]) -> Optional[str]:
+        """The poster's URL, loading and uploading it first if needed, for up to POSTER_WAIT seconds."""
+        if ref is None or self._image_channel() is None:
+            return None
+        return await self.posters.url(*ref, functools.partial(self._fetch_poster, server, *ref), POSTER_WAIT)
+
+    def _recently_added_interval(self) -> float:
+        return max(float(self.config.get("recently_added", {}).get("interval_minutes", 5)), 1.0)
+
+    async def _announce_new_items(self, server: JellyfinServer, channel: Optional[discord.abc.Messageable]) -> None:
+        """Index everything added to this server's libraries since the last poll and post it as one message.
+
+        The library IDs come from the dashboard's library cache, so a steady-state poll costs
+        one small /Items request per library. Watermarks only advance once the message is sent.
+        """
+        if not server.breaker.closed or not server.library_cache:
+            return
+        try:
+            library_ids = list(server.library_cache)
+            results = await asyncio.gather(*(self._fetch_new_items(server, library_id) for library_id in library_ids))
+            items: List[Dict[str, Any]] = []
+            watermarks: Dict[str, datetime] = {}
+            for library_id, (new_items, watermark) in zip(library_ids, results):
+                items.extend(new_items)
+                if watermark is not None and watermark != server.added_watermarks.get(library_id):
+                    watermarks[library_id] = watermark
+            if items:
+                await self._index_new_items(server, items)
+            if items and channel is not None:
+                embed = self._recently_added_embed(server, items)
+                # The newest item with artwork gets the thumbnail
+                poster = await self._poster(server, next(filter(None, map(self._poster_ref, reversed(items))), None))
+                if poster:
+                    embed.set_thumbnail(url=poster)
+                await self.update_queue.submit(
+                    key=("recently_added", server.name, max(watermarks.values()).isoformat()),
+                    route=f"channel:{channel.id}",
+                    send=lambda: channel.send(embed=embed),
+                )
+                self.logger.info(f"Announced {len(items)} new items from {server.name}")
+            if watermarks:
+                server.added_watermarks.update(watermarks)
+                self._save_watermarks()
+        except aiohttp.ClientConnectionError as e:
+            # The server stopped answering; open its circuit so the other pollers back off too
+            server.breaker.record_failure()
+            self.logger.warning(f"Could not poll new items from {server.name}: {e}")
+        except Exception as e:
+            self.logger.error(f"Error announcing new items from {server.name}: {e}", exc_info=True)
+
+    async def _fetch_new_items(self, server: JellyfinServer, library_id: str) -> Tuple[List[Dict[str, Any]], Optional[datetime]]:
+        """Return the library's items created after its watermark, oldest first, and the new watermark.
+
+        The first poll of a library only records a watermark, so existing items are never announced.
+        """
+        watermark = server.added_watermarks.get(library_id)
+        params = {
+            "ParentId": library_id,
+            "Recursive": "true",
+            "IncludeItemTypes": "Movie,Episode",
+            "SortBy": "DateCreated",
+            "SortOrder": "Descending",
+            "Fields": "DateCreated",
+            "Limit": 1 if watermark is None else RECENTLY_ADDED_PAGE,
+            "EnableTotalRecordCount": "false",
+            "EnableImageTypes": "Primary",
+            "ImageTypeLimit": 1,
+            "EnableUserData": "false",
+        }
+        if watermark is not None:
+            # DateLastSaved is never older than DateCreated, so this lets Jellyfin skip old items by index
+            params["MinDateLastSaved"] = watermark.strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+        new_items: List[Dict[str, Any]] = []
+        for page in range(RECENTLY_ADDED_MAX_PAGES):
+            if not server.breaker.closed:
+                return [], None
+            params["StartIndex"] = page * RECENTLY_ADDED_PAGE
+            async with self._jellyfin_get(server, "/Items", params, endpoint="/Items (recently added)") as response:
+                if response.status != 200:
+                    self.logger.warning(f"Failed to poll new items in {server.name}/{library_id}: HTTP {response.status}")
+                    return [], None
+                page_items = (await response.json()).get("Items", [])
+
+            if watermark is None:
+                newest = self._date_created(page_items[0]) if page_items else None
+                return [], newest or datetime.now(timezone.utc)
+
+            # A metadata refresh also bumps DateLastSaved, so re-check DateCreated here
+            fresh = [item for item in page_items if (self._date_created(item) or watermark) > watermark]
+            new_items.extend(fresh)
+            if len(fresh) < len(page_items) or len(page_items) < RECENTLY_ADDED_PAGE:
+                break
+        else:
+            self.logger.warning(f"More than {len(new_items)} new items in {server.name}/{library_id}, announcing the newest")
+
+        if not new_items:
+            return [], watermark
+        new_items.reverse()
+        return new_items, max(self._date_created(item) for item in new_items)
+
+    def _activity_log_interval(self) -> float:
+        return max(float(self.config.get("activity_log", {}).get("interval_minutes", 1)), 0.5)
+
+    async def _post_activity(self, server: JellyfinServer, channel: discord.abc.Messageable) -> None:
+        """Post this server's new activity entries as one message; the watermark only advances once it is sent."""
+        if not server.activity_polling or not server.breaker.closed:
+            return
+        try:
+            result = await self._fetch_activity(server)
+            if result is None:
                 return
+            entries, watermark, overflowed = result
+            activity_filter = ActivityFilter(self.config.get("activity_log", {}))
+            matched = [entry for entry in entries if activity_filter.matches(entry)]
+            if matched:
+                embed = self._activity_embed(server, matched, overflowed)
+                await self.update_queue.submit(
+                    key=("activity_log", server.name, watermark[1]),
+                    route=f"channel:{channel.id}",
+                    send=lambda: channel.send(embed=embed),
+                )
+                self.logger.debug("Posted %d of %d activity entries from %s", len(matched), len(entries), server.name)
+            if watermark != server.activity_watermark:
+                server.activity_watermark = watermark
+                self._save_activity_watermarks()
+        except Exception as e:
+            self.logger.error(f"Error posting activity from {server.name}: {e}", exc_info=True)
 
-            if self.dashboard_message_id:
-                self.logger.info(f"Attempting to edit existing message ID: {self.dashboard_message_id}")
-                
-                # Try with exponential backoff for rate limiting
-                for attempt in range(max_retries):
-                    try:
-                        message = await channel.fetch_message(self.dashboard_message_id)
-                        await message.edit(embed=embed)
-                        self.logger.info("Successfully edited existing dashboard message")
-                        return
-                    except discord.RateLimited as e:
-                        if attempt == max_retries - 1:
-                            self.logger.error(f"Failed to edit message after {max_retries} rate limit attempts")
-                            return
-                        
-                        retry_delay = max(e.retry_after, base_delay * (2 ** attempt))
-                        self.logger.warning(f"Rate limited on attempt {attempt + 1}/{max_retries}, waiting {retry_delay:.1f} seconds")
-                        await asyncio.sleep(retry_delay)
-                        continue
-                    except discord.NotFound:
-                        self.logger.warning(f"Dashboard message {self.dashboard_message_id} not found, will create new message")
-                        self.dashboard_message_id = None
-                        break  # Exit retry loop to create new message
-                    except discord.Forbidden:
-                        self.logger.error("Bot doesn't have permission to edit messages in the channel")
-                        return
-                    except discord.HTTPException as e:
-                        if attempt == max_retries - 1:
-                            self.logger.error(f"HTTP error editing message after {max_retries} attempts: {e}")
-                            return
-                        
-                        delay = base_delay * (2 ** attempt)
-                        self.logger.warning(f"HTTP error on attempt {attempt + 1}/{max_retries}, retrying in {delay} seconds: {e}")
-                        await asyncio.sleep(delay)
-                        continue
-                    except Exception as e:
-                        self.logger.error(f"Unexpected error editing message: {e}")
-                        return
+    async def _fetch_activity(self, server: JellyfinServer) -> Optional[Tuple[List[Dict[str, Any]], Tuple[datetime, int], bool]]:
+        """Return the entries newer than the watermark oldest first, the new watermark, and whether some were skipped.
 
-            # Create new message if we don't have an ID or message was not found
-            if not self.dashboard_message_id:
-                for attempt in range(max_retries):
-                    try:
-                        self.logger.info(f"Creating new dashboard message (attempt {attempt + 1}/{max_retries})")
-                        message = await channel.send(embed=embed)
-                        self.dashboard_message_id = message.id
-                        self._save_message_id(message.id)
-                        self.logger.info(f"Successfully created new dashboard message with ID: {message.id}")
-                        return
-                    except discord.RateLimited as e:
-                        if attempt == max_retries - 1:
-                            self.logger.error(f"Failed to create message after {max_retries} rate limit attempts")
-                            return
-                        
-                        retry_delay = max(e.retry_after, base_delay * (2 ** attempt))
-                        self.logger.warning(f"Rate limited creating message on attempt {attempt + 1}/{max_retries}, waiting {retry_delay:.1f} seconds")
-                        await asyncio.sleep(retry_delay)
-                        continue
-                    except discord.Forbidden:
-                        self.logger.error("Bot doesn't have permission to send messages in the channel")
-                        return
-                    except discord.HTTPException as e:
-                        if attempt == max_retries - 1:
-                            self.logger.error(f"HTTP error creating message after {max_retries} attempts: {e}")
-                            return
-                        
-                        delay = base_delay * (2 ** attempt)
-                        self.logger.warning(f"HTTP error creating message on attempt {attempt + 1}/{max_retries}, retrying in {delay} seconds: {e}")
-                        await asyncio.sleep(delay)
-                        continue
-                    except Exception as e:
-                        self.logger.error(f"Unexpected error creating message: {e}")
+        `minDate` lets Jellyfin skip the old part of the log; entries sharing the watermark's
+        timestamp come back again and are dropped by their ID, which only ever grows. The log
+        is paged newest first, so an entry logged while paging shifts later pages and can only
+        repeat an entry, never hide one. The first poll only records a watermark, so history
+        is never replayed. Returns None if the log could not be read.
+        """
+        watermark = server.activity_watermark
+        params: Dict[str, Any] = {"limit": 1 if watermark is None else ACTIVITY_PAGE}
+        if watermark is not None:
+            params["minDate"] = watermark[0].strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+        entries: Dict[int, Dict[str, Any]] = {}
+        overflowed = False
+        for page in range(ACTIVITY_MAX_PAGES):
+            params["startIndex"] = page * ACTIVITY_PAGE
+            async with self._jellyfin_get(server, "/System/ActivityLog/Entries", params) as response:
+                if response.status in (401, 403):
+                    server.activity_polling = False
+                    self.logger.error(f"Reading the activity log of {server.name} needs an admin API key; not posting its activity")
+                    return None
+                if response.status != 200:
+                    self.logger.warning(f"Failed to read the activity log of {server.name}: HTTP {response.status}")
+                    return None
+                page_entries = (await response.json()).get("Items", [])
+
+            if watermark is None:
+                if not page_entries:
+                    return [], (datetime.now(timezone.utc), 0), False
+                return [], self._activity_position(page_entries[0]), False
+
+            fresh = [entry for entry in page_entries if int(entry.get("Id", 0)) > watermark[1]]
+            for entry in fresh:
+                entries.setdefault(int(entry["Id"]), entry)
+            if len(fresh) < len(page_entries) or len(page_entries) < ACTIVITY_PAGE:
+                break
+        else:
+            overflowed = True
+            self.logger.warning(f"More than {len(entries)} new activity entries on {server.name}, posting the newest")
+
+        if not entries:
+            return [], watermark, False
+        ordered = [entries[entry_id] for entry_id in sorted(entries)]
+        return ordered, self._activity_position(ordered[-1]), overflowed
+
+    def _activity_position(self, entry: Dict[str, Any]) -> Tuple[datetime, int]:
+        try:
+            date = isoparse(entry["Date"]).astimezone(timezone.utc)
+        except (KeyError, TypeError, ValueError):
+            date = datetime.now(timezone.utc)
+        return date, int(entry.get("Id", 0))
+
+    def _activity_embed(self, server: JellyfinServer, entries: List[Dict[str, Any]], overflowed: bool) -> discord.Embed:
+        """List the entries, newest last; past ACTIVITY_MAX_LINES the oldest are summarized by type."""
+        shown = entries if len(entries) <= ACTIVITY_MAX_LINES else entries[-(ACTIVITY_MAX_LINES - 1):]
+        earlier = entries[:len(entries) - len(shown)]
+        lines = []
+        if overflowed:
+            lines.append("⚠️ Too much activity since the last check, older entries were skipped")
+        if earlier:
+            counts: Dict[str, int] = {}
+            for entry in earlier:
+                counts[entry.get("Type", "Other")] = counts.get(entry.get("Type", "Other"), 0) + 1
+            top = sorted(counts.items(), key=lambda item: -item[1])[:3]
+            lines.append(f"➕ {len(earlier)} earlier: " + ", ".join(f"{count} × {entry_type}" for entry_type, count in top))
+        for entry in shown:
+            try:
+                at = isoparse(entry["Date"]).astimezone().strftime("%H:%M")
+            except (KeyError, TypeError, ValueError):
+                at = "--:--"
+            lines.append(f"{activity_emoji(entry)} `{at}` {entry.get('Name', 'Unknown activity')[:200]}")
+        title = "📋 Jellyfin Activity"
+        if len(self.servers) > 1:
+            title += f" on {server.server_name or server.name}"
+        embed = discord.Embed(title=title, description="\n".join(lines), color=discord.Color.dark_grey())
+        embed.set_footer(
+            text=f"Powered by JellyfinWatch | {len(entries)} entr{'ies' if len(entries) != 1 else 'y'}",
+            icon_url="https://static-00.iconduck.com/assets.00/jellyfin-icon-96x96-h2vkd1yr.png"
+        )
+        return embed
+
+    async def _index_new_items(self, server: JellyfinServer, items: List[Dict[str, Any]]) -> None:
+        """Add new movies, and the series of new episodes, to the title index."""
+        titles = {}
+        for item in items:
+            if item.get("Type") == "Episode":
+                if item.get("SeriesId") and item.get("SeriesName"):
+                    titles[item["SeriesId"]] = {"id": item["SeriesId"], "name": item["SeriesName"], "type": "Series", "year": None}
+            elif item.get("Id") and item.get("Name"):
+                titles[item["Id"]] = {"id": item["Id"], "name": item["Name"], "type": item.get("Type", "Movie"), "year": item.get("ProductionYear")}
+        if titles:
+            changed = await asyncio.to_thread(self._get_title_index().upsert, server.name, titles.values())
+            self.logger.debug("Indexed %d new titles from %s", changed, server.name)
+
+    async def _build_title_index(self, server: JellyfinServer) -> None:
+        """Page through every movie and series on the server and replace its part of the title index."""
+        params = {
+            "Recursive": "true",
+            "IncludeItemTypes": "Movie,Series",
+            "Fields": "",
+            "Limit": SEARCH_INDEX_PAGE,
+            "EnableTotalRecordCount": "false",
+            "EnableImages": "false",
+            "EnableUserData": "false",
+        }
+        titles: List[Dict[str, Any]] = []
+        started = time.perf_counter()
+        try:
+            while True:
+                if not server.breaker.closed:
+                    self.logger.warning(f"Stopped building the title index for {server.name}: the server went offline")
+                    return
+                params["StartIndex"] = len(titles)
+                async with self._jellyfin_get(
+                    server, "/Items", params, ceiling=LIBRARY_TIMEOUT, endpoint="/Items (title index)"
+                ) as response:
+                    if response.status != 200:
+                        self.logger.error(f"Failed to build the title index for {server.name}: HTTP {response.status}")
                         return
-                        
-        except Exception as e:
-            self.logger.error(f"Error updating dashboard message: {e}", exc_info=True)
+                    page = (await response.json()).get("Items", [])
+                titles.extend(
+                    {"id": item["Id"], "name": item["Name"], "type": item.get("Type", "Movie"), "year": item.get("ProductionYear")}
+                    for item in page
+                    if item.get("Id") and item.get("Name")
+                )
+                if len(page) < SEARCH_INDEX_PAGE:
+                    break
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            self.logger.error(f"Failed to build the title index for {server.name}: {e}")
+            return
+        count = await asyncio.to_thread(self._get_title_index().replace_server, server.name, titles)
+        self.logger.info(f"Indexed {count} titles from {server.name} in {time.perf_counter() - started:.1f}s")
+
+    def _search_label(self, match: Dict[str, Any]) -> str:
+        emoji = "📺" if match["type"] == "Series" else "🎥"
+        year = f" ({match['year']})" if match.get("year") else ""
+        server = f" - {match['server']}" if len(self.servers) > 1 else ""
+        return f"{emoji} {match['name']}{year}{server}"
+
+    @staticmethod
+    def _date_created(item: Dict[str, Any]) -> Optional[datetime]:
+        try:
+            return isoparse(item["DateCreated"]).astimezone(timezone.utc)
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    def _recently_added_embed(self, server: JellyfinServer, items: List[Dict[str, Any]]) -> discord.Embed:
+        """Render new items as one embed, collapsing the episodes of one season into a single line."""
+        lines: List[str] = []
+        seasons: Dict[Tuple[str, Any], Tuple[int, List[Dict[str, Any]]]] = {}
+        for item in items:
+            if item.get("Type") == "Episode":
+                key = (item.get("SeriesName", "Unknown Series"), item.get("ParentIndexNumber"))
+                if key not in seasons:
+                    # The line is filled in below, once all of the season's episodes are known
+                    seasons[key] = (len(lines), [])
+                    lines.append("")
+                seasons[key][1].append(item)
+            else:
+                year = f" ({item['ProductionYear']})" if item.get("ProductionYear") else ""
+                lines.append(f"🎥 **{item.get('Name', 'Unknown')}**{year}")
+
+        for (series, season), (index, episodes) in seasons.items():
+            if len(episodes) == 1:
+                lines[index] = f"📺 **{self._get_formatted_title(episodes[0])}**"
+                continue
+            numbers = sorted(episode.get("IndexNumber") or 0 for episode in episodes)
+            span = f"E{numbers[0]:02d}-E{numbers[-1]:02d}" if numbers[0] != numbers[-1] else f"E{numbers[0]:02d}"
+            season_text = f"Season {season}" if season is not None else "Specials"
+            lines[index] = f"📺 **{series}** - {season_text}: {len(episodes)} episodes ({span})"
+
+        if len(lines) > RECENTLY_ADDED_MAX_LINES:
+            hidden = len(lines) - RECENTLY_ADDED_MAX_LINES + 1
+            lines = lines[:RECENTLY_ADDED_MAX_LINES - 1] + [f"➕ {hidden} more"]
+        title = "🆕 Recently Added"
+        if len(self.servers) > 1:
+            title += f" on {server.server_name or server.name}"
+        embed = discord.Embed(title=title, description="\n".join(lines), color=discord.Color.green())
+        embed.set_footer(
+            text=f"Powered by JellyfinWatch | {len(items)} new item{'s' if len(items) != 1 else ''}",
+            icon_url="https://static-00.iconduck.com/assets.00/jellyfin-icon-96x96-h2vkd1yr.png"
+        )
+        return embed
+
+    def _invalidate_library_caches(self) -> None:
+        """Drop every server's cached library stats so the next poll recounts them."""
+        for server in self.servers:
+            server.library_cache = {}
+            server.last_library_update = None
+
+    async def _fetch_libraries(self, server: JellyfinServer) -> Optional[List[Dict[str, Any]]]:
+        """Fetch a server's virtual folders, or None if the server cannot be reached."""
+        try:
+            if not await self.connect_to_jellyfin(server):
+                return None
+            async with self._jellyfin_get(server, "/Library/VirtualFolders", ceiling=LIBRARY_TIMEOUT) as response:
+                if response.status != 200:
+                    self.logger.error(f"Failed to fetch libraries from {server.name}: HTTP {response.status}")
+                    return None
+                return await response.json()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            self.logger.error(f"Failed to fetch libraries from {server.name}: {e}")
+            return None
 
     @app_commands.command(name="update_libraries", description="Update library sections in the dashboard")
     @app_commands.check(is_authorized)
@@ -885,37 +2155,24 @@ class JellyfinCore(commands.Cog):
         await interaction.response.defer(ephemeral=True)
         
         try:
-            if not await self.connect_to_jellyfin():
-                await interaction.followup.send("❌ Failed to connect to Jellyfin server.", ephemeral=True)
+            # Get all libraries from every server
+            results = await asyncio.gather(*(self._fetch_libraries(server) for server in self.servers))
+            failed = [server.name for server, result in zip(self.servers, results) if result is None]
+            if len(failed) == len(self.servers):
+                await interaction.followup.send("❌ Failed to fetch libraries from Jellyfin.", ephemeral=True)
                 return
+            libraries = [library for result in results if result for library in result]
 
-            # Get all libraries
-            headers = {
-                "X-Emby-Token": self.JELLYFIN_API_KEY,
-                "X-Emby-Client": "JellyWatch",
-                "X-Emby-Client-Version": "1.0.0",
-                "X-Emby-Device-Name": "JellyWatch",
-                "X-Emby-Device-Id": "jellywatch-bot",
-                "Accept": "application/json",
-                "X-Emby-Authorization": "MediaBrowser Client=\"JellyWatch\", Device=\"JellyWatch\", DeviceId=\"jellywatch-bot\", Version=\"1.0.0\""
-            }
-            
-            # Configure timeout for all requests
-            timeout = aiohttp.ClientTimeout(total=30, connect=10)
-            
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.get(f"{self.JELLYFIN_URL}/Library/VirtualFolders", headers=headers) as response:
-                    if response.status != 200:
-                        await interaction.followup.send("❌ Failed to fetch libraries from Jellyfin.", ephemeral=True)
-                        return
-
-                    libraries = await response.json()
-            
             # Sort libraries by name
             libraries = sorted(libraries, key=lambda x: x.get("Name", "").lower())
             
-            # Update config with new libraries
-            self.config["jellyfin_sections"]["sections"] = {}
+            # Update config with new libraries. Sections no reachable server lists may belong to an
+            # unreachable one, so they are kept until every server answers and removed ones can be told apart
+            listed = {library.get("ItemId") for library in libraries}
+            sections = self.config["jellyfin_sections"]["sections"]
+            self.config["jellyfin_sections"]["sections"] = {
+                library_id: section for library_id, section in sections.items() if failed and library_id not in listed
+            }
             
             for library in libraries:
                 library_name = library.get("Name", "").lower()
@@ -967,20 +2224,17 @@ class JellyfinCore(commands.Cog):
             self.save_config()
             
             # Clear the library cache to force refresh
-            self.library_cache = {}
-            self.last_library_update = None
+            self._invalidate_library_caches()
             
             # Send initial success message
-            await interaction.followup.send("✅ Libraries updated successfully! Refreshing dashboard in 10 seconds...", ephemeral=True)
+            skipped = f" (unreachable, libraries kept: {', '.join(failed)})" if failed else ""
+            await interaction.followup.send(f"✅ Libraries updated successfully{skipped}! Refreshing dashboard in 10 seconds...", ephemeral=True)
             
             # Wait 10 seconds
             await asyncio.sleep(10)
             
-            # Get server info and update dashboard
-            info = await self.get_server_info()
-            channel = self.bot.get_channel(self.CHANNEL_ID)
-            embed = await self.create_dashboard_embed(info)
-            await self._update_dashboard_message(channel, embed)
+            # Get server info and update dashboards
+            await self._refresh_all_dashboards()
             
         except Exception as e:
             self.logger.error(f"Error updating libraries: {e}")
@@ -1020,14 +2274,10 @@ class JellyfinCore(commands.Cog):
             self.save_config()
             
             # Clear the library cache and force a refresh
-            self.library_cache = {}
-            self.last_library_update = None
+            self._invalidate_library_caches()
             
-            # Get server info and update dashboard
-            info = await self.get_server_info()
-            channel = self.bot.get_channel(self.CHANNEL_ID)
-            embed = await self.create_dashboard_embed(info)
-            await self._update_dashboard_message(channel, embed)
+            # Get server info and update dashboards
+            await self._refresh_all_dashboards()
             
             await interaction.followup.send(
                 f"✅ Episode numbers display has been {'enabled' if new_state == 1 else 'disabled'}!",
@@ -1046,30 +2296,27 @@ class JellyfinCore(commands.Cog):
         
         try:
             self.logger.info("Starting dashboard refresh...")
-            
-            # Get server info and update dashboard
-            self.logger.info("Attempting to get server info...")
-            info = await self.get_server_info()
-            if not info:
-                self.logger.error("Failed to get server info - empty response")
-                await interaction.followup.send("❌ Failed to get server information. Check bot logs for details.", ephemeral=True)
-                return
-                
-            self.logger.info(f"Got server info: {info.get('server_name', 'Unknown Server')}")
-            
-            self.logger.info(f"Getting channel with ID: {self.CHANNEL_ID}")
-            channel = self.bot.get_channel(self.CHANNEL_ID)
-            if not channel:
-                self.logger.error(f"Channel {self.CHANNEL_ID} not found")
-                await interaction.followup.send("❌ Dashboard channel not found. Check CHANNEL_ID in config.", ephemeral=True)
+            outcomes = await self._refresh_all_dashboards()
+
+            problems = {
+                "offline": "server unreachable, showing the offline dashboard",
+                "pending": "server is slow to respond, the dashboard will update on the next tick",
+                "channel_missing": "dashboard channel not found, check its channel ID",
+                "error": "unexpected error",
+            }
+            failures = [
+                f"**{server.name}**: {problems[outcome]}"
+                for server, outcome in zip(self.servers, outcomes)
+                if outcome != "updated"
+            ]
+            if failures:
+                self.logger.error(f"Dashboard refresh failed for {len(failures)} of {len(self.servers)} servers")
+                await interaction.followup.send(
+                    "❌ Dashboard refresh failed. Check bot logs for details.\n" + "\n".join(failures),
+                    ephemeral=True
+                )
                 return
-                
-            self.logger.info("Creating dashboard embed...")
-            embed = await self.create_dashboard_embed(info)
-            
-            self.logger.info("Updating dashboard message...")
-            await self._update_dashboard_message(channel, embed)
-            
+
             self.logger.info("Dashboard refresh completed successfully")
             await interaction.followup.send("✅ Dashboard refreshed successfully!", ephemeral=True)
             
@@ -1077,6 +2324,43 @@ class JellyfinCore(commands.Cog):
             self.logger.error(f"Error refreshing dashboard: {str(e)}", exc_info=True)
             await interaction.followup.send(f"❌ Error refreshing dashboard: {str(e)}", ephemeral=True)
 
+    @app_commands.command(name="search", description="Check whether a movie or series is in the library")
+    @app_commands.describe(title="Title, or part of it")
+    async def search(self, interaction: discord.Interaction, title: str):
+        """Answer from the local title index; autocomplete picks pass the exact item as `server:item_id`."""
+        index = self._get_title_index()
+        server_name, _, item_id = title.rpartition(":")
+        picked = await asyncio.to_thread(index.get, server_name, item_id) if server_name else None
+        matches = [picked] if picked else await asyncio.to_thread(index.search, title, SEARCH_RESULTS)
+
+        if matches:
+            embed = discord.Embed(
+                title=f"🔎 {matches[0]['name'] if picked else title}",
+                description="\n".join(f"✅ **{self._search_label(match)}**" for match in matches),
+                color=discord.Color.green(),
+            )
+        elif await asyncio.to_thread(index.count) == 0:
+            embed = discord.Embed(
+                title=f"🔎 {title}",
+                description="⏳ The title index is still being built, please try again in a few minutes.",
+                color=discord.Color.orange(),
+            )
+        else:
+            embed = discord.Embed(
+                title=f"🔎 {title}",
+                description="❌ Nothing with that title is in the library.",
+                color=discord.Color.red(),
+            )
+        await interaction.response.send_message(embed=embed)
+
+    @search.autocomplete("title")
+    async def search_autocomplete(self, interaction: discord.Interaction, current: str) -> List[app_commands.Choice[str]]:
+        matches = await asyncio.to_thread(self._get_title_index().search, current, 25)
+        return [
+            app_commands.Choice(name=self._search_label(match)[:100], value=f"{match['server']}:{match['item_id']}"[:100])
+            for match in matches
+        ]
+
     @app_commands.command(name="sync", description="Sync slash commands with Discord")
     @app_commands.check(is_authorized)
     async def sync_commands(self, interaction: discord.Interaction):
@@ -1084,8 +2368,9 @@ class JellyfinCore(commands.Cog):
         await interaction.response.defer(ephemeral=True)
         
         try:
-            # Sync the command tree
+            # Sync the command tree and remember it so the next startup can skip the sync
             await self.bot.tree.sync()
+            save_synced_hash(COMMAND_HASH_FILE, command_tree_hash(self.bot.tree))
             await interaction.followup.send("✅ Slash commands synced successfully!", ephemeral=True)
         except Exception as e:
             self.logger.error(f"Error syncing commands: {e}")
@@ -1117,8 +2402,9 @@ class JellyfinCore(commands.Cog):
     def save_config(self) -> None:
         """Save the current configuration to config.json."""
         try:
-            # Create a copy of the config to modify
+            # Create a copy of the config to modify, keeping blocks owned by other cogs (sabnzbd, logging, ...)
             config_to_save = {
+                **self.config,
                 "dashboard": self.config.get("dashboard", {}),
                 "jellyfin_sections": {
                     "show_all": int(self.config.get("jellyfin_sections", {}).get("show_all", 1)),
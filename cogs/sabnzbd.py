@@ -1,3 +1,4 @@
+import discord
 from discord.ext import commands
 import aiohttp
 import logging
@@ -6,13 +7,20 @@ import json
 from typing import Dict, Any, List
 from dotenv import load_dotenv
 from urllib.parse import urljoin
+from utils import metrics, tracing
+from utils.config_watcher import WATCHER, parse_config
 
 RUNNING_IN_DOCKER = os.getenv("RUNNING_IN_DOCKER", "false").lower() == "true"
 
 if not RUNNING_IN_DOCKER:
     load_dotenv()
 
+DEFAULT_KEYWORDS = ["AC3", "DL", "German", "1080p", "2160p", "4K", "GERMAN"]
+
 class SABnzbd(commands.Cog):
+    # Only talks to the SABnzbd API, so no gateway events are needed
+    required_intents = discord.Intents.none()
+
     def __init__(self, bot: commands.Bot) -> None:
         self.bot = bot
         self.logger = logging.getLogger("jellywatch_bot.sabnzbd")
@@ -23,41 +31,60 @@ class SABnzbd(commands.Cog):
         self.current_dir = os.path.dirname(os.path.abspath(__file__))
         self.CONFIG_FILE = os.path.join(self.current_dir, "..", "data", "config.json")
         self.keywords = self._load_keywords()
+        self._unsubscribe = WATCHER.subscribe(self.CONFIG_FILE, self._apply_config)
+
+    async def cog_unload(self) -> None:
+        self._unsubscribe()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.SABNZBD_URL)
 
     def _load_keywords(self) -> List[str]:
         """Load SABnzbd keywords from config.json with defaults if unavailable."""
-        default_keywords = ["AC3", "DL", "German", "1080p", "2160p", "4K", "GERMAN"]
         try:
             with open(self.CONFIG_FILE, "r", encoding="utf-8") as f:
-                config = json.load(f)
-                return config.get("sabnzbd", {}).get("keywords", default_keywords)
-        except (FileNotFoundError, json.JSONDecodeError) as e:
+                config = parse_config(json.load(f))
+                return config.get("sabnzbd", {}).get("keywords", DEFAULT_KEYWORDS)
+        except (FileNotFoundError, ValueError) as e:
             self.logger.error(f"Failed to load SABnzbd keywords: {e}. Using defaults.")
-            return default_keywords
+            return DEFAULT_KEYWORDS
+
+    def _apply_config(self, config: Dict[str, Any]) -> None:
+        keywords = config.get("sabnzbd", {}).get("keywords", DEFAULT_KEYWORDS)
+        if keywords != self.keywords:
+            self.keywords = list(keywords)
+            self.logger.info("SABnzbd keywords reloaded")
 
+    @tracing.traced("sabnzbd.get_sabnzbd_info")
     async def get_sabnzbd_info(self) -> Dict[str, Any]:
         """Fetch download queue and disk space information from SABnzbd API."""
         url = urljoin(self.SABNZBD_URL, "api")
         params = {"apikey": self.SABNZBD_API_KEY, "output": "json", "mode": "queue"}
         try:
-            async with aiohttp.ClientSession() as session:
+            async with aiohttp.ClientSession(trace_configs=[metrics.http_trace_config("sabnzbd"), tracing.http_trace_config("sabnzbd")]) as session:
                 async with session.get(url, params=params) as response:
                     if not response.ok:
                         error_text = await response.text()
                         self.logger.error(f"SABnzbd API error - Status {response.status}: {error_text}")
-                        return {"downloads": [], "diskspace1": "Unknown", "diskspacetotal1": "Unknown"}
+                        return self._unavailable(f"HTTP {response.status}")
                     data = await response.json()
 
             queue = data.get("queue", {})
             slots = queue.get("slots", [])
             disk_space = queue.get("diskspace1", "Unknown")
             total_disk_space = queue.get("diskspacetotal1", "Unknown")
+            try:
+                kbpersec = float(queue.get("kbpersec") or 0)
+            except ValueError:
+                kbpersec = 0.0
 
             if not slots:
                 return {
                     "downloads": [],
                     "diskspace1": self._format_size_diskspace(disk_space),
                     "diskspacetotal1": self._format_size_diskspace(total_disk_space, "TB"),
+                    "kbpersec": kbpersec,
                 }
 
             downloads = [
@@ -74,10 +101,15 @@ class SABnzbd(commands.Cog):
                 "downloads": downloads,
                 "diskspace1": self._format_size_diskspace(disk_space),
                 "diskspacetotal1": self._format_size_diskspace(total_disk_space, "TB"),
+                "kbpersec": kbpersec,
             }
         except aiohttp.ClientError as e:
             self.logger.error(f"SABnzbd API request failed: {e}")
-            return {"downloads": [], "diskspace1": "Unknown", "diskspacetotal1": "Unknown"}
+            return self._unavailable(str(e))
+
+    def _unavailable(self, error: str) -> Dict[str, Any]:
+        """Empty queue info for a failed request; `error` tells callers it is not real data."""
+        return {"downloads": [], "diskspace1": "Unknown", "diskspacetotal1": "Unknown", "error": error}
 
     def _format_size(self, size: str) -> str:
         """Convert size to human-readable format with appropriate units."""
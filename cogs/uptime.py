@@ -1,9 +1,11 @@
+import discord
 from discord.ext import commands
 import logging
 import os
 from uptime_kuma_api import UptimeKumaApi, UptimeKumaException
 from typing import Tuple, Optional
 from dotenv import load_dotenv
+from utils import tracing
 
 RUNNING_IN_DOCKER = os.getenv("RUNNING_IN_DOCKER", "false").lower() == "true"
 
@@ -11,6 +13,9 @@ if not RUNNING_IN_DOCKER:
     load_dotenv()
 
 class Uptime(commands.Cog):
+    # Only talks to the Uptime Kuma API, so no gateway events are needed
+    required_intents = discord.Intents.none()
+
     def __init__(self, bot: commands.Bot) -> None:
         self.bot = bot
         self.logger = logging.getLogger("jellywatch_bot.uptime")
@@ -28,12 +33,17 @@ class Uptime(commands.Cog):
             self.logger.info("UPTIME_MONITOR_ID not set, uptime monitoring will be disabled")
             self.monitor_id = None
 
+    @property
+    def enabled(self) -> bool:
+        return all([self.api_url, self.username, self.password, self.monitor_id])
+
+    @tracing.traced("uptime.get_uptime_data")
     def get_uptime_data(self) -> Tuple[
         Optional[float], Optional[float], Optional[float],
         Optional[float], Optional[float], Optional[float], Optional[str]
     ]:
         """Fetch uptime statistics from Uptime Kuma for specified monitor."""
-        if not all([self.api_url, self.username, self.password, self.monitor_id]):
+        if not self.enabled:
             self.logger.debug("Uptime monitoring is disabled due to missing configuration")
             return None, None, None, None, None, None, None
         try:
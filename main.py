@@ -2,11 +2,19 @@ import discord
 from discord.ext import commands
 import os
 import logging
-from logging.handlers import TimedRotatingFileHandler
 from dotenv import load_dotenv
 import asyncio
+import importlib
 import platform
-from typing import List
+from typing import List, Optional
+from utils.auth import is_authorized
+from utils.command_sync import COMMAND_HASH_FILE, command_tree_hash, load_synced_hash, save_synced_hash
+from utils.config_watcher import WATCHER as config_watcher
+from utils.logging_config import DEFAULT_LOGGING_CONFIG, apply_log_levels, load_logging_config, setup_logging
+from utils.metrics import MetricsServer, install_discord_rate_limit_counter
+from utils.supervisor import SUPERVISORS
+from utils.tracing import TRACER
+from utils.watchdog import LoopWatchdog
 
 # Configure event loop policy for Windows compatibility
 if platform.system() == "Windows":
@@ -18,61 +26,113 @@ if not RUNNING_IN_DOCKER:
     load_dotenv() # Load environment variables from .env file
     
 TOKEN = os.getenv("DISCORD_TOKEN")
-if not TOKEN:
-    raise ValueError("DISCORD_TOKEN must be set in .env file")
-AUTHORIZED_USERS: List[int] = [
-    int(user_id) for user_id in os.getenv("DISCORD_AUTHORIZED_USERS", "").split(",") if user_id
-]
 
-# Setup logging with rotation
+# Optional Prometheus-style metrics endpoint (disabled unless METRICS_PORT is set)
+METRICS_PORT: Optional[int] = int(os.getenv("METRICS_PORT")) if os.getenv("METRICS_PORT") else None
+METRICS_HOST = os.getenv("METRICS_HOST", "0.0.0.0")
+
+# Optional tracing: spans are written as JSON lines and/or sent to an OTLP/HTTP collector
+TRACE_FILE = os.getenv("TRACE_FILE")
+OTLP_ENDPOINT = os.getenv("OTLP_ENDPOINT")
+
+# Lean mode: request only the gateway intents the loaded cogs declare and skip member/message caches
+LEAN_MODE = os.getenv("LEAN_MODE", "false").lower() == "true"
+
+# Event loop watchdog: stalls longer than the threshold are logged with a stack sample
+WATCHDOG_THRESHOLD = float(os.getenv("WATCHDOG_THRESHOLD", "0.5"))
+ASYNCIO_DEBUG = os.getenv("ASYNCIO_DEBUG", "false").lower() == "true"
+
 LOG_DIR = "logs"
-os.makedirs(LOG_DIR, exist_ok=True)
+CONFIG_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "config.json")
 bot_logger = logging.getLogger("jellywatch_bot")
-bot_logger.setLevel(logging.DEBUG)
 
-formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+class JellyWatchBot(commands.Bot):
+    async def setup_hook(self) -> None:
+        """Run once per process before connecting to the gateway: start services, load cogs, sync commands."""
+        watchdog.start(debug_slow_callbacks=ASYNCIO_DEBUG)
+        config_watcher.start()
+        if metrics_server:
+            await metrics_server.start()
+        await load_cogs()
+        check_cog_intents()
+        await sync_if_changed()
 
-if RUNNING_IN_DOCKER:
-    console_handler = logging.StreamHandler()
-    console_handler.setFormatter(formatter)
-    bot_logger.addHandler(console_handler)
-else:
-    file_handler = TimedRotatingFileHandler(
-        filename=os.path.join(LOG_DIR, "jellywatch_debug.log"),
-        when="midnight",
-        interval=1,
-        backupCount=7,
-        encoding="utf-8",
-    )
-    file_handler.setFormatter(formatter)
-    bot_logger.addHandler(file_handler)
+def cog_names() -> List[str]:
+    """Extension names of the Python files in the 'cogs' directory."""
+    return sorted(f[:-3] for f in os.listdir("./cogs") if f.endswith(".py") and not f.startswith("__"))
+
+def required_intents() -> discord.Intents:
+    """Union of the `required_intents` declared by the cog classes in 'cogs', read before the bot is built.
+
+    A cog module that fails to import is skipped here; loading it reports the error.
+    """
+    intents = discord.Intents.none()
+    for name in cog_names():
+        try:
+            module = importlib.import_module(f"cogs.{name}")
+        except Exception:
+            continue
+        for cog_class in vars(module).values():
+            if isinstance(cog_class, type) and issubclass(cog_class, commands.Cog) and cog_class.__module__ == module.__name__:
+                declared = getattr(cog_class, "required_intents", None)
+                if declared is not None:
+                    intents.value |= declared.value
+    return intents
 
 # Initialize bot with intents and command prefix
-intents = discord.Intents.all()
-bot = commands.Bot(command_prefix="!", intents=intents)
+if LEAN_MODE:
+    # Only the intents the cogs declare, and the caches and chunking those intents need
+    intents = required_intents()
+    bot = JellyWatchBot(
+        command_prefix="!",
+        intents=intents,
+        max_messages=None,
+        member_cache_flags=discord.MemberCacheFlags.from_intents(intents) if intents.members else discord.MemberCacheFlags.none(),
+        chunk_guilds_at_startup=intents.members,
+    )
+else:
+    intents = discord.Intents.all()
+    bot = JellyWatchBot(command_prefix="!", intents=intents)
 tree = bot.tree
+metrics_server: Optional[MetricsServer] = MetricsServer(METRICS_HOST, METRICS_PORT) if METRICS_PORT else None
+watchdog = LoopWatchdog(threshold=WATCHDOG_THRESHOLD)
 
-def is_authorized(interaction: discord.Interaction) -> bool:
-    """Check if the user is authorized to execute privileged commands."""
-    return interaction.user.id in AUTHORIZED_USERS
+async def load_cog(name: str) -> None:
+    """Load a single cog, logging instead of raising on failure."""
+    try:
+        await bot.load_extension(f"cogs.{name}")
+        bot_logger.info(f"Loaded cog: {name}")
+    except commands.ExtensionError as e:
+        bot_logger.error(f"Failed to load cog {name}: {e}")
 
 async def load_cogs() -> None:
-    """Load all Python files in the 'cogs' directory as bot extensions."""
-    for filename in os.listdir("./cogs"):
-        if filename.endswith(".py") and not filename.startswith("__"):
-            try:
-                await bot.load_extension(f"cogs.{filename[:-3]}")
-                bot_logger.info(f"Loaded cog: {filename[:-3]}")
-            except commands.ExtensionError as e:
-                bot_logger.error(f"Failed to load cog {filename[:-3]}: {e}")
-
-async def sync_with_retry() -> None:
+    """Load all Python files in the 'cogs' directory as bot extensions concurrently.
+
+    Cogs are independent of each other and only register themselves in `setup`, so their
+    setup coroutines can overlap.
+    """
+    await asyncio.gather(*(load_cog(name) for name in cog_names()))
+
+def check_cog_intents() -> None:
+    """Log the intents in use, and warn about any that a loaded cog declares but the bot was built without."""
+    if LEAN_MODE:
+        enabled = [name for name, value in bot.intents if value]
+        bot_logger.info(f"Lean mode: requesting intents {enabled or ['none']}, chunking {'on' if bot.intents.members else 'off'}")
+    missing = set()
+    for cog in bot.cogs.values():
+        declared = getattr(cog, "required_intents", None)
+        if declared is not None:
+            missing.update(name for name, value in declared if value and not getattr(bot.intents, name))
+    if missing:
+        bot_logger.warning(f"Loaded cogs declare intents that are not enabled: {sorted(missing)}")
+
+async def sync_with_retry() -> bool:
     """Sync command tree with exponential backoff retry logic."""
     for attempt in range(3):
         try:
             await tree.sync()
             bot_logger.info("Command tree synced")
-            return
+            return True
         except discord.RateLimited as e:
             bot_logger.warning(f"Rate limited during sync, waiting {e.retry_after}s (attempt {attempt + 1}/3)")
             await asyncio.sleep(e.retry_after)
@@ -81,13 +141,21 @@ async def sync_with_retry() -> None:
             if attempt < 2:
                 await asyncio.sleep(2 ** attempt)
     bot_logger.error("Failed to sync command tree after 3 attempts")
+    return False
+
+async def sync_if_changed() -> None:
+    """Sync the command tree only when its signatures differ from the last successful sync."""
+    current_hash = command_tree_hash(tree)
+    if current_hash == load_synced_hash(COMMAND_HASH_FILE):
+        bot_logger.info("Command tree unchanged since last sync, skipping sync")
+        return
+    if await sync_with_retry():
+        save_synced_hash(COMMAND_HASH_FILE, current_hash)
 
 @bot.event
 async def on_ready() -> None:
-    """Handle bot startup: log readiness, load cogs, and sync command tree."""
+    """Log readiness; this also fires after gateway reconnects, so no setup happens here."""
     bot_logger.info(f"Bot is online as {bot.user.name}")
-    await load_cogs()
-    await sync_with_retry()
 
 @tree.command(name="load", description="Load a specific cog")
 async def load(interaction: discord.Interaction, cog: str) -> None:
@@ -134,10 +202,65 @@ async def reload(interaction: discord.Interaction, cog: str) -> None:
         await interaction.followup.send(f"❌ Error reloading cog `{cog}`: `{e}`")
         bot_logger.error(f"Error reloading cog {cog}: {e}")
 
+@tree.command(name="health", description="Show event loop lag and gateway latency")
+async def health(interaction: discord.Interaction) -> None:
+    """Display event loop lag percentiles and stall counts if the user is authorized."""
+    if not is_authorized(interaction):
+        await interaction.response.send_message("❌ You are not authorized to execute this command.", ephemeral=True)
+        return
+    stats = watchdog.stats()
+    healthy = stats["p99"] < WATCHDOG_THRESHOLD
+    embed = discord.Embed(
+        title="Bot Health",
+        color=discord.Color.green() if healthy else discord.Color.orange(),
+    )
+    embed.add_field(
+        name="Event Loop Lag",
+        value=(
+            f"```css\np50: {stats['p50'] * 1000:.1f} ms\n"
+            f"p99: {stats['p99'] * 1000:.1f} ms\n"
+            f"max: {stats['max'] * 1000:.1f} ms\n```"
+        ),
+        inline=False,
+    )
+    embed.add_field(
+        name="Stalls",
+        value=f"{int(stats['stalls'])} over {WATCHDOG_THRESHOLD:.2f}s",
+        inline=True,
+    )
+    embed.add_field(name="Gateway Latency", value=f"{bot.latency * 1000:.0f} ms", inline=True)
+    await interaction.response.send_message(embed=embed, ephemeral=True)
+
+@tree.command(name="tasks", description="Show the status of the cogs' background loops")
+async def task_status(interaction: discord.Interaction) -> None:
+    """Display each supervised loop's state, last run, restarts and last error if the user is authorized."""
+    if not is_authorized(interaction):
+        await interaction.response.send_message("❌ You are not authorized to execute this command.", ephemeral=True)
+        return
+    icons = {"running": "🟢", "restarting": "🟡", "stopped": "⚪", "failed": "🔴"}
+    embed = discord.Embed(title="Background Tasks", color=discord.Color.blue())
+    for cog_name, supervisor in sorted(SUPERVISORS.items()):
+        for loop in supervisor.status():
+            lines = [
+                f"Last run: {loop['last_run']:%H:%M:%S}" + (f" ({loop['last_duration']:.2f}s)" if loop["last_duration"] is not None else "")
+                if loop["last_run"] else "Last run: never",
+                f"Next run: {discord.utils.format_dt(loop['next_run'], 'R')}" if loop["status"] == "running" and loop["next_run"] else None,
+                f"Restarts: {loop['restarts']}",
+                f"Last error ({loop['last_error_at']:%Y-%m-%d %H:%M:%S}): `{loop['last_error'][:200]}`" if loop["last_error"] else None,
+            ]
+            embed.add_field(
+                name=f"{icons.get(loop['status'], '❔')} {cog_name}.{loop['name']} - {loop['status']}",
+                value="\n".join(line for line in lines if line),
+                inline=False,
+            )
+    if not embed.fields:
+        embed.description = "No supervised background tasks are running."
+    await interaction.response.send_message(embed=embed, ephemeral=True)
+
 @tree.command(name="cogs", description="List all available cogs")
 async def list_cogs(interaction: discord.Interaction) -> None:
     """Display a list of available and loaded cogs in an embed."""
-    cogs_list = [f[:-3] for f in os.listdir("./cogs") if f.endswith(".py") and not f.startswith("__")]
+    cogs_list = cog_names()
     loaded_cogs = [ext.split(".")[-1] for ext in bot.extensions.keys()]
 
     embed = discord.Embed(title="Cog Manager - Overview", color=discord.Color.blue())
@@ -147,7 +270,20 @@ async def list_cogs(interaction: discord.Interaction) -> None:
 
     await interaction.response.send_message(embed=embed, ephemeral=True)
 
+def configure_process() -> None:
+    """Process-wide setup for running the bot; kept out of import time so importing main has no side effects."""
+    if not TOKEN:
+        raise ValueError("DISCORD_TOKEN must be set in .env file")
+    # Records are queued and written by a listener thread, levels come from config.json
+    setup_logging(load_logging_config(CONFIG_FILE), log_dir=LOG_DIR, to_console=RUNNING_IN_DOCKER)
+    # Log levels follow config.json edits; a changed format or directory still needs a restart
+    config_watcher.subscribe(CONFIG_FILE, lambda config: apply_log_levels({**DEFAULT_LOGGING_CONFIG, **config.get("logging", {})}))
+    TRACER.configure(jsonl_path=TRACE_FILE, otlp_endpoint=OTLP_ENDPOINT)
+    # discord.py handles 429s internally and only logs them, so count them from its logger
+    install_discord_rate_limit_counter()
+
 if __name__ == "__main__":
+    configure_process()
     try:
         bot.run(TOKEN)
     except discord.LoginFailure as e:
@@ -0,0 +1,59 @@
+import asyncio
+import shutil
+
+import pytest
+
+from benchmarks.common import isolate_state, make_bot
+
+
+@pytest.fixture
+def make_jellyfin_core():
+    """Build JellyfinCore cogs on a scratch copy of data/ that is removed after the test."""
+    from cogs.jellyfin_core import JellyfinCore
+
+    data_dir = JellyfinCore.DATA_DIR
+    state_dir = isolate_state()
+    yield lambda: JellyfinCore(make_bot())
+    JellyfinCore.DATA_DIR = data_dir
+    shutil.rmtree(state_dir, ignore_errors=True)
+
+
+@pytest.fixture
+def run_against(make_jellyfin_core):
+    """Run `scenario(cog, server, fake)` with the cog's only server pointed at the started `fake`."""
+    from cogs.jellyfin_core import JellyfinServer
+
+    def run(fake, scenario, timeout=10):
+        async def main():
+            await fake.start()
+            cog = make_jellyfin_core()
+            server = JellyfinServer("test", fake.url, [1], api_key="test")
+            cog.servers = [server]
+            try:
+                return await asyncio.wait_for(scenario(cog, server, fake), timeout)
+            finally:
+                await cog.update_queue.close()
+                await cog._close_session()
+                await fake.stop()
+
+        return asyncio.run(main())
+
+    return run
+
+
+@pytest.fixture
+def restart(make_jellyfin_core):
+    """Give a server state with `prepare`, persist it with one cog's `save` and return the server a new cog's `load` restored."""
+    from cogs.jellyfin_core import JellyfinServer
+
+    def run(prepare, save, load):
+        cog = make_jellyfin_core()
+        cog.servers = [JellyfinServer("test", "http://127.0.0.1:9", [1], api_key="test")]
+        prepare(cog.servers[0])
+        save(cog)
+        restarted = make_jellyfin_core()
+        restarted.servers = [JellyfinServer("test", "http://127.0.0.1:9", [1], api_key="test")]
+        load(restarted)
+        return restarted.servers[0]
+
+    return run
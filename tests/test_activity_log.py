@@ -0,0 +1,108 @@
+from datetime import datetime, timedelta, timezone
+
+from benchmarks.fakes import FakeFeed, StubChannel
+from cogs.jellyfin_core import JellyfinCore
+from utils.activity_log import ActivityFilter
+
+START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def new_log() -> FakeFeed:
+    return FakeFeed(
+        "/System/ActivityLog/Entries",
+        sort_field="Id",
+        date_field="Date",
+        min_date_param="minDate",
+        start_param="startIndex",
+        limit_param="limit",
+    )
+
+
+def log(activity: FakeFeed, seconds: int, entry_type: str = "SessionStarted", severity: str = "Information") -> None:
+    entry_id = len(activity.entries) + 1
+    activity.entries.append({
+        "Id": entry_id,
+        "Name": f"{entry_type} {entry_id}",
+        "Type": entry_type,
+        "Severity": severity,
+        "Date": (START + timedelta(seconds=seconds)).strftime("%Y-%m-%dT%H:%M:%S.0000000Z"),
+    })
+
+
+def test_first_poll_only_records_the_newest_entry_as_watermark(run_against):
+    async def scenario(cog, server, activity):
+        log(activity, 0)
+        log(activity, 10)
+        return await cog._fetch_activity(server)
+
+    entries, watermark, overflowed = run_against(new_log(), scenario)
+    assert entries == []
+    assert watermark == (START + timedelta(seconds=10), 2)
+    assert not overflowed
+
+
+def test_later_polls_return_new_entries_including_ones_sharing_the_watermark_date(run_against):
+    async def scenario(cog, server, activity):
+        log(activity, 0)
+        log(activity, 10)
+        server.activity_watermark = (await cog._fetch_activity(server))[1]
+        log(activity, 10)  # same second as the watermark, later ID
+        log(activity, 20)
+        first = await cog._fetch_activity(server)
+        server.activity_watermark = first[1]
+        return first, await cog._fetch_activity(server)
+
+    (entries, watermark, _), (again, unchanged, _) = run_against(new_log(), scenario)
+    assert [entry["Id"] for entry in entries] == [3, 4]
+    assert watermark == (START + timedelta(seconds=20), 4)
+    assert again == []
+    assert unchanged == watermark
+
+
+def test_forbidden_log_stops_polling(run_against):
+    async def scenario(cog, server, activity):
+        activity.status = 403
+        return await cog._fetch_activity(server), server.activity_polling
+
+    result, polling = run_against(new_log(), scenario)
+    assert result is None
+    assert not polling
+
+
+def test_filtered_entries_still_move_the_watermark(run_against):
+    channel = StubChannel()
+
+    async def scenario(cog, server, activity):
+        cog.config["activity_log"] = {"exclude_types": ["SessionStarted"]}
+        log(activity, 0)
+        server.activity_watermark = (await cog._fetch_activity(server))[1]
+        log(activity, 5)
+        await cog._post_activity(server, channel)
+        filtered = server.activity_watermark
+        log(activity, 6, "UserLockedOut", "Warning")
+        await cog._post_activity(server, channel)
+        return filtered, server.activity_watermark
+
+    filtered, posted = run_against(new_log(), scenario)
+    assert filtered == (START + timedelta(seconds=5), 2)
+    assert posted == (START + timedelta(seconds=6), 3)
+    assert channel.sends == 1
+    assert "UserLockedOut 3" in channel.last_embed.description
+
+
+def test_watermarks_survive_a_restart(restart):
+    server = restart(
+        lambda server: setattr(server, "activity_watermark", (START, 42)),
+        JellyfinCore._save_activity_watermarks,
+        JellyfinCore._load_activity_watermarks,
+    )
+    assert server.activity_watermark == (START, 42)
+
+
+def test_filter_by_type_and_severity():
+    activity_filter = ActivityFilter({"types": ["SessionStarted", "UserLockedOut"], "min_severity": "Warning"})
+    assert activity_filter.matches({"Type": "UserLockedOut", "Severity": "Error"})
+    assert not activity_filter.matches({"Type": "UserLockedOut", "Severity": "Information"})
+    assert not activity_filter.matches({"Type": "PluginUpdated", "Severity": "Error"})
+    assert ActivityFilter({}).matches({"Type": "PluginUpdated"})
+    assert not ActivityFilter({"exclude_types": ["PluginUpdated"]}).matches({"Type": "PluginUpdated"})
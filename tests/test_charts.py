@@ -0,0 +1,127 @@
+import asyncio
+import io
+import math
+
+from PIL import Image
+
+from utils.charts import LEVELS, NO_DATA, ChartCache, TimeSeries, chart_row, fingerprint
+
+RED = (255, 0, 0)
+FIRST = "https://cdn.example/1/chart-streams.png"
+SECOND = "https://cdn.example/2/chart-streams.png"
+
+
+def run(coro):
+    return asyncio.run(asyncio.wait_for(coro, 30))
+
+
+def rows(*values):
+    """One chart row of `values` sampled ten seconds apart into a four-bucket series."""
+    series = TimeSeries(span=40, buckets=4)
+    for index, value in enumerate(values):
+        series.record(value, at=index * 10)
+    return [chart_row("Streams", series.snapshot(at=30), RED, lambda peak: f"{peak:.0f}")]
+
+
+def test_time_series_keeps_the_highest_sample_per_bucket_and_clears_old_ones():
+    series = TimeSeries(span=40, buckets=4)
+    series.record(3, at=0)
+    series.record(5, at=5)
+    series.record(2, at=9)
+    series.record(7, at=20)
+    snapshot = series.snapshot(at=20)
+    assert math.isnan(snapshot[0]) and snapshot[1] == 5 and math.isnan(snapshot[2]) and snapshot[3] == 7
+    later = series.snapshot(at=45)  # two buckets on, the one holding 5 fell out of the window
+    assert later[1] == 7 and all(math.isnan(value) for value in (later[0], later[2], later[3]))
+    assert all(math.isnan(value) for value in series.snapshot(at=200))
+
+
+def test_rows_are_quantized_so_invisible_changes_keep_the_fingerprint():
+    label, heights, _ = rows(1, 2, 4, 8)[0]
+    assert label == "Streams - peak 8"
+    assert heights[-1] == LEVELS
+    assert fingerprint(rows(1, 2, 4, 8)) == fingerprint(rows(1, 2, 4.01, 8))
+    assert fingerprint(rows(1, 2, 4, 8)) != fingerprint(rows(1, 2, 6, 8))
+    empty = TimeSeries(span=40, buckets=4)
+    assert chart_row("Empty", empty.snapshot(at=0), RED, str)[1] == bytes([NO_DATA] * 4)
+
+
+class Discord:
+    """Records upload attempts, uploads and the deletes of old uploads; fails uploads while `failing` is set."""
+
+    def __init__(self):
+        self.attempts = 0
+        self.uploads = []
+        self.deleted = []
+        self.failing = False
+
+    async def upload(self, filename, png):
+        self.attempts += 1
+        if self.failing:
+            raise ConnectionError("Discord is down")
+        self.uploads.append(png)
+        number = len(self.uploads)
+
+        async def delete():
+            self.deleted.append(number)
+
+        return f"https://cdn.example/{number}/{filename}", delete
+
+
+async def settle(cache):
+    """Wait for the charts being rendered and uploaded."""
+    await asyncio.gather(*cache._inflight.values())
+
+
+def test_chart_cache_renders_once_per_change_and_deletes_replaced_uploads():
+    discord = Discord()
+
+    async def scenario():
+        cache = ChartCache(discord.upload)
+        try:
+            seen = [cache.get("streams", rows(1, 2, 4, 8))]  # rendering in the worker
+            await settle(cache)
+            seen.append(cache.get("streams", rows(1, 2, 4, 8)))
+            seen.append(cache.get("streams", rows(1, 2, 4.01, 8)))  # same pixels
+            seen.append(cache.get("streams", rows(1, 2, 6, 8)))  # the old chart while the new one renders
+            await settle(cache)
+            seen.append(cache.get("streams", rows(1, 2, 6, 8)))
+            deleted_after_second = list(discord.deleted)
+            cache.get("streams", rows(8, 4, 2, 1))
+            await settle(cache)
+            return seen, deleted_after_second
+        finally:
+            await cache.close()
+
+    seen, deleted_after_second = run(scenario())
+    assert seen == [None, FIRST, FIRST, FIRST, SECOND]
+    assert len(discord.uploads) == 3
+    with Image.open(io.BytesIO(discord.uploads[0])) as image:
+        assert image.format == "PNG"
+    assert deleted_after_second == []  # the first chart may still be shown until the next dashboard edit
+    assert discord.deleted == [1]
+
+
+def test_failed_chart_is_retried_only_when_its_data_changes():
+    discord = Discord()
+    discord.failing = True
+
+    async def scenario():
+        cache = ChartCache(discord.upload)
+        try:
+            cache.get("streams", rows(1, 2, 4, 8))
+            await settle(cache)
+            discord.failing = False
+            unchanged = cache.get("streams", rows(1, 2, 4, 8))
+            await settle(cache)
+            attempts_unchanged = discord.attempts
+            cache.get("streams", rows(1, 2, 6, 8))
+            await settle(cache)
+            return unchanged, attempts_unchanged, cache.get("streams", rows(1, 2, 6, 8))
+        finally:
+            await cache.close()
+
+    unchanged, attempts_unchanged, url = run(scenario())
+    assert unchanged is None
+    assert attempts_unchanged == 1
+    assert url == FIRST
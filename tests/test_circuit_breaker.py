@@ -0,0 +1,96 @@
+from utils.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_breaker(**kwargs):
+    clock = Clock()
+    breaker = CircuitBreaker("test", clock=clock, **kwargs)
+    transitions = []
+    breaker.add_listener(lambda old, new: transitions.append((old, new)))
+    return breaker, clock, transitions
+
+
+def test_opens_after_threshold_consecutive_failures():
+    breaker, _, transitions = make_breaker(failure_threshold=3)
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CLOSED and breaker.allow()
+    breaker.record_success()  # resets the count
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert transitions == [(CLOSED, OPEN)]
+
+
+def test_open_circuit_rejects_until_retry_at_then_lets_one_probe_through():
+    breaker, clock, _ = make_breaker(reset_timeout=15.0)
+    breaker.record_failure()
+    assert not breaker.allow()
+    assert breaker.seconds_until_probe() == 15.0
+    clock.now += 14.9
+    assert not breaker.allow()
+    clock.now += 0.1
+    assert breaker.allow()
+    assert breaker.state == HALF_OPEN
+    assert not breaker.allow()  # only the probe goes through
+
+
+def test_successful_probe_closes_the_circuit():
+    breaker, clock, transitions = make_breaker(reset_timeout=15.0)
+    breaker.record_failure()
+    clock.now += 15.0
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.closed
+    assert breaker.opened_at is None
+    assert transitions == [(CLOSED, OPEN), (OPEN, HALF_OPEN), (HALF_OPEN, CLOSED)]
+
+
+def test_failed_probe_reopens_with_backed_off_interval_up_to_the_maximum():
+    breaker, clock, transitions = make_breaker(reset_timeout=15.0, backoff=2.0, max_reset_timeout=50.0)
+    breaker.record_failure()
+    opened_at = breaker.opened_at
+    for expected in (30.0, 50.0, 50.0):
+        clock.now = breaker.retry_at
+        assert breaker.allow()
+        breaker.record_failure()
+        assert breaker.state == OPEN
+        assert breaker.seconds_until_probe() == expected
+    assert breaker.opened_at == opened_at  # still the same outage
+    assert transitions[-2:] == [(OPEN, HALF_OPEN), (HALF_OPEN, OPEN)]
+
+
+def test_interval_resets_after_recovery():
+    breaker, clock, _ = make_breaker(reset_timeout=15.0)
+    breaker.record_failure()
+    clock.now = breaker.retry_at
+    breaker.allow()
+    breaker.record_failure()  # interval now 30s
+    clock.now = breaker.retry_at
+    breaker.allow()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.seconds_until_probe() == 15.0
+
+
+def test_failing_listener_does_not_stop_the_transition():
+    breaker = CircuitBreaker("test", clock=Clock())
+    transitions = []
+
+    def broken(old, new):
+        raise RuntimeError("boom")
+
+    breaker.add_listener(broken)
+    breaker.add_listener(lambda old, new: transitions.append((old, new)))
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert transitions == [(CLOSED, OPEN)]
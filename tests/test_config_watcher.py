@@ -0,0 +1,53 @@
+import pytest
+
+from utils.config_watcher import parse_config, parse_user_mapping
+
+
+def test_rejects_a_config_that_is_not_an_object():
+    with pytest.raises(ValueError):
+        parse_config([])
+
+
+@pytest.mark.parametrize("block, value", [
+    ("servers", {}),
+    ("dashboard", []),
+    ("search", "on"),
+    ("recently_added", []),
+    ("activity_log", 1),
+])
+def test_rejects_a_block_of_the_wrong_type(block, value):
+    with pytest.raises(ValueError, match=block):
+        parse_config({block: value})
+
+
+def test_rejects_sections_that_are_not_an_object():
+    with pytest.raises(ValueError, match="jellyfin_sections.sections"):
+        parse_config({"jellyfin_sections": {"sections": []}})
+
+
+def test_normalizes_boolean_flags_to_integers():
+    config = parse_config({
+        "jellyfin_sections": {
+            "show_all": True,
+            "sections": {"Movies": {"show_episodes": False}, "Shows": {"display_name": "Shows"}},
+        },
+        "search": {"max_results": 25},
+    })
+    sections = config["jellyfin_sections"]
+    assert sections["show_all"] == 1 and type(sections["show_all"]) is int
+    assert sections["sections"]["Movies"]["show_episodes"] == 0
+    assert type(sections["sections"]["Movies"]["show_episodes"]) is int
+    assert "show_episodes" not in sections["sections"]["Shows"]
+    assert config["search"] == {"max_results": 25}
+
+
+def test_accepts_a_minimal_config():
+    assert parse_config({}) == {}
+
+
+def test_user_mapping_must_map_names_to_strings():
+    assert parse_user_mapping({"alice": "Alice"}) == {"alice": "Alice"}
+    with pytest.raises(ValueError):
+        parse_user_mapping({"alice": 1})
+    with pytest.raises(ValueError):
+        parse_user_mapping(["alice"])
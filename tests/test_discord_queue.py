@@ -0,0 +1,97 @@
+import asyncio
+
+import discord
+
+from utils.discord_queue import DiscordUpdateQueue
+
+
+def run(coro):
+    return asyncio.run(asyncio.wait_for(coro, 5))
+
+
+def test_waiting_update_is_superseded_by_newer_one():
+    async def scenario():
+        queue = DiscordUpdateQueue()
+        release = asyncio.Event()
+        sent = []
+
+        async def send(value, blocker=None):
+            if blocker is not None:
+                await blocker.wait()
+            sent.append(value)
+            return value
+
+        first = queue.submit("dashboard", "channel:1", lambda: send("first", release))
+        await asyncio.sleep(0)  # the worker picks up the first update and blocks in it
+        second = queue.submit("dashboard", "channel:1", lambda: send("second"))
+        third = queue.submit("dashboard", "channel:1", lambda: send("third"))
+        release.set()
+        results = await asyncio.gather(first, second, third)
+        await queue.close()
+        return sent, results
+
+    sent, results = run(scenario())
+    assert sent == ["first", "third"]
+    assert results == ["first", "third", "third"]
+
+
+def test_updates_for_different_keys_are_all_sent_in_order():
+    async def scenario():
+        queue = DiscordUpdateQueue()
+        sent = []
+
+        async def send(value):
+            sent.append(value)
+            return value
+
+        futures = [queue.submit(key, "channel:1", lambda key=key: send(key)) for key in ("a", "b", "c")]
+        await asyncio.gather(*futures)
+        await queue.close()
+        return sent
+
+    assert run(scenario()) == ["a", "b", "c"]
+
+
+def test_failed_update_hands_its_callers_to_a_newer_one():
+    async def scenario():
+        queue = DiscordUpdateQueue()
+        failing = asyncio.Event()
+
+        async def fail():
+            failing.set()
+            await asyncio.sleep(0.05)
+            raise discord.RateLimited(0.01)
+
+        async def succeed():
+            return "newer"
+
+        first = queue.submit("presence", "presence", fail)
+        await failing.wait()
+        second = queue.submit("presence", "presence", succeed)
+        results = await asyncio.gather(first, second)
+        await queue.close()
+        return results
+
+    assert run(scenario()) == ["newer", "newer"]
+
+
+def test_close_cancels_waiting_and_in_flight_updates():
+    async def scenario():
+        queue = DiscordUpdateQueue()
+        started = asyncio.Event()
+
+        async def hang():
+            started.set()
+            await asyncio.Event().wait()
+
+        in_flight = queue.submit("a", "channel:1", hang)
+        await started.wait()
+        waiting = queue.submit("b", "channel:1", hang)
+        await queue.close()
+        after_close = queue.submit("c", "channel:1", hang)
+        return in_flight, waiting, after_close
+
+    in_flight, waiting, after_close = run(scenario())
+    assert in_flight.cancelled()
+    assert waiting.cancelled()
+    assert after_close.cancelled()
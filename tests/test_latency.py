@@ -0,0 +1,112 @@
+import asyncio
+
+import aiohttp
+import pytest
+
+from utils.latency import MIN_SAMPLES, WINDOW, LatencyTracker, hedged
+
+CEILING = aiohttp.ClientTimeout(total=30, connect=10)
+
+
+def run(coro):
+    return asyncio.run(asyncio.wait_for(coro, 5))
+
+
+def test_timeout_is_the_ceiling_until_enough_samples():
+    tracker = LatencyTracker()
+    for _ in range(MIN_SAMPLES - 1):
+        tracker.endpoint("/Sessions").observe(0.1)
+    assert tracker.timeout("/Sessions", CEILING).total == 30
+    assert tracker.hedge_delay("/Sessions") is None
+
+
+def test_timeout_is_p99_times_multiplier_clamped_to_floor_and_ceiling():
+    tracker = LatencyTracker(multiplier=3.0, floor=2.0)
+    for _ in range(MIN_SAMPLES):
+        tracker.endpoint("fast").observe(0.1)
+        tracker.endpoint("medium").observe(4.0)
+        tracker.endpoint("slow").observe(20.0)
+    assert tracker.timeout("fast", CEILING).total == 2.0
+    assert tracker.timeout("medium", CEILING).total == 12.0
+    assert tracker.timeout("medium", CEILING).connect == 10
+    assert tracker.timeout("slow", CEILING).total == 30
+
+
+def test_window_forgets_old_latencies():
+    tracker = LatencyTracker(multiplier=1.0, floor=0.0)
+    for _ in range(WINDOW):
+        tracker.endpoint("/Items").observe(10.0)
+    for _ in range(WINDOW):
+        tracker.endpoint("/Items").observe(1.0)
+    assert tracker.timeout("/Items", CEILING).total == 1.0
+
+
+def test_hedged_without_delay_runs_one_attempt():
+    calls = []
+
+    async def attempt():
+        calls.append(1)
+        return "ok"
+
+    assert run(hedged(attempt, None, "test")) == "ok"
+    assert calls == [1]
+
+
+def test_hedged_returns_the_first_attempt_when_it_is_fast():
+    calls = []
+
+    async def attempt():
+        calls.append(1)
+        return len(calls)
+
+    assert run(hedged(attempt, 0.5, "test")) == 1
+    assert calls == [1]
+
+
+def test_hedge_wins_when_the_first_attempt_hangs():
+    started = []
+    cancelled = []
+
+    async def attempt():
+        started.append(len(started))
+        if len(started) == 1:
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+        return f"attempt {len(started)}"
+
+    async def scenario():
+        result = await hedged(attempt, 0.01, "test")
+        await asyncio.sleep(0)  # let the cancelled first attempt unwind
+        return result
+
+    assert run(scenario()) == "attempt 2"
+    assert cancelled == [True]
+
+
+def test_hedged_falls_back_to_the_attempt_that_succeeds():
+    started = []
+
+    async def attempt():
+        started.append(1)
+        if len(started) == 1:
+            await asyncio.sleep(0.05)
+            return "first"
+        raise aiohttp.ClientConnectionError("hedge failed")
+
+    assert run(hedged(attempt, 0.01, "test")) == "first"
+
+
+def test_hedged_raises_when_both_attempts_fail():
+    started = []
+
+    async def attempt():
+        started.append(1)
+        await asyncio.sleep(0.02 if len(started) == 1 else 0)
+        raise aiohttp.ClientConnectionError(f"attempt {len(started)} failed")
+
+    with pytest.raises(aiohttp.ClientConnectionError):
+        run(hedged(attempt, 0.01, "test"))
+    assert len(started) == 2
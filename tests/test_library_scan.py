@@ -0,0 +1,80 @@
+from benchmarks.fakes import FakeJellyfin
+
+MOVIES = "0" * 32  # library 0 of the fake holds movies
+
+
+def jellyfin() -> FakeJellyfin:
+    return FakeJellyfin(libraries=1, items_per_library=100, sessions=0)
+
+
+async def movies(cog, server) -> int:
+    return (await cog.get_library_stats(server))[MOVIES]["count"]
+
+
+def start_scan(fake: FakeJellyfin, progress: float) -> None:
+    fake.scan_state, fake.scan_progress = "Running", progress
+
+
+def finish_scan(fake: FakeJellyfin, end: str) -> None:
+    fake.scan_state, fake.scan_progress, fake.scan_end = "Idle", None, end
+
+
+def test_counts_are_deferred_while_a_scan_runs_and_recounted_when_it_finishes(run_against):
+    async def scenario(cog, server, fake):
+        await cog._poll_library_scan(server)
+        before = await movies(cog, server)
+
+        start_scan(fake, 40.0)
+        fake.items_per_library = 150
+        server.last_library_update = None  # the cache would otherwise expire now
+        await cog._poll_library_scan(server)
+        counts = fake.requests["/Items"]
+        during = await movies(cog, server)
+        deferred_requests = fake.requests["/Items"] - counts
+        progress = server.scan_progress
+
+        finish_scan(fake, "2026-01-01T09:00:00.0000000Z")
+        await cog._poll_library_scan(server)
+        after = await movies(cog, server)
+        return before, during, deferred_requests, progress, after, server.scan_progress
+
+    before, during, deferred_requests, progress, after, final_progress = run_against(jellyfin(), scenario)
+    assert (before, during, deferred_requests) == (100, 100, 0)
+    assert progress == 40.0
+    assert after == 150
+    assert final_progress is None
+
+
+def test_scan_that_ran_between_polls_triggers_a_recount(run_against):
+    async def scenario(cog, server, fake):
+        finish_scan(fake, "2026-01-01T08:00:00.0000000Z")
+        await cog._poll_library_scan(server)
+        before = await movies(cog, server)
+        fake.items_per_library = 120
+        unchanged = await movies(cog, server)  # still within the cache lifetime
+
+        finish_scan(fake, "2026-01-01T09:00:00.0000000Z")
+        await cog._poll_library_scan(server)
+        return before, unchanged, await movies(cog, server)
+
+    assert run_against(jellyfin(), scenario) == (100, 100, 120)
+
+
+def test_scan_task_is_read_directly_once_found(run_against):
+    async def scenario(cog, server, fake):
+        for _ in range(3):
+            await cog._poll_library_scan(server)
+        return fake.requests["/ScheduledTasks"], fake.requests[f"/ScheduledTasks/{'e' * 32}"]
+
+    assert run_against(jellyfin(), scenario) == (1, 2)
+
+
+def test_without_an_admin_key_scans_are_not_tracked(run_against):
+    async def scenario(cog, server, fake):
+        fake.tasks_status = 403
+        start_scan(fake, 10.0)
+        await cog._poll_library_scan(server)
+        await cog._poll_library_scan(server)
+        return server.scan_polling, server.scan_progress, fake.requests["/ScheduledTasks"]
+
+    assert run_against(jellyfin(), scenario) == (False, None, 1)
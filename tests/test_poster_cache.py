@@ -0,0 +1,160 @@
+import asyncio
+import io
+import os
+import time
+from types import SimpleNamespace
+
+from PIL import Image
+
+from utils import poster_cache
+from utils.poster_cache import FAILURE_RETRY, URL_REFRESH_MARGIN, PosterCache
+
+
+def run(coro):
+    return asyncio.run(asyncio.wait_for(coro, 5))
+
+
+def poster_bytes(width=600, height=900) -> bytes:
+    out = io.BytesIO()
+    Image.new("RGB", (width, height), (200, 30, 30)).save(out, "JPEG")
+    return out.getvalue()
+
+
+class Jellyfin:
+    """Counts poster downloads; fails them while `failing` is set."""
+
+    def __init__(self, delay=0.0):
+        self.fetches = 0
+        self.delay = delay
+        self.failing = False
+
+    async def fetch(self):
+        self.fetches += 1
+        await asyncio.sleep(self.delay)
+        if self.failing:
+            raise ConnectionError("Jellyfin is down")
+        return poster_bytes()
+
+
+class Discord:
+    """Records uploads and hands out CDN URLs signed to expire after `lifetime` seconds."""
+
+    def __init__(self, lifetime=86400):
+        self.uploads = []
+        self.lifetime = lifetime
+
+    async def upload(self, filename, data):
+        self.uploads.append((filename, data))
+        return f"https://cdn.example/{len(self.uploads)}/{filename}?ex={int(time.time() + self.lifetime):x}"
+
+
+def test_poster_is_fetched_shrunk_and_uploaded_once(tmp_path):
+    jellyfin, discord = Jellyfin(), Discord()
+
+    async def scenario():
+        cache = PosterCache(str(tmp_path), discord.upload, size=300)
+        first = await cache.url("item1", "tag1", jellyfin.fetch, timeout=5)
+        second = await cache.url("item1", "tag1", jellyfin.fetch, timeout=5)
+        await cache.close()
+        return first, second
+
+    first, second = run(scenario())
+    assert first == second
+    assert (jellyfin.fetches, len(discord.uploads)) == (1, 1)
+    with Image.open(io.BytesIO(discord.uploads[0][1])) as image:
+        assert max(image.size) == 300
+    assert os.path.exists(tmp_path / "item1-tag1.jpg")
+
+
+def test_concurrent_lookups_share_one_load(tmp_path):
+    jellyfin, discord = Jellyfin(delay=0.05), Discord()
+
+    async def scenario():
+        cache = PosterCache(str(tmp_path), discord.upload)
+        urls = await asyncio.gather(*(cache.url("item1", "tag1", jellyfin.fetch, timeout=5) for _ in range(5)))
+        await cache.close()
+        return urls
+
+    urls = run(scenario())
+    assert len(set(urls)) == 1 and urls[0] is not None
+    assert (jellyfin.fetches, len(discord.uploads)) == (1, 1)
+
+
+def test_failed_poster_is_not_retried_until_its_retry_time(tmp_path, monkeypatch):
+    jellyfin, discord = Jellyfin(), Discord()
+    jellyfin.failing = True
+    now = [time.time()]
+    monkeypatch.setattr(poster_cache, "time", SimpleNamespace(time=lambda: now[0]))
+
+    async def scenario():
+        cache = PosterCache(str(tmp_path), discord.upload)
+        results = [await cache.url("item1", "tag1", jellyfin.fetch, timeout=5)]
+        results.append(await cache.url("item1", "tag1", jellyfin.fetch, timeout=5))
+        fetches_while_failed = jellyfin.fetches
+        jellyfin.failing = False
+        now[0] += FAILURE_RETRY + 1
+        results.append(await cache.url("item1", "tag1", jellyfin.fetch, timeout=5))
+        await cache.close()
+        return results, fetches_while_failed
+
+    results, fetches_while_failed = run(scenario())
+    assert results[:2] == [None, None]
+    assert fetches_while_failed == 1
+    assert results[2] is not None
+
+
+def test_failed_keys_are_bounded(tmp_path, monkeypatch):
+    monkeypatch.setattr(poster_cache, "MAX_FAILED", 5)
+    jellyfin, discord = Jellyfin(), Discord()
+    jellyfin.failing = True
+
+    async def scenario():
+        cache = PosterCache(str(tmp_path), discord.upload)
+        for index in range(12):
+            await cache.url(f"item{index}", "tag", jellyfin.fetch, timeout=5)
+        await cache.close()
+        return cache._failed
+
+    failed = run(scenario())
+    assert len(failed) == 5
+    assert list(failed) == [f"item{index}-tag" for index in range(7, 12)]  # newest failures kept
+
+
+def test_restart_reuses_the_uploaded_url_and_reuploads_expiring_ones_from_disk(tmp_path):
+    jellyfin, discord = Jellyfin(), Discord()
+    short_lived = Discord(lifetime=URL_REFRESH_MARGIN // 2)
+
+    async def scenario():
+        cache = PosterCache(str(tmp_path), discord.upload)
+        url = await cache.url("item1", "tag1", jellyfin.fetch, timeout=5)
+        cache.upload = short_lived.upload
+        await cache.url("item2", "tag2", jellyfin.fetch, timeout=5)  # signed to expire within the margin
+        await cache.close()
+
+        restarted = PosterCache(str(tmp_path), discord.upload)
+        reused = restarted.cached_url("item1", "tag1")
+        refreshed = await restarted.url("item2", "tag2", jellyfin.fetch, timeout=5)
+        await restarted.close()
+        return url, reused, refreshed
+
+    url, reused, refreshed = run(scenario())
+    assert reused == url
+    assert refreshed is not None
+    assert [filename for filename, _ in discord.uploads] == ["item1-tag1.jpg", "item2-tag2.jpg"]
+    assert jellyfin.fetches == 2  # the re-upload read the thumbnail from disk
+
+
+def test_least_recently_used_posters_are_evicted_with_their_files(tmp_path):
+    jellyfin, discord = Jellyfin(), Discord()
+
+    async def scenario():
+        cache = PosterCache(str(tmp_path), discord.upload, max_entries=2)
+        await cache.url("item1", "tag", jellyfin.fetch, timeout=5)
+        await cache.url("item2", "tag", jellyfin.fetch, timeout=5)
+        cache.cached_url("item1", "tag")  # item2 is now the least recently used
+        await cache.url("item3", "tag", jellyfin.fetch, timeout=5)
+        await cache.close()
+        return [cache.cached_url(f"item{index}", "tag") is not None for index in (1, 2, 3)]
+
+    assert run(scenario()) == [True, False, True]
+    assert sorted(name for name in os.listdir(tmp_path) if name.endswith(".jpg")) == ["item1-tag.jpg", "item3-tag.jpg"]
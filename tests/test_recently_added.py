@@ -0,0 +1,86 @@
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from benchmarks.fakes import FakeFeed
+from cogs.jellyfin_core import RECENTLY_ADDED_PAGE, JellyfinCore
+
+LIBRARY = "a" * 32
+START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def new_library() -> FakeFeed:
+    return FakeFeed("/Items", sort_field="DateCreated", date_field="DateLastSaved", min_date_param="MinDateLastSaved")
+
+
+def add(library: FakeFeed, minutes: int, saved_minutes: Optional[int] = None) -> None:
+    created = START + timedelta(minutes=minutes)
+    saved = START + timedelta(minutes=minutes if saved_minutes is None else saved_minutes)
+    library.entries.append({
+        "Id": f"{len(library.entries):032x}",
+        "Name": f"Movie {minutes}",
+        "Type": "Movie",
+        "DateCreated": created.strftime("%Y-%m-%dT%H:%M:%S.0000000Z"),
+        "DateLastSaved": saved.strftime("%Y-%m-%dT%H:%M:%S.0000000Z"),
+    })
+
+
+def test_first_poll_only_records_the_newest_item_as_watermark(run_against):
+    async def scenario(cog, server, library):
+        add(library, 1)
+        add(library, 5)
+        return await cog._fetch_new_items(server, LIBRARY)
+
+    items, watermark = run_against(new_library(), scenario)
+    assert items == []
+    assert watermark == START + timedelta(minutes=5)
+
+
+def test_later_polls_return_only_newer_items_oldest_first(run_against):
+    async def scenario(cog, server, library):
+        add(library, 1)
+        server.added_watermarks[LIBRARY] = (await cog._fetch_new_items(server, LIBRARY))[1]
+        add(library, 3)
+        add(library, 2)
+        add(library, 0, saved_minutes=4)  # old item whose metadata was refreshed
+        first = await cog._fetch_new_items(server, LIBRARY)
+        server.added_watermarks[LIBRARY] = first[1]
+        return first, await cog._fetch_new_items(server, LIBRARY)
+
+    (items, watermark), (again, unchanged) = run_against(new_library(), scenario)
+    assert [item["Name"] for item in items] == ["Movie 2", "Movie 3"]
+    assert watermark == START + timedelta(minutes=3)
+    assert again == []
+    assert unchanged == watermark
+
+
+def test_new_items_are_paged(run_against):
+    async def scenario(cog, server, library):
+        server.added_watermarks[LIBRARY] = START
+        for minute in range(1, RECENTLY_ADDED_PAGE + 6):
+            add(library, minute)
+        return await cog._fetch_new_items(server, LIBRARY)
+
+    items, watermark = run_against(new_library(), scenario)
+    assert len(items) == RECENTLY_ADDED_PAGE + 5
+    assert items[0]["Name"] == "Movie 1"
+    assert watermark == START + timedelta(minutes=RECENTLY_ADDED_PAGE + 5)
+
+
+def test_open_circuit_skips_the_poll(run_against):
+    async def scenario(cog, server, library):
+        server.added_watermarks[LIBRARY] = START
+        add(library, 1)
+        server.breaker.record_failure()
+        return await cog._fetch_new_items(server, LIBRARY), library.request_count()
+
+    (items, watermark), requests = run_against(new_library(), scenario)
+    assert (items, watermark, requests) == ([], None, 0)
+
+
+def test_watermarks_survive_a_restart(restart):
+    server = restart(
+        lambda server: server.added_watermarks.update({LIBRARY: START + timedelta(minutes=7)}),
+        JellyfinCore._save_watermarks,
+        JellyfinCore._load_watermarks,
+    )
+    assert server.added_watermarks == {LIBRARY: START + timedelta(minutes=7)}
@@ -0,0 +1,86 @@
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+from benchmarks.fakes import FakeJellyfin
+from cogs.jellyfin_core import START_TIME_RECHECK
+
+STARTED = datetime(2026, 1, 1, 8, 0, tzinfo=timezone.utc)
+INFO = {"Version": "10.9.11"}
+
+
+def task(name: str, triggers: List[str], minutes: int) -> dict:
+    return {
+        "Name": name,
+        "Triggers": [{"Type": trigger} for trigger in triggers],
+        "LastExecutionResult": {
+            "StartTimeUtc": (STARTED + timedelta(minutes=minutes)).strftime("%Y-%m-%dT%H:%M:%S.0000000Z"),
+        },
+    }
+
+
+def stock_tasks(manual_run: int = 180, interval_run: int = 300) -> List[dict]:
+    """Startup-only tasks a minute or two after STARTED, one of them run again by hand later."""
+    return [
+        task("Clean Cache Directory", ["StartupTrigger"], manual_run),
+        task("Clean Transcode Directory", ["StartupTrigger"], 1),
+        task("Migrate Trickplay Image Location", ["StartupTrigger"], 2),
+        task("Update Plugins", ["StartupTrigger", "IntervalTrigger"], interval_run),
+        task("Clean Log Directory", ["StartupTrigger", "DailyTrigger"], interval_run + 5),
+    ]
+
+
+def jellyfin_with(tasks: List[dict]) -> FakeJellyfin:
+    fake = FakeJellyfin(libraries=0, sessions=0)
+    fake.tasks = tasks
+    return fake
+
+
+def test_start_time_ignores_mixed_trigger_tasks_and_manual_runs(run_against):
+    async def scenario(cog, server, fake):
+        return await cog._fetch_start_time(server)
+
+    assert run_against(jellyfin_with(stock_tasks()), scenario) == STARTED + timedelta(minutes=1)
+
+
+def test_later_task_runs_never_move_the_start_time_on_a_recheck(run_against):
+    async def scenario(cog, server, fake):
+        await cog._track_start_time(server, INFO)
+        first = server.start_time
+        # Hours later the interval tasks ran again and another startup task was run by hand
+        fake.tasks = stock_tasks(manual_run=180, interval_run=600)
+        fake.tasks[1] = task("Clean Transcode Directory", ["StartupTrigger"], 590)
+        server.start_time_checked -= timedelta(seconds=START_TIME_RECHECK)
+        await cog._track_start_time(server, INFO)
+        return first, server.start_time
+
+    first, rechecked = run_against(jellyfin_with(stock_tasks()), scenario)
+    assert first == STARTED + timedelta(minutes=1)
+    assert rechecked == first
+
+
+def test_restart_without_a_signal_is_not_picked_up_by_a_recheck(run_against):
+    async def scenario(cog, server, fake):
+        await cog._track_start_time(server, INFO)
+        fake.tasks = [task(entry["Name"], ["StartupTrigger"], 600) for entry in stock_tasks()[:3]]
+        server.start_time_checked -= timedelta(seconds=START_TIME_RECHECK)
+        await cog._track_start_time(server, INFO)
+        return server.start_time
+
+    assert run_against(jellyfin_with(stock_tasks()), scenario) == STARTED + timedelta(minutes=1)
+
+
+def test_outage_or_version_change_moves_the_start_time_forward(run_against):
+    async def scenario(cog, server, fake):
+        await cog._track_start_time(server, INFO)
+        fake.tasks = [task(entry["Name"], ["StartupTrigger"], 600) for entry in stock_tasks()[:3]]
+        server.breaker.record_failure()
+        server.breaker.record_success()
+        await cog._track_start_time(server, INFO)
+        after_outage = server.start_time
+        fake.tasks = [task(entry["Name"], ["StartupTrigger"], 900) for entry in stock_tasks()[:3]]
+        await cog._track_start_time(server, {"Version": "10.10.0"})
+        return after_outage, server.start_time
+
+    after_outage, after_upgrade = run_against(jellyfin_with(stock_tasks()), scenario)
+    assert after_outage == STARTED + timedelta(minutes=600)
+    assert after_upgrade == STARTED + timedelta(minutes=900)
@@ -0,0 +1,50 @@
+"""Filters and labels for Jellyfin activity log entries, configured in the `activity_log` block of config.json."""
+from typing import Any, Dict
+
+# Jellyfin log levels in increasing severity
+SEVERITIES = ["Trace", "Debug", "Information", "Warning", "Error", "Critical"]
+
+ACTIVITY_EMOJIS = {
+    "AuthenticationSucceeded": "🔑",
+    "AuthenticationFailed": "⛔",
+    "SessionStarted": "🟢",
+    "SessionEnded": "⚪",
+    "VideoPlayback": "▶️",
+    "VideoPlaybackStopped": "⏹️",
+    "AudioPlayback": "🎵",
+    "AudioPlaybackStopped": "⏹️",
+    "UserCreated": "👤",
+    "UserDeleted": "👤",
+    "UserPasswordChanged": "🔒",
+    "UserLockedOut": "🔒",
+    "PluginInstalled": "🧩",
+    "PluginUninstalled": "🧩",
+    "PluginUpdated": "🧩",
+}
+SEVERITY_EMOJIS = {"Warning": "⚠️", "Error": "❌", "Critical": "❌"}
+
+
+class ActivityFilter:
+    """Decides which activity log entries are posted.
+
+    `types` lists the entry types to post (all if empty), `exclude_types` the ones never
+    to post, and entries below `min_severity` are dropped. Filtered entries still move the
+    watermark, so they are never fetched again.
+    """
+
+    def __init__(self, config: Dict[str, Any]) -> None:
+        self.types = set(config.get("types") or [])
+        self.exclude_types = set(config.get("exclude_types") or [])
+        severity = config.get("min_severity", "Information")
+        self.min_severity = SEVERITIES.index(severity) if severity in SEVERITIES else SEVERITIES.index("Information")
+
+    def matches(self, entry: Dict[str, Any]) -> bool:
+        entry_type = entry.get("Type", "")
+        if entry_type in self.exclude_types or (self.types and entry_type not in self.types):
+            return False
+        severity = entry.get("Severity", "Information")
+        return SEVERITIES.index(severity) >= self.min_severity if severity in SEVERITIES else True
+
+
+def activity_emoji(entry: Dict[str, Any]) -> str:
+    return ACTIVITY_EMOJIS.get(entry.get("Type", ""), SEVERITY_EMOJIS.get(entry.get("Severity", ""), "ℹ️"))
@@ -0,0 +1,15 @@
+"""Who may run the privileged commands; shared by main.py and the cogs without importing main."""
+import os
+from typing import List
+
+import discord
+
+
+def authorized_users() -> List[int]:
+    """User IDs from DISCORD_AUTHORIZED_USERS, read on every call so it works before .env is loaded."""
+    return [int(user_id) for user_id in os.getenv("DISCORD_AUTHORIZED_USERS", "").split(",") if user_id]
+
+
+def is_authorized(interaction: discord.Interaction) -> bool:
+    """Check if the user is authorized to execute privileged commands."""
+    return interaction.user.id in authorized_users()
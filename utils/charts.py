@@ -0,0 +1,198 @@
+"""Sparkline charts of dashboard history, rendered in a worker process and re-rendered only when they change."""
+import array
+import asyncio
+import hashlib
+import io
+import logging
+import math
+import multiprocessing
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from PIL import Image, ImageDraw
+
+from utils import metrics
+from utils.poster_cache import URL_REFRESH_MARGIN, url_expiry
+
+CHART_LOOKUPS = metrics.REGISTRY.counter(
+    "jellywatch_chart_lookups_total",
+    "Dashboard chart lookups by result (cached, rendered, reuploaded or failed).",
+    ["result"],
+)
+
+Delete = Callable[[], Awaitable[None]]
+Upload = Callable[[str, bytes], Awaitable[Tuple[str, Delete]]]  # (filename, PNG bytes) -> (CDN URL, deletes the upload)
+Color = Tuple[int, int, int]
+ChartRow = Tuple[str, bytes, Color]  # (label, bar heights, bar color)
+
+WIDTH = 432  # 3 pixels per bucket of the default 144-bucket window
+LABEL_HEIGHT = 14
+ROW_HEIGHT = 40
+LEVELS = ROW_HEIGHT - 2  # distinct bar heights; values are quantized to these before fingerprinting
+NO_DATA = 255  # bar height marking a bucket without samples
+BACKGROUND = (47, 49, 54)
+LABEL_COLOR = (220, 221, 222)
+BASELINE_COLOR = (79, 84, 92)
+
+
+class TimeSeries:
+    """The last `span` seconds of samples in a fixed array of `buckets` floats.
+
+    Each bucket keeps the highest sample recorded in it and NaN if there was none, so a
+    day of one-minute samples costs about a kilobyte and old samples never need pruning.
+    """
+
+    def __init__(self, span: float = 86400, buckets: int = 144) -> None:
+        self.span = span
+        self.buckets = buckets
+        self.bucket_seconds = span / buckets
+        self._values = array.array("d", [math.nan]) * buckets
+        self._newest: Optional[int] = None  # absolute number of the newest bucket
+
+    def record(self, value: float, at: Optional[float] = None) -> None:
+        bucket = self._advance(at)
+        slot = bucket % self.buckets
+        current = self._values[slot]
+        self._values[slot] = value if math.isnan(current) else max(current, value)
+
+    def snapshot(self, at: Optional[float] = None) -> array.array:
+        """The buckets oldest first, ending with the one containing `at` (default now)."""
+        start = (self._advance(at) + 1) % self.buckets
+        return self._values[start:] + self._values[:start]
+
+    def _advance(self, at: Optional[float]) -> int:
+        """Clear the buckets that fell out of the window since the newest one; returns the current bucket."""
+        bucket = int((time.time() if at is None else at) // self.bucket_seconds)
+        if self._newest is None or bucket - self._newest >= self.buckets:
+            self._values = array.array("d", [math.nan]) * self.buckets
+        elif bucket > self._newest:
+            for stale in range(self._newest + 1, bucket + 1):
+                self._values[stale % self.buckets] = math.nan
+        else:
+            return self._newest  # same bucket, or the clock went backwards
+        self._newest = bucket
+        return bucket
+
+
+def chart_row(label: str, values: array.array, color: Color, format_peak: Callable[[float], str]) -> ChartRow:
+    """Quantize a series to bar heights scaled to its peak, which is appended to the label."""
+    peak = max((value for value in values if not math.isnan(value)), default=0.0)
+    heights = bytes(
+        NO_DATA if math.isnan(value) else (round(value / peak * LEVELS) if peak > 0 else 0)
+        for value in values
+    )
+    return f"{label} - peak {format_peak(peak)}", heights, color
+
+
+def render_chart(rows: List[ChartRow]) -> bytes:
+    """Draw one bar sparkline per row into a PNG. Runs in a worker process, so it must stay picklable."""
+    image = Image.new("RGB", (WIDTH, len(rows) * (LABEL_HEIGHT + ROW_HEIGHT)), BACKGROUND)
+    draw = ImageDraw.Draw(image)
+    for index, (label, heights, color) in enumerate(rows):
+        top = index * (LABEL_HEIGHT + ROW_HEIGHT)
+        baseline = top + LABEL_HEIGHT + ROW_HEIGHT - 1
+        draw.text((4, top + 1), label, fill=LABEL_COLOR)
+        draw.line([(0, baseline), (WIDTH - 1, baseline)], fill=BASELINE_COLOR)
+        bar_width = WIDTH / len(heights)
+        for column, height in enumerate(heights):
+            if height == NO_DATA or height == 0:
+                continue
+            left = round(column * bar_width)
+            draw.rectangle([left, baseline - height, max(round((column + 1) * bar_width) - 1, left), baseline], fill=color)
+    out = io.BytesIO()
+    image.save(out, "PNG", optimize=True)
+    return out.getvalue()
+
+
+def fingerprint(rows: List[ChartRow]) -> str:
+    digest = hashlib.sha1()
+    for label, heights, color in rows:
+        digest.update(label.encode())
+        digest.update(heights)
+        digest.update(bytes(color))
+    return digest.hexdigest()
+
+
+class ChartCache:
+    """The latest chart per key, rendered in a worker process and uploaded once.
+
+    Rows are fingerprinted after quantization, so new samples that would not change a
+    single pixel reuse the uploaded image. A changed chart renders and uploads in the
+    background; until it is ready the previous chart keeps being shown. A chart whose
+    render or upload failed is not retried until its data changes.
+
+    Each upload replaces the previous one, which may still be shown until the next
+    dashboard edit, so it is deleted one upload later: at most two charts exist per key.
+    """
+
+    def __init__(self, upload: Upload) -> None:
+        self.upload = upload
+        self.logger = logging.getLogger("jellywatch_bot.charts")
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._charts: Dict[str, Tuple[str, bytes, str, Delete]] = {}  # key -> (fingerprint, PNG, CDN URL, delete)
+        self._retired: Dict[str, Delete] = {}  # key -> deletes the chart shown before the current one
+        self._failed: Dict[str, str] = {}  # key -> fingerprint that failed
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+    def get(self, key: str, rows: List[ChartRow]) -> Optional[str]:
+        """URL of the chart for `rows`, or of the previous chart while the new one is being made."""
+        current_fingerprint = fingerprint(rows)
+        current = self._charts.get(key)
+        url = current[2] if current is not None and self._usable(current[2]) else None
+        if current is not None and current[0] == current_fingerprint and url is not None:
+            CHART_LOOKUPS.inc(result="cached")
+            return url
+        task = self._inflight.get(key)
+        if (task is None or task.done()) and self._failed.get(key) != current_fingerprint:
+            # An expired URL with unchanged data only needs the existing PNG uploaded again
+            png = current[1] if current is not None and current[0] == current_fingerprint else None
+            self._inflight[key] = asyncio.create_task(self._make(key, current_fingerprint, rows, png), name=f"chart:{key}")
+        return url
+
+    async def close(self) -> None:
+        for task in self._inflight.values():
+            task.cancel()
+        await asyncio.gather(*self._inflight.values(), return_exceptions=True)
+        self._inflight.clear()
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    @staticmethod
+    def _usable(url: str) -> bool:
+        expires = url_expiry(url)
+        return expires is None or expires - time.time() > URL_REFRESH_MARGIN
+
+    async def _make(self, key: str, chart_fingerprint: str, rows: List[ChartRow], png: Optional[bytes]) -> None:
+        result = "reuploaded" if png is not None else "rendered"
+        try:
+            if png is None:
+                if self._pool is None:
+                    # Forking would copy the locks held by the bot's other threads into the worker
+                    self._pool = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"))
+                png = await asyncio.get_running_loop().run_in_executor(self._pool, render_chart, rows)
+            url, delete = await self.upload(f"chart-{re.sub(r'[^A-Za-z0-9]', '', key)}.png", png)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            if isinstance(e, BrokenProcessPool):
+                self._pool = None  # a new worker is started for the next chart
+            CHART_LOOKUPS.inc(result="failed")
+            self._failed[key] = chart_fingerprint
+            self.logger.warning(f"Could not render the {key} chart: {e}")
+            return
+        CHART_LOOKUPS.inc(result=result)
+        self._failed.pop(key, None)
+        previous = self._charts.get(key)
+        self._charts[key] = (chart_fingerprint, png, url, delete)
+        retired = self._retired.pop(key, None)
+        if previous is not None:
+            self._retired[key] = previous[3]
+        if retired is not None:
+            try:
+                await retired()
+            except Exception as e:
+                self.logger.warning(f"Could not delete an old {key} chart: {e}")
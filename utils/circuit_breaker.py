@@ -0,0 +1,124 @@
+"""Circuit breaker for upstream services, so outages fail fast instead of stacking retries."""
+import logging
+import time
+from typing import Callable, List, Optional
+
+from utils import metrics
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+CIRCUIT_STATE = metrics.REGISTRY.gauge(
+    "jellywatch_circuit_state",
+    "Circuit breaker state per upstream (0 closed, 1 half-open, 2 open).",
+    ["circuit"],
+)
+CIRCUIT_REJECTED = metrics.REGISTRY.counter(
+    "jellywatch_circuit_rejected_total",
+    "Calls failed fast because the circuit was open.",
+    ["circuit"],
+)
+CIRCUIT_TRANSITIONS = metrics.REGISTRY.counter(
+    "jellywatch_circuit_transitions_total",
+    "Circuit breaker state changes by target state.",
+    ["circuit", "state"],
+)
+
+StateListener = Callable[[str, str], None]
+
+
+class CircuitBreaker:
+    """Closed / open / half-open breaker with an exponentially growing probe interval.
+
+    Closed: calls pass and consecutive failures are counted; `failure_threshold` of them
+    open the circuit. Open: `allow()` refuses until `retry_at`, then lets exactly one
+    probe through (half-open). A successful probe closes the circuit, a failed one reopens
+    it with the interval multiplied by `backoff`, up to `max_reset_timeout`.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 1,
+        reset_timeout: float = 15.0,
+        max_reset_timeout: float = 300.0,
+        backoff: float = 2.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self.backoff = backoff
+        self.clock = clock
+        self.logger = logging.getLogger("jellywatch_bot.circuit_breaker")
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.retry_at = 0.0
+        self._current_timeout = reset_timeout
+        self._listeners: List[StateListener] = []
+        CIRCUIT_STATE.set(_STATE_VALUES[CLOSED], circuit=name)
+
+    @property
+    def closed(self) -> bool:
+        return self.state == CLOSED
+
+    def add_listener(self, listener: StateListener) -> None:
+        """Call `listener(old_state, new_state)` on every transition."""
+        self._listeners.append(listener)
+
+    def seconds_until_probe(self) -> float:
+        return max(self.retry_at - self.clock(), 0.0) if self.state == OPEN else 0.0
+
+    def allow(self) -> bool:
+        """Whether a call may go ahead; while open, the first call after `retry_at` becomes the probe."""
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN and self.clock() >= self.retry_at:
+            self._transition(HALF_OPEN)
+            return True
+        CIRCUIT_REJECTED.inc(circuit=self.name)
+        return False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self._current_timeout = self.reset_timeout
+        if self.state != CLOSED:
+            self.opened_at = None
+            self._transition(CLOSED)
+
+    def record_failure(self) -> None:
+        if self.state == HALF_OPEN:
+            self._current_timeout = min(self._current_timeout * self.backoff, self.max_reset_timeout)
+            self._open()
+            return
+        self.failures += 1
+        if self.state == CLOSED and self.failures >= self.failure_threshold:
+            self._open()
+
+    def _open(self) -> None:
+        now = self.clock()
+        if self.opened_at is None:
+            self.opened_at = now
+        self.retry_at = now + self._current_timeout
+        self._transition(OPEN)
+
+    def _transition(self, state: str) -> None:
+        old, self.state = self.state, state
+        if old == state:
+            return
+        CIRCUIT_STATE.set(_STATE_VALUES[state], circuit=self.name)
+        CIRCUIT_TRANSITIONS.inc(circuit=self.name, state=state)
+        if state == OPEN:
+            self.logger.warning(f"Circuit {self.name} opened, next probe in {self._current_timeout:.0f}s")
+        else:
+            self.logger.info(f"Circuit {self.name} {old} -> {state}")
+        for listener in self._listeners:
+            try:
+                listener(old, state)
+            except Exception as e:
+                self.logger.error(f"Circuit listener for {self.name} failed: {e}")
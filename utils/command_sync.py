@@ -0,0 +1,44 @@
+"""Skip redundant application command syncs by remembering a hash of what was last synced."""
+import hashlib
+import json
+import logging
+import os
+from typing import Optional
+
+from discord import app_commands
+
+logger = logging.getLogger("jellywatch_bot.command_sync")
+
+COMMAND_HASH_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "command_tree_hash.json")
+
+
+def command_tree_hash(tree: app_commands.CommandTree) -> str:
+    """Hash the payload Discord would receive for the global command tree."""
+    payload = sorted(
+        (command.to_dict(tree) for command in tree.get_commands()),
+        key=lambda command: (command.get("type", 1), command["name"]),
+    )
+    application_id = tree.client.application_id
+    encoded = json.dumps({"application_id": application_id, "commands": payload}, sort_keys=True, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def load_synced_hash(path: str) -> Optional[str]:
+    """Return the hash stored after the last successful sync, if any."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f).get("hash")
+    except (FileNotFoundError, json.JSONDecodeError, AttributeError) as e:
+        if not isinstance(e, FileNotFoundError):
+            logger.warning(f"Ignoring unreadable command hash file {path}: {e}")
+        return None
+
+
+def save_synced_hash(path: str, tree_hash: str) -> None:
+    """Persist the hash of the command tree that was just synced."""
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"hash": tree_hash}, f)
+    except OSError as e:
+        logger.error(f"Failed to save command hash: {e}")
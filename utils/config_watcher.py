@@ -0,0 +1,189 @@
+"""Watch the JSON files in data/ and publish validated changes to subscribed cogs, without a cog reload."""
+import asyncio
+import json
+import logging
+import os
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from utils import metrics
+
+CONFIG_RELOADS = metrics.REGISTRY.counter(
+    "jellywatch_config_reloads_total",
+    "Changed data files by result (applied, unchanged or invalid).",
+    ["file", "result"],
+)
+
+Parser = Callable[[Any], Any]
+Subscriber = Callable[[Any], None]
+Signature = Optional[Tuple[int, int]]
+
+# Top-level config.json blocks and the type each must have
+_CONFIG_BLOCKS = {
+    "servers": list,
+    "dashboard": dict,
+    "jellyfin_sections": dict,
+    "presence": dict,
+    "cache": dict,
+    "sabnzbd": dict,
+    "logging": dict,
+    "posters": dict,
+    "http": dict,
+    "activity_log": dict,
+    "search": dict,
+    "recently_added": dict,
+}
+
+
+def parse_config(raw: Any) -> Dict[str, Any]:
+    """Validate config.json and normalize its flags to integers; raises ValueError if it is unusable."""
+    if not isinstance(raw, dict):
+        raise ValueError("config.json must contain a JSON object")
+    for key, expected in _CONFIG_BLOCKS.items():
+        if key in raw and not isinstance(raw[key], expected):
+            raise ValueError(f"'{key}' in config.json must be a {expected.__name__}")
+    sections = raw.get("jellyfin_sections", {})
+    if not isinstance(sections.get("sections", {}), dict):
+        raise ValueError("'jellyfin_sections.sections' in config.json must be an object")
+    # Older versions stored these flags as booleans
+    if "show_all" in sections:
+        sections["show_all"] = int(sections["show_all"])
+    for section in sections.get("sections", {}).values():
+        if "show_episodes" in section:
+            section["show_episodes"] = int(section["show_episodes"])
+    return raw
+
+
+def parse_user_mapping(raw: Any) -> Dict[str, str]:
+    """Validate user_mapping.json, a flat object of Jellyfin user name to display name."""
+    if not isinstance(raw, dict) or not all(isinstance(value, str) for value in raw.values()):
+        raise ValueError("user_mapping.json must map user names to display names")
+    return raw
+
+
+PARSERS: Dict[str, Parser] = {
+    "config.json": parse_config,
+    "user_mapping.json": parse_user_mapping,
+}
+
+
+class WatchedFile:
+    """One watched file: its last seen (mtime, size), its last valid parsed value and its subscribers."""
+
+    def __init__(self, path: str, parse: Parser) -> None:
+        self.path = path
+        self.parse = parse
+        self.signature: Signature = None
+        self.value: Any = None
+        self.subscribers: List[Subscriber] = []
+
+
+class ConfigWatcher:
+    """Polls the mtime and size of watched files and re-reads a file only when they change.
+
+    A changed file is parsed and validated once, however many cogs subscribe to it. An
+    invalid edit is logged and ignored, so subscribers keep their last good config. A
+    rewrite with identical content (e.g. a cog saving the config it just loaded) is not
+    published. A stat per file every `interval` seconds is cheap enough that no inotify
+    dependency is needed.
+    """
+
+    def __init__(self, interval: float = 2.0) -> None:
+        self.interval = interval
+        self.logger = logging.getLogger("jellywatch_bot.config")
+        self._files: Dict[str, WatchedFile] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def subscribe(self, path: str, callback: Subscriber) -> Callable[[], None]:
+        """Call `callback(value)` with the parsed file whenever it changes; returns an unsubscribe function."""
+        watched = self._watch(path)
+        watched.subscribers.append(callback)
+
+        def unsubscribe() -> None:
+            if callback in watched.subscribers:
+                watched.subscribers.remove(callback)
+
+        return unsubscribe
+
+    def current(self, path: str) -> Any:
+        """The last valid parsed value of a watched file, or None if it never parsed."""
+        return self._watch(path).value
+
+    def check(self) -> List[str]:
+        """Stat every watched file once and publish the ones that changed; returns their paths."""
+        changed = []
+        for watched in list(self._files.values()):
+            signature = self._signature(watched.path)
+            if signature == watched.signature:
+                continue
+            watched.signature = signature
+            if signature is not None and self._reload(watched):
+                changed.append(watched.path)
+        return changed
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="config-watcher")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                self.check()
+            except Exception as e:
+                self.logger.error(f"Config watcher check failed: {e}", exc_info=True)
+
+    def _watch(self, path: str) -> WatchedFile:
+        path = os.path.abspath(path)
+        watched = self._files.get(path)
+        if watched is None:
+            watched = WatchedFile(path, PARSERS.get(os.path.basename(path), lambda raw: raw))
+            watched.signature = self._signature(path)
+            if watched.signature is not None:
+                watched.value = self._parse(watched)
+            self._files[path] = watched
+        return watched
+
+    @staticmethod
+    def _signature(path: str) -> Signature:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _parse(self, watched: WatchedFile) -> Any:
+        """Read and validate the file; returns None and logs if it is unreadable or invalid."""
+        try:
+            with open(watched.path, "r", encoding="utf-8") as f:
+                return watched.parse(json.load(f))
+        except (OSError, ValueError, TypeError) as e:
+            self.logger.error(f"Ignoring invalid {os.path.basename(watched.path)}, keeping the previous config: {e}")
+            return None
+
+    def _reload(self, watched: WatchedFile) -> bool:
+        name = os.path.basename(watched.path)
+        value = self._parse(watched)
+        if value is None:
+            CONFIG_RELOADS.inc(file=name, result="invalid")
+            return False
+        if value == watched.value:
+            CONFIG_RELOADS.inc(file=name, result="unchanged")
+            return False
+        watched.value = value
+        CONFIG_RELOADS.inc(file=name, result="applied")
+        self.logger.info(f"Reloaded {name}")
+        for callback in list(watched.subscribers):
+            try:
+                callback(value)
+            except Exception as e:
+                self.logger.error(f"Applying {name} failed in {getattr(callback, '__qualname__', callback)}: {e}", exc_info=True)
+        return True
+
+
+WATCHER = ConfigWatcher()
@@ -0,0 +1,214 @@
+"""Outbound Discord update queue: coalesces pending updates per target and paces them per route."""
+import asyncio
+import collections
+import logging
+import time
+from typing import Any, Awaitable, Callable, Deque, Dict, Hashable, List, Optional, Tuple
+
+import discord
+
+from utils import metrics
+
+QUEUE_DEPTH = metrics.REGISTRY.gauge(
+    "jellywatch_discord_queue_depth",
+    "Discord updates waiting to be sent.",
+)
+QUEUE_DROPPED = metrics.REGISTRY.counter(
+    "jellywatch_discord_queue_dropped_total",
+    "Discord updates dropped before sending, by reason (superseded or closed).",
+    ["reason"],
+)
+QUEUE_SENT = metrics.REGISTRY.counter(
+    "jellywatch_discord_queue_sent_total",
+    "Discord updates sent from the queue, by route kind and result.",
+    ["route", "result"],
+)
+QUEUE_WAIT = metrics.REGISTRY.histogram(
+    "jellywatch_discord_queue_wait_seconds",
+    "Time an update spent queued before it was sent.",
+    buckets=(0.01, 0.05, 0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0),
+)
+
+# Requests allowed per period for each route kind. Message edits are limited per channel,
+# presence updates share the gateway's send budget.
+ROUTE_LIMITS: Dict[str, Tuple[int, float]] = {
+    "channel": (5, 5.0),
+    "presence": (5, 60.0),
+}
+DEFAULT_ROUTE_LIMIT: Tuple[int, float] = (5, 5.0)
+
+Send = Callable[[], Awaitable[Any]]
+
+
+class RouteBucket:
+    """Sliding-window limiter for one route, also honouring `retry_after` from 429s."""
+
+    def __init__(self, limit: int, period: float) -> None:
+        self.limit = limit
+        self.period = period
+        self._sent: Deque[float] = collections.deque()
+        self._blocked_until = 0.0
+
+    def delay(self) -> float:
+        """Seconds to wait before the next request fits in the window."""
+        now = time.monotonic()
+        while self._sent and now - self._sent[0] >= self.period:
+            self._sent.popleft()
+        wait = self._blocked_until - now
+        if len(self._sent) >= self.limit:
+            wait = max(wait, self._sent[0] + self.period - now)
+        return max(wait, 0.0)
+
+    async def acquire(self) -> None:
+        while (wait := self.delay()) > 0:
+            await asyncio.sleep(wait)
+        self._sent.append(time.monotonic())
+
+    def block(self, retry_after: float) -> None:
+        self._blocked_until = max(self._blocked_until, time.monotonic() + retry_after)
+
+
+class _Update:
+    __slots__ = ("send", "enqueued", "futures")
+
+    def __init__(self, send: Send) -> None:
+        self.send = send
+        self.enqueued = time.monotonic()
+        self.futures: List[asyncio.Future] = []
+
+
+class DiscordUpdateQueue:
+    """Single outbound path for Discord edits and presence changes.
+
+    Every update has a key naming what it overwrites (a dashboard message, the presence).
+    While an update waits, a newer one with the same key replaces it, so a stale embed is
+    never sent. Each route has a worker that waits for its bucket before sending, so one
+    slow channel does not hold up the others.
+    """
+
+    def __init__(self, max_attempts: int = 3) -> None:
+        self.max_attempts = max_attempts
+        self.logger = logging.getLogger("jellywatch_bot.discord_queue")
+        self._pending: Dict[str, "collections.OrderedDict[Hashable, _Update]"] = {}
+        self._buckets: Dict[str, RouteBucket] = {}
+        self._wakeups: Dict[str, asyncio.Event] = {}
+        self._workers: Dict[str, asyncio.Task] = {}
+        self._closed = False
+
+    @property
+    def depth(self) -> int:
+        return sum(len(pending) for pending in self._pending.values())
+
+    def submit(self, key: Hashable, route: str, send: Send) -> "asyncio.Future[Any]":
+        """Queue `send` as the latest update for `key`; the future resolves with its result.
+
+        If an update for `key` is still waiting, it is dropped and its callers get the
+        result of this one instead.
+        """
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        if self._closed:
+            future.cancel()
+            return future
+        pending = self._pending.setdefault(route, collections.OrderedDict())
+        update = _Update(send)
+        previous = pending.pop(key, None)
+        if previous is not None:
+            update.futures.extend(previous.futures)
+            update.enqueued = previous.enqueued
+            QUEUE_DROPPED.inc(reason="superseded")
+            self.logger.debug("Superseded queued update %s on %s", key, route)
+        update.futures.append(future)
+        pending[key] = update
+        QUEUE_DEPTH.set(self.depth)
+        self._wakeup(route).set()
+        if route not in self._workers or self._workers[route].done():
+            self._workers[route] = asyncio.create_task(self._run(route), name=f"discord-queue:{route}")
+        return future
+
+    async def close(self) -> None:
+        """Stop the workers and cancel everything still waiting."""
+        self._closed = True
+        for task in self._workers.values():
+            task.cancel()
+        await asyncio.gather(*self._workers.values(), return_exceptions=True)
+        self._workers.clear()
+        for pending in self._pending.values():
+            for update in pending.values():
+                QUEUE_DROPPED.inc(reason="closed")
+                for future in update.futures:
+                    future.cancel()
+            pending.clear()
+        QUEUE_DEPTH.set(0)
+
+    def _wakeup(self, route: str) -> asyncio.Event:
+        if route not in self._wakeups:
+            self._wakeups[route] = asyncio.Event()
+        return self._wakeups[route]
+
+    def _bucket(self, route: str) -> RouteBucket:
+        if route not in self._buckets:
+            self._buckets[route] = RouteBucket(*ROUTE_LIMITS.get(route.split(":", 1)[0], DEFAULT_ROUTE_LIMIT))
+        return self._buckets[route]
+
+    async def _run(self, route: str) -> None:
+        pending = self._pending[route]
+        wakeup = self._wakeup(route)
+        bucket = self._bucket(route)
+        while not self._closed:
+            if not pending:
+                wakeup.clear()
+                await wakeup.wait()
+                continue
+            # Wait for budget before choosing what to send, so anything submitted meanwhile supersedes
+            await bucket.acquire()
+            if not pending:
+                continue
+            key, update = pending.popitem(last=False)
+            QUEUE_DEPTH.set(self.depth)
+            try:
+                await self._send(route, key, update, bucket)
+            finally:
+                # Only left unresolved when close() cancelled the send; its callers must not hang
+                for future in update.futures:
+                    if not future.done():
+                        future.cancel()
+
+    async def _send(self, route: str, key: Hashable, update: _Update, bucket: RouteBucket) -> None:
+        kind = route.split(":", 1)[0]
+        QUEUE_WAIT.observe(time.monotonic() - update.enqueued)
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                result = await update.send()
+            except discord.RateLimited as e:
+                bucket.block(e.retry_after)
+                error: Optional[BaseException] = e
+                self.logger.warning(f"Rate limited on {route}, retrying in {e.retry_after:.1f}s")
+            except discord.HTTPException as e:
+                error = e
+                if e.status < 500:
+                    break
+                self.logger.warning(f"HTTP error on {route} (attempt {attempt}/{self.max_attempts}): {e}")
+                await asyncio.sleep(2 ** (attempt - 1))
+            except Exception as e:
+                error = e
+                break
+            else:
+                QUEUE_SENT.inc(route=kind, result="ok")
+                for future in update.futures:
+                    if not future.done():
+                        future.set_result(result)
+                return
+
+            if key in self._pending[route]:
+                # A newer update arrived while this one was failing; hand the callers over to it
+                self._pending[route][key].futures.extend(update.futures)
+                update.futures.clear()
+                QUEUE_DROPPED.inc(reason="superseded")
+                return
+            if attempt < self.max_attempts:
+                await bucket.acquire()
+
+        QUEUE_SENT.inc(route=kind, result="error")
+        for future in update.futures:
+            if not future.done():
+                future.set_exception(error)
@@ -0,0 +1,142 @@
+"""Per-endpoint latency tracking for adaptive request deadlines, and hedged reads."""
+import array
+import asyncio
+import time
+from types import SimpleNamespace
+from typing import Any, Awaitable, Callable, Dict, List, Optional, TypeVar
+
+import aiohttp
+
+from utils import metrics
+
+HTTP_DEADLINE = metrics.REGISTRY.gauge(
+    "jellywatch_http_deadline_seconds",
+    "Timeout currently derived for each endpoint from its observed latency.",
+    ["endpoint"],
+)
+HEDGED_REQUESTS = metrics.REGISTRY.counter(
+    "jellywatch_http_hedged_requests_total",
+    "Reads that sent a second request after the first ran past p95, by which one answered first.",
+    ["endpoint", "winner"],
+)
+
+WINDOW = 256  # latencies kept per endpoint
+MIN_SAMPLES = 20  # below this, the fixed timeout applies and reads are not hedged
+
+T = TypeVar("T")
+
+
+class EndpointLatency:
+    """The last WINDOW latencies of one endpoint in a ring buffer."""
+
+    def __init__(self) -> None:
+        self._samples = array.array("d")
+        self._next = 0
+        self._sorted: Optional[List[float]] = None
+
+    def observe(self, seconds: float) -> None:
+        if len(self._samples) < WINDOW:
+            self._samples.append(seconds)
+        else:
+            self._samples[self._next] = seconds
+            self._next = (self._next + 1) % WINDOW
+        self._sorted = None
+
+    def quantile(self, q: float) -> Optional[float]:
+        """The `q` quantile of the window, or None until MIN_SAMPLES latencies were seen."""
+        if len(self._samples) < MIN_SAMPLES:
+            return None
+        if self._sorted is None:
+            self._sorted = sorted(self._samples)
+        return self._sorted[min(int(q * len(self._sorted)), len(self._sorted) - 1)]
+
+
+class LatencyTracker:
+    """Derives request timeouts from each endpoint's recent latency instead of fixed worst cases.
+
+    The timeout is `multiplier` times the p99 of the endpoint's last 256 responses, clamped
+    between `floor` and the fixed timeout the call used before (its ceiling). A request that
+    times out counts as taking its whole timeout, so an endpoint that really slows down
+    raises its own deadline step by step instead of failing forever.
+    """
+
+    def __init__(self, multiplier: float = 3.0, floor: float = 2.0) -> None:
+        self.multiplier = multiplier
+        self.floor = floor
+        self._endpoints: Dict[str, EndpointLatency] = {}
+
+    def endpoint(self, key: str) -> EndpointLatency:
+        if key not in self._endpoints:
+            self._endpoints[key] = EndpointLatency()
+        return self._endpoints[key]
+
+    def timeout(self, key: str, ceiling: aiohttp.ClientTimeout) -> aiohttp.ClientTimeout:
+        p99 = self.endpoint(key).quantile(0.99)
+        total = ceiling.total if p99 is None else min(max(p99 * self.multiplier, self.floor), ceiling.total)
+        HTTP_DEADLINE.set(total, endpoint=key)
+        return aiohttp.ClientTimeout(total=total, connect=min(ceiling.connect or total, total))
+
+    def hedge_delay(self, key: str) -> Optional[float]:
+        """How long a read waits before a second request is sent: the endpoint's p95."""
+        return self.endpoint(key).quantile(0.95)
+
+    @staticmethod
+    def context(key: str) -> SimpleNamespace:
+        """Pass as `trace_request_ctx` to record a request's latency under `key`."""
+        return SimpleNamespace(latency_key=key)
+
+    def http_trace_config(self) -> aiohttp.TraceConfig:
+        """Trace config that records the time to response headers of requests made with `context()`."""
+        trace_config = aiohttp.TraceConfig()
+
+        async def on_request_start(session: aiohttp.ClientSession, context: Any, params: aiohttp.TraceRequestStartParams) -> None:
+            context.latency_start = time.perf_counter()
+
+        async def on_request_end(session: aiohttp.ClientSession, context: Any, params: aiohttp.TraceRequestEndParams) -> None:
+            self._record(context)
+
+        async def on_request_exception(session: aiohttp.ClientSession, context: Any, params: aiohttp.TraceRequestExceptionParams) -> None:
+            if isinstance(params.exception, asyncio.TimeoutError):
+                self._record(context)
+
+        trace_config.on_request_start.append(on_request_start)
+        trace_config.on_request_end.append(on_request_end)
+        trace_config.on_request_exception.append(on_request_exception)
+        return trace_config
+
+    def _record(self, context: Any) -> None:
+        key = getattr(context.trace_request_ctx, "latency_key", None)
+        start = getattr(context, "latency_start", None)
+        if key is not None and start is not None:
+            self.endpoint(key).observe(time.perf_counter() - start)
+
+
+async def hedged(attempt: Callable[[], Awaitable[T]], delay: Optional[float], label: str) -> T:
+    """Run `attempt`, and if it is still running after `delay` seconds, run it a second time.
+
+    Returns the first successful result and cancels the other request; raises only when
+    both fail. Only use this for idempotent reads. With `delay` None, a single attempt runs.
+    """
+    first = asyncio.ensure_future(attempt())
+    if delay is None:
+        return await first
+    pending = {first}
+    hedge: Optional[asyncio.Future] = None
+    try:
+        done, _ = await asyncio.wait(pending, timeout=delay)
+        if not done:
+            hedge = asyncio.ensure_future(attempt())
+            pending.add(hedge)
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    if hedge is not None:
+                        HEDGED_REQUESTS.inc(endpoint=label, winner="hedge" if task is hedge else "first")
+                    return task.result()
+                error = task.exception()
+        raise error
+    finally:
+        for task in pending:
+            task.cancel()
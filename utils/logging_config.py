@@ -0,0 +1,114 @@
+"""Logging setup: queue-backed handlers, optional JSON output and per-cog levels."""
+import atexit
+import json
+import logging
+import os
+import queue
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, TimedRotatingFileHandler
+from typing import Any, Dict, Optional
+
+ROOT_LOGGER = "jellywatch_bot"
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+DEFAULT_LOGGING_CONFIG: Dict[str, Any] = {
+    "level": "INFO",
+    "format": "text",
+    "cogs": {},
+}
+
+# Attributes every LogRecord has; anything else was passed through `extra=` and is emitted as a field
+_RESERVED_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """Format records as single-line JSON objects, including any `extra` fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload: Dict[str, Any] = {
+            "time": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED_ATTRS and not key.startswith("_"):
+                payload[key] = value
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        if record.stack_info:
+            payload["stack_info"] = self.formatStack(record.stack_info)
+        return json.dumps(payload, default=str, ensure_ascii=False)
+
+
+class _LocalQueueHandler(QueueHandler):
+    """QueueHandler for an in-process listener: resolves the message but keeps exc_info for the formatter."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+def load_logging_config(config_file: str) -> Dict[str, Any]:
+    """Read the `logging` block from config.json, falling back to defaults."""
+    try:
+        with open(config_file, "r", encoding="utf-8") as f:
+            logging_config = json.load(f).get("logging", {})
+    except (FileNotFoundError, json.JSONDecodeError):
+        logging_config = {}
+    return {**DEFAULT_LOGGING_CONFIG, **logging_config}
+
+
+def _level(name: Any, default: int = logging.INFO) -> int:
+    if isinstance(name, int):
+        return name
+    level = logging.getLevelName(str(name).upper())
+    return level if isinstance(level, int) else default
+
+
+def apply_log_levels(logging_config: Dict[str, Any]) -> None:
+    """Apply the bot-wide level and per-cog overrides, e.g. `{"cogs": {"jellyfin": "DEBUG"}}`."""
+    logging.getLogger(ROOT_LOGGER).setLevel(_level(logging_config.get("level", "INFO")))
+    for cog, level in logging_config.get("cogs", {}).items():
+        logging.getLogger(f"{ROOT_LOGGER}.{cog}").setLevel(_level(level))
+
+
+def setup_logging(
+    logging_config: Dict[str, Any],
+    log_dir: str = "logs",
+    to_console: bool = False,
+) -> Optional[QueueListener]:
+    """Route bot logs through a QueueHandler so formatting and disk I/O happen on a listener thread.
+
+    Returns the started listener, or None if logging was already configured.
+    """
+    bot_logger = logging.getLogger(ROOT_LOGGER)
+    apply_log_levels(logging_config)
+    if any(isinstance(handler, QueueHandler) for handler in bot_logger.handlers):
+        return None
+
+    if str(logging_config.get("format", "text")).lower() == "json":
+        formatter: logging.Formatter = JsonFormatter()
+    else:
+        formatter = logging.Formatter(TEXT_FORMAT)
+
+    if to_console:
+        handler: logging.Handler = logging.StreamHandler()
+    else:
+        os.makedirs(log_dir, exist_ok=True)
+        handler = TimedRotatingFileHandler(
+            filename=os.path.join(log_dir, "jellywatch_debug.log"),
+            when="midnight",
+            interval=1,
+            backupCount=7,
+            encoding="utf-8",
+        )
+    handler.setFormatter(formatter)
+
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    bot_logger.addHandler(_LocalQueueHandler(log_queue))
+    listener = QueueListener(log_queue, handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
@@ -0,0 +1,392 @@
+"""Prometheus-style metrics for JellyWatch, built on the standard library and aiohttp only."""
+import asyncio
+import bisect
+import functools
+import logging
+import math
+import re
+import threading
+import time
+from datetime import timedelta
+from urllib.parse import urlsplit
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple, TypeVar
+
+import aiohttp
+from aiohttp import web
+import discord
+from discord.ext import tasks
+
+F = TypeVar("F", bound=Callable[..., Awaitable[Any]])
+
+DEFAULT_BUCKETS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    """Escape a label value for the text exposition format."""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    """Render a label set as `{a="1",b="2"}`, or an empty string when there are no labels."""
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    """Render a sample value the way Prometheus expects it."""
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    """Base class holding the name, help text and label names of a metric."""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples())
+        return lines
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonically increasing counter."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def get(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}" for key, value in items]
+
+
+class Gauge(_Metric):
+    """Value that can go up and down."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def get(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}" for key, value in items]
+
+
+class Histogram(_Metric):
+    """Cumulative histogram with fixed upper bounds."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [bucket counts..., +Inf count], sum
+        self._values: Dict[LabelValues, Tuple[List[int], float]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self._values.get(key, ([0] * (len(self.buckets) + 1), 0.0))
+            counts[index] += 1
+            self._values[key] = (counts, total + value)
+
+    def count(self, **labels: str) -> int:
+        counts, _ = self._values.get(self._key(labels), ([0], 0.0))
+        return sum(counts)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = [(key, (list(counts), total)) for key, (counts, total) in self._values.items()]
+        lines = []
+        for key, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                labels = _format_labels(self.labelnames, key, ("le", _format_value(bound)))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Collection of metrics rendered together on the /metrics endpoint."""
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> Any:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                if type(existing) is not type(metric) or existing.labelnames != metric.labelnames:
+                    raise ValueError(f"Metric {metric.name} already registered with a different shape")
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        """Render every registered metric in the Prometheus text exposition format."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+OPERATION_DURATION = REGISTRY.histogram(
+    "jellywatch_operation_duration_seconds",
+    "Duration of instrumented bot operations.",
+    ["operation"],
+)
+OPERATION_ERRORS = REGISTRY.counter(
+    "jellywatch_operation_errors_total",
+    "Instrumented bot operations that raised an exception.",
+    ["operation"],
+)
+HTTP_REQUESTS = REGISTRY.counter(
+    "jellywatch_http_requests_total",
+    "Outbound HTTP requests by service, endpoint and status.",
+    ["service", "method", "endpoint", "status"],
+)
+HTTP_DURATION = REGISTRY.histogram(
+    "jellywatch_http_request_duration_seconds",
+    "Outbound HTTP request latency by service and endpoint.",
+    ["service", "endpoint"],
+)
+CACHE_REQUESTS = REGISTRY.counter(
+    "jellywatch_cache_requests_total",
+    "Cache lookups by cache name and result (hit or miss).",
+    ["cache", "result"],
+)
+CACHE_HIT_RATIO = REGISTRY.gauge(
+    "jellywatch_cache_hit_ratio",
+    "Fraction of cache lookups served from the cache since startup.",
+    ["cache"],
+)
+LOOP_LAG = REGISTRY.histogram(
+    "jellywatch_task_loop_lag_seconds",
+    "Delay between the scheduled and actual start of a background loop iteration.",
+    ["loop"],
+)
+DISCORD_RATE_LIMITS = REGISTRY.counter(
+    "jellywatch_discord_rate_limited_total",
+    "HTTP 429 responses received from the Discord API.",
+    ["method", "route"],
+)
+JELLYFIN_CONNECT_RETRIES = REGISTRY.counter(
+    "jellywatch_jellyfin_connect_retries_total",
+    "Retries performed by the Jellyfin connection check.",
+)
+
+# Collapse ids in URL paths so the endpoint label stays low-cardinality
+_ID_SEGMENT = re.compile(r"/(?:[0-9a-fA-F]{32}|[0-9a-fA-F-]{36}|\d+)(?=/|$)")
+
+
+def normalize_endpoint(path: str) -> str:
+    """Replace item, user and snowflake ids in a URL path with a placeholder."""
+    return _ID_SEGMENT.sub("/{id}", path) or "/"
+
+
+def timed(operation: str) -> Callable[[F], F]:
+    """Decorate a coroutine function so its duration and failures are recorded."""
+    def decorator(func: F) -> F:
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            start = time.perf_counter()
+            try:
+                return await func(*args, **kwargs)
+            except Exception:
+                OPERATION_ERRORS.inc(operation=operation)
+                raise
+            finally:
+                OPERATION_DURATION.observe(time.perf_counter() - start, operation=operation)
+        return wrapper  # type: ignore[return-value]
+    return decorator
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    """Record a cache lookup and refresh the hit ratio gauge."""
+    CACHE_REQUESTS.inc(cache=cache, result="hit" if hit else "miss")
+    hits = CACHE_REQUESTS.get(cache=cache, result="hit")
+    total = hits + CACHE_REQUESTS.get(cache=cache, result="miss")
+    CACHE_HIT_RATIO.set(hits / total if total else 0.0, cache=cache)
+
+
+def observe_loop_lag(name: str, loop: "tasks.Loop[Any]") -> None:
+    """Record how late the current iteration of a `tasks.loop` started; call it first thing in the loop body."""
+    next_iteration = loop.next_iteration
+    if next_iteration is None:
+        return
+    interval = timedelta(seconds=loop.seconds or 0, minutes=loop.minutes or 0, hours=loop.hours or 0)
+    scheduled = next_iteration - interval
+    LOOP_LAG.observe(max((discord.utils.utcnow() - scheduled).total_seconds(), 0.0), loop=name)
+
+
+@functools.lru_cache(maxsize=None)
+def http_trace_config(service: str) -> aiohttp.TraceConfig:
+    """Return the aiohttp trace config that counts and times every request made through a session."""
+    trace_config = aiohttp.TraceConfig()
+
+    async def on_request_start(session: aiohttp.ClientSession, context: Any, params: aiohttp.TraceRequestStartParams) -> None:
+        context.start = time.perf_counter()
+
+    async def on_request_end(session: aiohttp.ClientSession, context: Any, params: aiohttp.TraceRequestEndParams) -> None:
+        _record_request(service, params.method, params.url.path, str(params.response.status), context)
+
+    async def on_request_exception(session: aiohttp.ClientSession, context: Any, params: aiohttp.TraceRequestExceptionParams) -> None:
+        status = "timeout" if isinstance(params.exception, asyncio.TimeoutError) else "error"
+        _record_request(service, params.method, params.url.path, status, context)
+
+    trace_config.on_request_start.append(on_request_start)
+    trace_config.on_request_end.append(on_request_end)
+    trace_config.on_request_exception.append(on_request_exception)
+    return trace_config
+
+
+def _record_request(service: str, method: str, path: str, status: str, context: Any) -> None:
+    endpoint = normalize_endpoint(path)
+    HTTP_REQUESTS.inc(service=service, method=method, endpoint=endpoint, status=status)
+    start = getattr(context, "start", None)
+    if start is not None:
+        HTTP_DURATION.observe(time.perf_counter() - start, service=service, endpoint=endpoint)
+
+
+class DiscordRateLimitFilter(logging.Filter):
+    """Count the 429 responses discord.py reports through the `discord.http` logger.
+
+    discord.py handles most rate limits internally and only logs them, so this is
+    the one place every 429 is visible. The filter never drops records.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if isinstance(record.msg, str) and record.msg.startswith("We are being rate limited.") and record.args:
+            args = record.args if isinstance(record.args, tuple) else ()
+            if len(args) >= 2:
+                route = normalize_endpoint(urlsplit(str(args[1])).path)
+                DISCORD_RATE_LIMITS.inc(method=str(args[0]), route=route)
+        return True
+
+
+def install_discord_rate_limit_counter() -> None:
+    """Attach `DiscordRateLimitFilter` to the `discord.http` logger once."""
+    logger = logging.getLogger("discord.http")
+    if not any(isinstance(f, DiscordRateLimitFilter) for f in logger.filters):
+        logger.addFilter(DiscordRateLimitFilter())
+
+
+class MetricsServer:
+    """Small aiohttp server exposing the registry on `/metrics`."""
+
+    def __init__(self, host: str, port: int, registry: MetricsRegistry = REGISTRY) -> None:
+        self.host = host
+        self.port = port
+        self.registry = registry
+        self.logger = logging.getLogger("jellywatch_bot.metrics")
+        self._runner: Optional[web.AppRunner] = None
+
+    @property
+    def running(self) -> bool:
+        return self._runner is not None
+
+    async def _handle_metrics(self, request: web.Request) -> web.Response:
+        return web.Response(text=self.registry.render(), content_type="text/plain", charset="utf-8")
+
+    async def start(self) -> None:
+        """Start serving metrics; calling it again while running is a no-op."""
+        if self._runner is not None:
+            return
+        app = web.Application()
+        app.router.add_get("/metrics", self._handle_metrics)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        try:
+            await web.TCPSite(runner, self.host, self.port).start()
+        except OSError as e:
+            await runner.cleanup()
+            self.logger.error(f"Failed to start metrics server on {self.host}:{self.port}: {e}")
+            return
+        self._runner = runner
+        self.logger.info(f"Metrics server listening on http://{self.host}:{self.port}/metrics")
+
+    async def stop(self) -> None:
+        """Stop the metrics server if it is running."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
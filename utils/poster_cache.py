@@ -0,0 +1,233 @@
+"""Bounded cache of poster thumbnails: fetched from Jellyfin once, resized off the loop, uploaded to Discord once."""
+import asyncio
+import collections
+import io
+import json
+import logging
+import os
+import re
+import time
+from typing import Awaitable, Callable, Dict, Optional
+from urllib.parse import parse_qs, urlsplit
+
+from PIL import Image
+
+from utils import metrics
+
+POSTER_LOOKUPS = metrics.REGISTRY.counter(
+    "jellywatch_poster_lookups_total",
+    "Poster lookups by result (hit, disk, miss or failed).",
+    ["result"],
+)
+
+Fetch = Callable[[], Awaitable[bytes]]
+Upload = Callable[[str, bytes], Awaitable[str]]  # (filename, JPEG bytes) -> CDN URL
+
+URL_REFRESH_MARGIN = 3600  # seconds before a signed CDN URL expires that it is re-uploaded
+FAILURE_RETRY = 900  # seconds before a poster that failed to load is tried again
+MAX_FAILED = 1000  # failed keys remembered; the ones whose retry time passed are dropped first
+
+
+def thumbnail(data: bytes, size: int) -> bytes:
+    """Downscale an image to fit `size` pixels on its longest side and re-encode it as JPEG."""
+    with Image.open(io.BytesIO(data)) as source:
+        # Lets the JPEG decoder skip most of a full-size poster instead of decoding and then shrinking it
+        source.draft("RGB", (size, size))
+        image = source.convert("RGB")
+    image.thumbnail((size, size), Image.LANCZOS)
+    out = io.BytesIO()
+    image.save(out, "JPEG", quality=85, optimize=True)
+    return out.getvalue()
+
+
+def url_expiry(url: str) -> Optional[float]:
+    """Unix time a signed Discord CDN URL stops working (its hex `ex` parameter), or None if unsigned."""
+    ex = parse_qs(urlsplit(url).query).get("ex")
+    try:
+        return float(int(ex[0], 16)) if ex else None
+    except ValueError:
+        return None
+
+
+class PosterEntry:
+    """A thumbnail on disk and the CDN URL it was last uploaded to."""
+
+    __slots__ = ("filename", "url", "expires")
+
+    def __init__(self, filename: str, url: Optional[str] = None, expires: Optional[float] = None) -> None:
+        self.filename = filename
+        self.url = url
+        self.expires = expires
+
+    def usable(self) -> bool:
+        return self.url is not None and (self.expires is None or self.expires - time.time() > URL_REFRESH_MARGIN)
+
+
+class PosterCache:
+    """Poster thumbnails keyed by item ID and image tag, kept to the `max_entries` most recently used.
+
+    A new image tag means new artwork, so keys never need invalidating. The first lookup
+    downloads the poster, shrinks it in a worker thread, writes it to `directory` and
+    uploads it once; every later embed reuses the CDN URL from memory. After a restart, or
+    when a signed URL is about to expire, the file on disk is re-uploaded without asking
+    Jellyfin again. Concurrent lookups of one poster share a single load.
+    """
+
+    def __init__(self, directory: str, upload: Upload, max_entries: int = 500, size: int = 300) -> None:
+        self.directory = directory
+        self.upload = upload
+        self.max_entries = max_entries
+        self.size = size
+        self.logger = logging.getLogger("jellywatch_bot.posters")
+        self.manifest_path = os.path.join(directory, "manifest.json")
+        self._entries: "collections.OrderedDict[str, PosterEntry]" = collections.OrderedDict()  # least recent first
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._failed: Dict[str, float] = {}  # key -> when it may be retried, oldest failure first
+        self._manifest_lock = asyncio.Lock()  # one write at a time, so the last snapshot wins
+        self._load()
+
+    @staticmethod
+    def key(item_id: str, tag: str) -> str:
+        return re.sub(r"[^A-Za-z0-9]", "", item_id) + "-" + re.sub(r"[^A-Za-z0-9]", "", tag)
+
+    def cached_url(self, item_id: str, tag: str) -> Optional[str]:
+        """The poster's CDN URL if it is cached in memory and not about to expire; never does I/O."""
+        key = self.key(item_id, tag)
+        entry = self._entries.get(key)
+        if entry is None or not entry.usable():
+            return None
+        self._entries.move_to_end(key)
+        POSTER_LOOKUPS.inc(result="hit")
+        return entry.url
+
+    def warm(self, item_id: str, tag: str, fetch: Fetch) -> Optional[str]:
+        """Return the cached URL, or start loading the poster in the background and return None."""
+        url = self.cached_url(item_id, tag)
+        if url is None:
+            self._start(self.key(item_id, tag), fetch)
+        return url
+
+    async def url(self, item_id: str, tag: str, fetch: Fetch, timeout: float) -> Optional[str]:
+        """Return the poster's CDN URL, loading it if needed; None if that fails or takes over `timeout`.
+
+        A load that runs out of time keeps going, so the next lookup finds it cached.
+        """
+        url = self.cached_url(item_id, tag)
+        if url is not None:
+            return url
+        task = self._start(self.key(item_id, tag), fetch)
+        if task is None:
+            return None
+        try:
+            return await asyncio.wait_for(asyncio.shield(task), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def close(self) -> None:
+        for task in self._inflight.values():
+            task.cancel()
+        await asyncio.gather(*self._inflight.values(), return_exceptions=True)
+        self._inflight.clear()
+        await self._save_manifest()
+
+    def _start(self, key: str, fetch: Fetch) -> Optional[asyncio.Task]:
+        task = self._inflight.get(key)
+        if task is not None and not task.done():
+            return task
+        if self._failed.get(key, 0) > time.time():
+            return None
+        task = asyncio.create_task(self._load_poster(key, fetch), name=f"poster:{key}")
+        task.add_done_callback(lambda done: self._forget(key, done))
+        self._inflight[key] = task
+        return task
+
+    def _forget(self, key: str, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+
+    async def _load_poster(self, key: str, fetch: Fetch) -> Optional[str]:
+        entry = self._entries.get(key) or PosterEntry(f"{key}.jpg")
+        path = os.path.join(self.directory, entry.filename)
+        try:
+            if os.path.exists(path):
+                data = await asyncio.to_thread(self._read, path)
+                result = "disk"
+            else:
+                data = await asyncio.to_thread(thumbnail, await fetch(), self.size)
+                await asyncio.to_thread(self._write, path, data)
+                result = "miss"
+            entry.url = await self.upload(entry.filename, data)
+            entry.expires = url_expiry(entry.url)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            POSTER_LOOKUPS.inc(result="failed")
+            self._remember_failure(key)
+            self.logger.warning(f"Could not load poster {key}, retrying in {FAILURE_RETRY // 60} minutes: {e}")
+            return None
+
+        POSTER_LOOKUPS.inc(result=result)
+        self._failed.pop(key, None)
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        self._evict()
+        await self._save_manifest()
+        return entry.url
+
+    def _remember_failure(self, key: str) -> None:
+        now = time.time()
+        if len(self._failed) >= MAX_FAILED:
+            self._failed = {failed: retry_at for failed, retry_at in self._failed.items() if retry_at > now}
+            while len(self._failed) >= MAX_FAILED:
+                del self._failed[next(iter(self._failed))]  # oldest failure first
+        self._failed.pop(key, None)
+        self._failed[key] = now + FAILURE_RETRY
+
+    def _evict(self) -> None:
+        while len(self._entries) > self.max_entries:
+            _, entry = self._entries.popitem(last=False)
+            try:
+                os.remove(os.path.join(self.directory, entry.filename))
+            except OSError:
+                pass
+
+    @staticmethod
+    def _read(path: str) -> bytes:
+        with open(path, "rb") as f:
+            return f.read()
+
+    @staticmethod
+    def _write(path: str, data: bytes) -> None:
+        with open(path, "wb") as f:
+            f.write(data)
+
+    def _load(self) -> None:
+        """Restore the entries whose files survived, and delete thumbnails the manifest no longer lists."""
+        os.makedirs(self.directory, exist_ok=True)
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            manifest = []
+        for key, url, expires in manifest:
+            entry = PosterEntry(f"{key}.jpg", url, expires)
+            if os.path.exists(os.path.join(self.directory, entry.filename)):
+                self._entries[key] = entry
+        for filename in os.listdir(self.directory):
+            if filename.endswith(".jpg") and filename[:-4] not in self._entries:
+                os.remove(os.path.join(self.directory, filename))
+        self._evict()
+
+    async def _save_manifest(self) -> None:
+        # Snapshot on the loop; the entries keep changing while the thread writes
+        manifest = [[key, entry.url, entry.expires] for key, entry in self._entries.items()]
+        try:
+            async with self._manifest_lock:
+                await asyncio.to_thread(self._write_manifest, self.manifest_path, manifest)
+        except OSError as e:
+            self.logger.error(f"Failed to save the poster manifest: {e}")
+
+    @staticmethod
+    def _write_manifest(path: str, manifest: list) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
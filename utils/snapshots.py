@@ -0,0 +1,96 @@
+"""Fetch dashboard sources concurrently with per-source deadlines, falling back to the last good snapshot."""
+import asyncio
+import logging
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from utils import metrics
+
+SOURCE_FETCHES = metrics.REGISTRY.counter(
+    "jellywatch_source_fetches_total",
+    "Dashboard source fetches by source and result (ok, late or failed).",
+    ["source", "result"],
+)
+
+Fetch = Callable[[], Awaitable[Any]]
+
+
+class SourceUnavailable(Exception):
+    """Raised by a fetch function when its source answered but had no usable data."""
+
+
+class Snapshot:
+    """Data from one source, with when it was fetched and why it is stale, if it is."""
+
+    __slots__ = ("data", "updated_at", "reason")
+
+    def __init__(self, data: Any, updated_at: Optional[datetime], reason: Optional[str] = None) -> None:
+        self.data = data
+        self.updated_at = updated_at
+        self.reason = reason  # None when fresh, otherwise "late" or "failed"
+
+    @property
+    def stale(self) -> bool:
+        return self.reason is not None
+
+    @property
+    def available(self) -> bool:
+        return self.updated_at is not None
+
+
+class SourceAggregator:
+    """Runs source fetches side by side, each bounded by its own deadline.
+
+    A fetch that misses its deadline is not cancelled: it keeps running in the background
+    and its result becomes the snapshot for the next tick, while this tick gets the last
+    good snapshot marked stale. No second fetch for a source starts while one is in flight,
+    so a hung backend never piles up requests.
+    """
+
+    def __init__(self) -> None:
+        self.logger = logging.getLogger("jellywatch_bot.snapshots")
+        self._last: Dict[str, Tuple[Any, datetime]] = {}
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+    def last(self, name: str, reason: Optional[str] = None) -> Snapshot:
+        data, updated_at = self._last.get(name, (None, None))
+        return Snapshot(data, updated_at, reason)
+
+    async def fetch(self, name: str, fetch: Fetch, deadline: float) -> Snapshot:
+        task = self._inflight.get(name)
+        if task is None or task.done():
+            task = asyncio.create_task(fetch(), name=f"source:{name}")
+            task.add_done_callback(lambda done: self._store(name, done))
+            self._inflight[name] = task
+        try:
+            await asyncio.wait_for(asyncio.shield(task), deadline)
+        except asyncio.TimeoutError:
+            SOURCE_FETCHES.inc(source=name, result="late")
+            self.logger.warning(f"Source {name} missed its {deadline:g}s deadline, using the last snapshot")
+            return self.last(name, "late")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            SOURCE_FETCHES.inc(source=name, result="failed")
+            self.logger.debug("Source %s failed: %s", name, e)
+            return self.last(name, "failed")
+        SOURCE_FETCHES.inc(source=name, result="ok")
+        return self.last(name)
+
+    async def gather(self, sources: Dict[str, Tuple[Fetch, float]]) -> Dict[str, Snapshot]:
+        """Fetch every source concurrently; returns within the largest deadline."""
+        names = list(sources)
+        snapshots = await asyncio.gather(*(self.fetch(name, *sources[name]) for name in names))
+        return dict(zip(names, snapshots))
+
+    async def close(self) -> None:
+        for task in self._inflight.values():
+            task.cancel()
+        await asyncio.gather(*self._inflight.values(), return_exceptions=True)
+        self._inflight.clear()
+
+    def _store(self, name: str, task: asyncio.Task) -> None:
+        if task.cancelled():
+            return
+        if task.exception() is None:
+            self._last[name] = (task.result(), datetime.now())
@@ -0,0 +1,180 @@
+"""Supervision for a cog's background loops and resources: restart on crash, clean shutdown on unload."""
+import asyncio
+import inspect
+import logging
+import time
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
+
+from discord.ext import tasks
+
+from utils import metrics
+
+LOOP_RESTARTS = metrics.REGISTRY.counter(
+    "jellywatch_loop_restarts_total",
+    "Background loops restarted by their supervisor after crashing.",
+    ["loop"],
+)
+LOOP_FAILURES = metrics.REGISTRY.counter(
+    "jellywatch_loop_iteration_errors_total",
+    "Loop iterations that raised, whether or not the loop survived it.",
+    ["loop"],
+)
+
+Closer = Callable[[], Union[None, Awaitable[None]]]
+
+# Every live supervisor by cog name, for the admin status command
+SUPERVISORS: Dict[str, "TaskSupervisor"] = {}
+
+
+class LoopState:
+    """What the supervisor knows about one loop; rendered by the `/tasks` command."""
+
+    def __init__(self, name: str, loop: tasks.Loop) -> None:
+        self.name = name
+        self.loop = loop
+        self.last_run: Optional[datetime] = None
+        self.last_duration: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.last_error_at: Optional[datetime] = None
+        self.restarts = 0
+        self.consecutive_crashes = 0
+        self.restart_task: Optional[asyncio.Task] = None
+
+    @property
+    def status(self) -> str:
+        if self.restart_task is not None and not self.restart_task.done():
+            return "restarting"
+        if self.loop.is_running():
+            return "running"
+        return "failed" if self.loop.failed() else "stopped"
+
+
+class TaskSupervisor:
+    """Owns a cog's `tasks.Loop`s and the resources they use.
+
+    A loop that dies from an unhandled exception is restarted after a backoff that doubles
+    with every consecutive crash (up to `max_backoff`) and resets after a clean iteration.
+    `close()` cancels every loop, waits for it to finish, then closes the registered
+    resources in reverse order, so a cog reload never leaves the old loops running.
+    """
+
+    def __init__(self, name: str, base_backoff: float = 5.0, max_backoff: float = 300.0) -> None:
+        self.name = name
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.logger = logging.getLogger("jellywatch_bot.supervisor")
+        self.loops: Dict[str, LoopState] = {}
+        self._resources: List[Tuple[str, Closer]] = []
+        self._closed = False
+        SUPERVISORS[name] = self
+
+    def add_loop(self, loop: tasks.Loop, name: Optional[str] = None) -> tasks.Loop:
+        """Supervise a bound loop; call `start()` to run everything that was added."""
+        name = name or loop.coro.__name__
+        state = LoopState(name, loop)
+        self.loops[name] = state
+        loop.coro = self._instrument(state, loop.coro)
+
+        async def on_error(*args: Any) -> None:
+            self._on_crash(state, args[-1])
+
+        loop.error(on_error)
+        return loop
+
+    def add_resource(self, name: str, close: Closer) -> None:
+        """Register something to close on shutdown, e.g. an HTTP session; `close` may be sync or async."""
+        self._resources.append((name, close))
+
+    def start(self) -> None:
+        for state in self.loops.values():
+            if not state.loop.is_running():
+                state.loop.start()
+
+    async def close(self) -> None:
+        """Cancel and await every loop and pending restart, then close resources newest first."""
+        self._closed = True
+        pending = []
+        for state in self.loops.values():
+            if state.restart_task is not None:
+                state.restart_task.cancel()
+                pending.append(state.restart_task)
+            state.loop.cancel()
+            task = state.loop.get_task()
+            if task is not None:
+                pending.append(task)
+        await asyncio.gather(*pending, return_exceptions=True)
+
+        for name, close in reversed(self._resources):
+            try:
+                result = close()
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                self.logger.error(f"Closing {self.name}.{name} failed: {e}", exc_info=True)
+        self._resources.clear()
+        if SUPERVISORS.get(self.name) is self:
+            del SUPERVISORS[self.name]
+
+    def status(self) -> List[Dict[str, Any]]:
+        return [
+            {
+                "name": state.name,
+                "status": state.status,
+                "last_run": state.last_run,
+                "last_duration": state.last_duration,
+                "next_run": state.loop.next_iteration,
+                "last_error": state.last_error,
+                "last_error_at": state.last_error_at,
+                "restarts": state.restarts,
+            }
+            for state in self.loops.values()
+        ]
+
+    def _instrument(self, state: LoopState, coro: Callable[..., Awaitable[None]]) -> Callable[..., Awaitable[None]]:
+        """Wrap the loop body to record when it last ran and what it last raised."""
+
+        async def wrapper(*args: Any, **kwargs: Any) -> None:
+            state.last_run = datetime.now()
+            started = time.perf_counter()
+            try:
+                await coro(*args, **kwargs)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                state.last_error = f"{type(e).__name__}: {e}"
+                state.last_error_at = datetime.now()
+                LOOP_FAILURES.inc(loop=f"{self.name}.{state.name}")
+                raise
+            else:
+                state.consecutive_crashes = 0
+            finally:
+                state.last_duration = time.perf_counter() - started
+
+        wrapper.__name__ = coro.__name__
+        wrapper.__qualname__ = coro.__qualname__
+        return wrapper
+
+    def _on_crash(self, state: LoopState, error: BaseException) -> None:
+        if self._closed:
+            return
+        delay = min(self.base_backoff * 2 ** state.consecutive_crashes, self.max_backoff)
+        state.consecutive_crashes += 1
+        self.logger.error(
+            f"Loop {self.name}.{state.name} crashed, restarting in {delay:g}s: {error}",
+            exc_info=(type(error), error, error.__traceback__),
+        )
+        state.restart_task = asyncio.create_task(self._restart(state, delay), name=f"restart:{self.name}.{state.name}")
+
+    async def _restart(self, state: LoopState, delay: float) -> None:
+        # The crashed task is still unwinding when the error handler runs; wait for it to finish
+        crashed = state.loop.get_task()
+        await asyncio.sleep(delay)
+        if crashed is not None:
+            await asyncio.gather(crashed, return_exceptions=True)
+        if self._closed or state.loop.is_running():
+            return
+        state.restarts += 1
+        LOOP_RESTARTS.inc(loop=f"{self.name}.{state.name}")
+        self.logger.info(f"Restarting loop {self.name}.{state.name} (restart {state.restarts})")
+        state.loop.start()
@@ -0,0 +1,165 @@
+"""Local full-text index of library titles in SQLite FTS5, so searches never wait on Jellyfin."""
+import logging
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+from utils import metrics
+
+SEARCH_LATENCY = metrics.REGISTRY.histogram(
+    "jellywatch_search_seconds",
+    "Title index query latency.",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1),
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS titles (
+    rowid INTEGER PRIMARY KEY,
+    server TEXT NOT NULL,
+    item_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    type TEXT NOT NULL,
+    year INTEGER,
+    UNIQUE (server, item_id)
+);
+CREATE INDEX IF NOT EXISTS titles_name ON titles (name COLLATE NOCASE);
+CREATE TABLE IF NOT EXISTS builds (server TEXT PRIMARY KEY, built_at REAL NOT NULL);
+CREATE TRIGGER IF NOT EXISTS titles_ai AFTER INSERT ON titles BEGIN
+    INSERT INTO titles_fts (rowid, name) VALUES (new.rowid, new.name);
+END;
+CREATE TRIGGER IF NOT EXISTS titles_ad AFTER DELETE ON titles BEGIN
+    INSERT INTO titles_fts (titles_fts, rowid, name) VALUES ('delete', old.rowid, old.name);
+END;
+CREATE TRIGGER IF NOT EXISTS titles_au AFTER UPDATE ON titles BEGIN
+    INSERT INTO titles_fts (titles_fts, rowid, name) VALUES ('delete', old.rowid, old.name);
+    INSERT INTO titles_fts (rowid, name) VALUES (new.rowid, new.name);
+END;
+"""
+
+_UPSERT = """
+INSERT INTO titles (server, item_id, name, type, year) VALUES (?, ?, ?, ?, ?)
+ON CONFLICT (server, item_id) DO UPDATE SET name = excluded.name, type = excluded.type, year = COALESCE(excluded.year, year)
+WHERE name != excluded.name OR type != excluded.type OR (excluded.year IS NOT NULL AND year IS NOT excluded.year)
+"""
+
+
+class TitleIndex:
+    """Movie and series titles per server, searchable by any substring of three or more characters.
+
+    The FTS5 trigram tokenizer (SQLite 3.34+) matches inside words ("matrix" finds "The
+    Matrix Reloaded"); older SQLite builds fall back to word prefixes. Shorter queries
+    use a prefix scan of the name index.
+
+    Writes and queries use separate connections. In WAL mode a full rebuild running in a
+    worker thread therefore never blocks a query on the event loop, and queries take well
+    under a millisecond.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.logger = logging.getLogger("jellywatch_bot.search")
+        self._write_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._writer = sqlite3.connect(path, check_same_thread=False)
+        self._writer.execute("PRAGMA journal_mode=WAL")
+        self._writer.execute("PRAGMA synchronous=NORMAL")
+        self.trigram = self._create_schema()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+
+    def _create_schema(self) -> bool:
+        """Create the tables if needed; returns whether the trigram tokenizer is in use."""
+        existing = self._writer.execute("SELECT sql FROM sqlite_master WHERE name = 'titles_fts'").fetchone()
+        if existing:
+            trigram = "trigram" in existing[0]
+        else:
+            try:
+                self._writer.execute("CREATE VIRTUAL TABLE titles_fts USING fts5(name, content='titles', content_rowid='rowid', tokenize='trigram')")
+                trigram = True
+            except sqlite3.OperationalError:
+                self.logger.info(f"SQLite {sqlite3.sqlite_version} has no trigram tokenizer, title search matches word prefixes")
+                self._writer.execute("CREATE VIRTUAL TABLE titles_fts USING fts5(name, content='titles', content_rowid='rowid', tokenize='unicode61 remove_diacritics 2')")
+                trigram = False
+        self._writer.executescript(_SCHEMA)
+        self._writer.commit()
+        return trigram
+
+    def close(self) -> None:
+        with self._write_lock:
+            self._writer.close()
+        with self._lock:
+            self._db.close()
+
+    def upsert(self, server: str, items: Iterable[Dict[str, Any]]) -> int:
+        """Add or update titles given as {"id", "name", "type", "year"}; returns how many rows changed.
+
+        A missing year never overwrites a known one, since series seen through a new episode have none.
+        """
+        rows = [(server, item["id"], item["name"], item["type"], item.get("year")) for item in items]
+        with self._write_lock, self._writer:
+            return self._writer.executemany(_UPSERT, rows).rowcount
+
+    def replace_server(self, server: str, items: Iterable[Dict[str, Any]]) -> int:
+        """Swap in a complete title list for one server in a single transaction; returns the title count."""
+        rows = [(server, item["id"], item["name"], item["type"], item.get("year")) for item in items]
+        keep = {row[1] for row in rows}
+        with self._write_lock, self._writer:
+            existing = [row[0] for row in self._writer.execute("SELECT item_id FROM titles WHERE server = ?", (server,))]
+            self._writer.executemany(
+                "DELETE FROM titles WHERE server = ? AND item_id = ?",
+                [(server, item_id) for item_id in existing if item_id not in keep],
+            )
+            self._writer.executemany(_UPSERT, rows)
+            self._writer.execute("INSERT OR REPLACE INTO builds (server, built_at) VALUES (?, ?)", (server, time.time()))
+        return len(rows)
+
+    def built_at(self, server: str) -> Optional[float]:
+        """Unix time of the server's last full build, or None if it was never built."""
+        with self._lock:
+            row = self._db.execute("SELECT built_at FROM builds WHERE server = ?", (server,)).fetchone()
+        return row[0] if row else None
+
+    def count(self, server: Optional[str] = None) -> int:
+        with self._lock:
+            if server is None:
+                return self._db.execute("SELECT COUNT(*) FROM titles").fetchone()[0]
+            return self._db.execute("SELECT COUNT(*) FROM titles WHERE server = ?", (server,)).fetchone()[0]
+
+    def get(self, server: str, item_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT server, item_id, name, type, year FROM titles WHERE server = ? AND item_id = ?", (server, item_id)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def search(self, query: str, limit: int = 25) -> List[Dict[str, Any]]:
+        """Titles matching `query`, names starting with it first, then by FTS rank."""
+        query = " ".join(query.split())
+        if not query:
+            return []
+        started = time.perf_counter()
+        prefix = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        with self._lock:
+            if self.trigram and len(query) < 3:
+                # Trigrams need three characters; short input can only be a prefix
+                rows = self._db.execute(
+                    "SELECT server, item_id, name, type, year FROM titles WHERE name LIKE ? ESCAPE '\\' "
+                    "ORDER BY name COLLATE NOCASE LIMIT ?",
+                    (prefix, limit),
+                ).fetchall()
+            else:
+                rows = self._db.execute(
+                    "SELECT t.server, t.item_id, t.name, t.type, t.year FROM titles_fts "
+                    "JOIN titles t ON t.rowid = titles_fts.rowid WHERE titles_fts MATCH ? "
+                    "ORDER BY t.name LIKE ? ESCAPE '\\' DESC, rank LIMIT ?",
+                    (self._match_expression(query), prefix, limit),
+                ).fetchall()
+        SEARCH_LATENCY.observe(time.perf_counter() - started)
+        return [dict(row) for row in rows]
+
+    def _match_expression(self, query: str) -> str:
+        if self.trigram:
+            # One quoted phrase: matches the query as a substring of the title
+            return '"' + query.replace('"', '""') + '"'
+        return " ".join('"' + word.replace('"', '""') + '"*' for word in query.split())
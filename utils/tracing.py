@@ -0,0 +1,324 @@
+"""Lightweight context-var based tracing with JSON lines and optional OTLP export."""
+import asyncio
+import contextvars
+import functools
+import json
+import logging
+import os
+import queue
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, TypeVar
+
+import aiohttp
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("jellywatch_span", default=None)
+# The loop only keeps weak references to tasks, so exports in flight are held here until they finish
+_background_tasks: Set[asyncio.Task] = set()
+
+
+class Span:
+    """A timed unit of work; child spans inherit the trace id of the span active when they start."""
+
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "attributes", "status", "start_ns", "end_ns", "_perf_start")
+
+    def __init__(self, name: str, parent: Optional["Span"], attributes: Dict[str, Any]) -> None:
+        self.trace_id = parent.trace_id if parent else secrets.token_hex(16)
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent.span_id if parent else None
+        self.name = name
+        self.attributes = attributes
+        self.status = "ok"
+        self.start_ns = time.time_ns()
+        self.end_ns = 0
+        self._perf_start = time.perf_counter()
+
+    @property
+    def duration(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e9 if self.end_ns else time.perf_counter() - self._perf_start
+
+    def set(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def finish(self, status: Optional[str] = None) -> None:
+        if status:
+            self.status = status
+        elapsed_ns = int((time.perf_counter() - self._perf_start) * 1e9)
+        self.end_ns = self.start_ns + elapsed_ns
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start": self.start_ns / 1e9,
+            "duration_ms": round((self.end_ns - self.start_ns) / 1e6, 3),
+            "status": self.status,
+            "attributes": self.attributes,
+        }
+
+
+class _NoopSpan:
+    """Stand-in yielded while tracing is disabled so call sites never need to check."""
+
+    def set(self, key: str, value: Any) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class JsonLinesExporter:
+    """Append finished spans to a JSON lines file from a background thread."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.logger = logging.getLogger("jellywatch_bot.tracing")
+        self._queue: "queue.SimpleQueue[Optional[Dict[str, Any]]]" = queue.SimpleQueue()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._thread = threading.Thread(target=self._run, name="jellywatch-trace-writer", daemon=True)
+        self._thread.start()
+
+    def export(self, span: Span) -> None:
+        self._queue.put(span.to_dict())
+
+    def _run(self) -> None:
+        while True:
+            record = self._queue.get()
+            if record is None:
+                return
+            batch = [record]
+            # Drain whatever else is already waiting so a whole tick is written at once
+            while True:
+                try:
+                    record = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if record is None:
+                    self._write(batch)
+                    return
+                batch.append(record)
+            self._write(batch)
+
+    def _write(self, batch: List[Dict[str, Any]]) -> None:
+        try:
+            with open(self.path, "a", encoding="utf-8") as f:
+                for record in batch:
+                    f.write(json.dumps(record, default=str) + "\n")
+        except OSError as e:
+            self.logger.error(f"Failed to write trace spans to {self.path}: {e}")
+
+    def shutdown(self) -> None:
+        self._queue.put(None)
+
+
+class OtlpHttpExporter:
+    """Send finished traces to an OTLP/HTTP collector using the JSON encoding."""
+
+    def __init__(self, endpoint: str, service_name: str = "jellywatch") -> None:
+        self.endpoint = endpoint.rstrip("/")
+        if not self.endpoint.endswith("/v1/traces"):
+            self.endpoint += "/v1/traces"
+        self.service_name = service_name
+        self.logger = logging.getLogger("jellywatch_bot.tracing")
+        self._pending: List[Span] = []
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._sends: Set[asyncio.Task] = set()
+
+    def export(self, span: Span) -> None:
+        self._pending.append(span)
+        # Flush once a root span ends, so every request carries a complete tick
+        if span.parent_id is None or len(self._pending) >= 256:
+            batch, self._pending = self._pending, []
+            try:
+                task = asyncio.get_running_loop().create_task(self._send(batch))
+            except RuntimeError:
+                self.logger.debug("No running loop, dropping %d spans", len(batch))
+                return
+            self._track(task)
+            self._sends.add(task)
+            task.add_done_callback(self._sends.discard)
+
+    @staticmethod
+    def _track(task: asyncio.Task) -> None:
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
+
+    @staticmethod
+    def _attribute(key: str, value: Any) -> Dict[str, Any]:
+        if isinstance(value, bool):
+            return {"key": key, "value": {"boolValue": value}}
+        if isinstance(value, int):
+            return {"key": key, "value": {"intValue": str(value)}}
+        if isinstance(value, float):
+            return {"key": key, "value": {"doubleValue": value}}
+        return {"key": key, "value": {"stringValue": str(value)}}
+
+    def _encode(self, batch: List[Span]) -> Dict[str, Any]:
+        spans = []
+        for span in batch:
+            encoded = {
+                "traceId": span.trace_id,
+                "spanId": span.span_id,
+                "name": span.name,
+                "kind": 3 if span.name.startswith("http.") else 1,
+                "startTimeUnixNano": str(span.start_ns),
+                "endTimeUnixNano": str(span.end_ns),
+                "attributes": [self._attribute(k, v) for k, v in span.attributes.items()],
+                "status": {"code": 2 if span.status == "error" else 1},
+            }
+            if span.parent_id:
+                encoded["parentSpanId"] = span.parent_id
+            spans.append(encoded)
+        return {
+            "resourceSpans": [{
+                "resource": {"attributes": [self._attribute("service.name", self.service_name)]},
+                "scopeSpans": [{"scope": {"name": "jellywatch"}, "spans": spans}],
+            }]
+        }
+
+    async def _send(self, batch: List[Span]) -> None:
+        try:
+            if self._session is None or self._session.closed:
+                self._session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=5))
+            async with self._session.post(self.endpoint, json=self._encode(batch)) as response:
+                if response.status >= 300:
+                    self.logger.debug("OTLP collector rejected %d spans: HTTP %s", len(batch), response.status)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            self.logger.debug("Failed to export %d spans to %s: %s", len(batch), self.endpoint, e)
+
+    def shutdown(self) -> None:
+        """Close the session once the exports in flight have finished."""
+        try:
+            self._track(asyncio.get_running_loop().create_task(self._close()))
+        except RuntimeError:
+            pass  # the loop is gone, and the session with it
+
+    async def _close(self) -> None:
+        await asyncio.gather(*self._sends, return_exceptions=True)
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+
+class Tracer:
+    """Creates spans and hands finished ones to the configured exporters."""
+
+    def __init__(self) -> None:
+        self.exporters: List[Any] = []
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.exporters)
+
+    def configure(self, jsonl_path: Optional[str] = None, otlp_endpoint: Optional[str] = None) -> None:
+        """Replace the exporters; with neither argument set, tracing is disabled."""
+        self.shutdown()
+        if jsonl_path:
+            self.exporters.append(JsonLinesExporter(jsonl_path))
+        if otlp_endpoint:
+            self.exporters.append(OtlpHttpExporter(otlp_endpoint))
+
+    def shutdown(self) -> None:
+        for exporter in self.exporters:
+            exporter.shutdown()
+        self.exporters = []
+
+    def start_span(self, name: str, **attributes: Any) -> Optional[Span]:
+        """Start a span as a child of the current one without activating it."""
+        if not self.exporters:
+            return None
+        return Span(name, _current_span.get(), attributes)
+
+    def end_span(self, span: Optional[Span], status: Optional[str] = None) -> None:
+        if span is None:
+            return
+        span.finish(status)
+        for exporter in self.exporters:
+            exporter.export(span)
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Any]:
+        """Time the enclosed block as a span and make it the parent of spans started inside it."""
+        span = self.start_span(name, **attributes)
+        if span is None:
+            yield _NOOP_SPAN
+            return
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.set("error", repr(e))
+            self.end_span(span, "error")
+            raise
+        else:
+            self.end_span(span)
+        finally:
+            _current_span.reset(token)
+
+
+TRACER = Tracer()
+span = TRACER.span
+
+
+def traced(name: str) -> Callable[[F], F]:
+    """Decorate a function or coroutine function so each call runs inside its own span."""
+    def decorator(func: F) -> F:
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                with TRACER.span(name):
+                    return await func(*args, **kwargs)
+            return async_wrapper  # type: ignore[return-value]
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with TRACER.span(name):
+                return func(*args, **kwargs)
+        return wrapper  # type: ignore[return-value]
+    return decorator
+
+
+def annotate(key: str, value: Any) -> None:
+    """Set an attribute on the active span, if there is one."""
+    current = _current_span.get()
+    if current is not None:
+        current.set(key, value)
+
+
+@functools.lru_cache(maxsize=None)
+def http_trace_config(service: str) -> aiohttp.TraceConfig:
+    """Return an aiohttp trace config that records every request as a child span."""
+    trace_config = aiohttp.TraceConfig()
+
+    async def on_request_start(session: aiohttp.ClientSession, context: Any, params: aiohttp.TraceRequestStartParams) -> None:
+        context.span = TRACER.start_span(
+            f"http.{service}",
+            service=service,
+            method=params.method,
+            endpoint=params.url.path,
+        )
+
+    async def on_request_end(session: aiohttp.ClientSession, context: Any, params: aiohttp.TraceRequestEndParams) -> None:
+        span = getattr(context, "span", None)
+        if span is not None:
+            span.set("status", params.response.status)
+            TRACER.end_span(span, "error" if params.response.status >= 400 else None)
+
+    async def on_request_exception(session: aiohttp.ClientSession, context: Any, params: aiohttp.TraceRequestExceptionParams) -> None:
+        span = getattr(context, "span", None)
+        if span is not None:
+            span.set("error", repr(params.exception))
+            TRACER.end_span(span, "error")
+
+    trace_config.on_request_start.append(on_request_start)
+    trace_config.on_request_end.append(on_request_end)
+    trace_config.on_request_exception.append(on_request_exception)
+    return trace_config
@@ -0,0 +1,123 @@
+"""Event-loop lag measurement and slow-callback detection."""
+import asyncio
+import collections
+import logging
+import sys
+import threading
+import time
+import traceback
+from typing import Deque, Dict, Optional
+
+from utils import metrics
+
+EVENT_LOOP_LAG = metrics.REGISTRY.histogram(
+    "jellywatch_event_loop_lag_seconds",
+    "Extra delay observed by the watchdog when waking up on the event loop.",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+EVENT_LOOP_STALLS = metrics.REGISTRY.counter(
+    "jellywatch_event_loop_stalls_total",
+    "Times the event loop was blocked for longer than the watchdog threshold.",
+)
+
+
+class LoopWatchdog:
+    """Continuously measure event-loop lag and log a stack sample when the loop stalls.
+
+    A coroutine sleeps for `interval` seconds and records how late it wakes up.
+    A daemon thread watches the coroutine's heartbeat; when it goes stale for more
+    than `threshold` seconds the thread grabs the loop thread's current stack, which
+    points at the blocking call while it is still running.
+    """
+
+    def __init__(self, interval: float = 0.5, threshold: float = 0.25, history: int = 1200) -> None:
+        self.interval = interval
+        self.threshold = threshold
+        self.logger = logging.getLogger("jellywatch_bot.watchdog")
+        self.samples: Deque[float] = collections.deque(maxlen=history)
+        self.stalls = 0
+        self.max_lag = 0.0
+        self._task: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._loop_thread_id: Optional[int] = None
+        self._last_beat = time.monotonic()
+        self._reported_beat = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self, debug_slow_callbacks: bool = False) -> None:
+        """Start measuring on the running loop; optionally enable asyncio's slow-callback reporting."""
+        if self.running:
+            return
+        loop = asyncio.get_running_loop()
+        if debug_slow_callbacks:
+            loop.set_debug(True)
+            loop.slow_callback_duration = self.threshold
+            self.logger.info(f"asyncio debug mode enabled (slow callback threshold {self.threshold:.3f}s)")
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stop_event.clear()
+        self._task = loop.create_task(self._measure(), name="jellywatch-watchdog")
+        self._thread = threading.Thread(target=self._watch, name="jellywatch-watchdog", daemon=True)
+        self._thread.start()
+        self.logger.info(f"Event loop watchdog started (interval {self.interval}s, threshold {self.threshold}s)")
+
+    async def stop(self) -> None:
+        """Stop the measuring task and the stack sampling thread."""
+        self._stop_event.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _measure(self) -> None:
+        while True:
+            started = time.monotonic()
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            self._last_beat = now
+            lag = max(now - started - self.interval, 0.0)
+            self.samples.append(lag)
+            self.max_lag = max(self.max_lag, lag)
+            EVENT_LOOP_LAG.observe(lag)
+
+    def _watch(self) -> None:
+        poll = max(self.threshold / 2, 0.01)
+        while not self._stop_event.wait(poll):
+            beat = self._last_beat
+            blocked_for = time.monotonic() - beat - self.interval
+            if blocked_for <= self.threshold or beat == self._reported_beat:
+                continue
+            self._reported_beat = beat
+            self.stalls += 1
+            EVENT_LOOP_STALLS.inc()
+            frame = sys._current_frames().get(self._loop_thread_id) if self._loop_thread_id else None
+            stack = "".join(traceback.format_stack(frame)) if frame is not None else "<stack unavailable>\n"
+            self.logger.warning(
+                "Event loop blocked for more than %.3fs (threshold %.3fs). Stack sample:\n%s",
+                blocked_for, self.threshold, stack,
+            )
+
+    def percentile(self, percent: float) -> float:
+        """Return the given percentile (0-100) of the recent lag samples."""
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        index = min(int(round(percent / 100 * (len(ordered) - 1))), len(ordered) - 1)
+        return ordered[index]
+
+    def stats(self) -> Dict[str, float]:
+        """Summarize recent lag for health reporting."""
+        return {
+            "p50": self.percentile(50),
+            "p99": self.percentile(99),
+            "max": self.max_lag,
+            "samples": float(len(self.samples)),
+            "stalls": float(self.stalls),
+        }